@@ -16,19 +16,26 @@ from core.interfaces import (
     INewsParser, INewsRepository, IContentProcessor, INotificationService,
     IHealthChecker, IMetricsCollector, IEventBus
 )
-from core.metrics import InMemoryMetricsCollector
+from core.metrics import InMemoryMetricsCollector, EventLoopLagMonitor
 from core.event_bus import InMemoryEventBus
+from core.tracing import tracer
 from core.validation import (
     NewsValidationChain, TitleValidator, ContentValidator, 
-    UrlValidator, RegionKeywordValidator
+    UrlValidator, RegionKeywordValidator, KeywordAutomaton, build_keyword_automaton
 )
 
 from infrastructure.config_manager import ConfigManager
 from infrastructure.logging_setup import LoggingSetup
 from infrastructure.database_repository import AsyncNewsRepository
+from infrastructure.sqlite_pool import AsyncSQLitePool
+from infrastructure.rephrase_cache import SQLiteRephraseCache
+from infrastructure.feed_watermarks import SQLiteFeedWatermarkStore
+from infrastructure.metrics_server import MetricsHttpServer
+from infrastructure.trace_export import ChromeTraceExporter
 
 from services.parsing.news_parser_service import AsyncNewsParserService
-from services.content_processor_service import GigaChatContentProcessor
+from services.parsing.scheduler import AdaptiveSourceScheduler
+from services.content_processor_service import GigaChatContentProcessor, SENSITIVE_KEYWORDS
 from services.notification_service import TelegramNotificationService
 from services.health_checker_service import HealthCheckerService
 from services.news_bot_service import NewsBotService
@@ -53,8 +60,13 @@ class Application:
         
         self.logger.info("Initializing Saratov News Bot Application")
         
+        # Span tree per cycle, written as Chrome trace JSON
+        if self.config.metrics.trace_dir:
+            tracer.configure(ChromeTraceExporter(self.config.metrics))
+        
         # Setup DI container
         self.container = self._setup_container()
+        LoggingSetup.bind_metrics(self.container.resolve(IMetricsCollector))
         
         # Initialize services
         await self._initialize_services()
@@ -72,9 +84,18 @@ class Application:
         container.register_instance(type(self.config.parsing), self.config.parsing)
         
         # Register core services
-        container.register_singleton(IMetricsCollector, InMemoryMetricsCollector)
+        container.register_singleton_factory(IMetricsCollector, lambda: InMemoryMetricsCollector(
+            window_seconds=self.config.metrics.window_seconds
+        ))
         container.register_singleton(IEventBus, InMemoryEventBus)
         
+        # One keyword automaton shared by region validation and sensitive-topic detection
+        container.register_instance(KeywordAutomaton, build_keyword_automaton(
+            self.config.region_keywords,
+            self.config.exclude_keywords,
+            SENSITIVE_KEYWORDS
+        ))
+        
         # Register validation chain
         container.register_factory(NewsValidationChain, lambda: NewsValidationChain([
             TitleValidator(min_length=10, max_length=200),
@@ -82,42 +103,75 @@ class Application:
             UrlValidator(),
             RegionKeywordValidator(
                 self.config.region_keywords,
-                self.config.exclude_keywords
+                self.config.exclude_keywords,
+                automaton=container.resolve(KeywordAutomaton)
             )
         ]))
         
         # Register infrastructure services with factory functions
-        container.register_factory(INewsRepository, lambda: AsyncNewsRepository(
-            self.config.database, 
+        container.register_singleton_factory(AsyncSQLitePool, lambda: AsyncSQLitePool(
+            self.config.database,
             container.resolve(IMetricsCollector)
         ))
         
-        # Register business services with factory functions
-        container.register_factory(INewsParser, lambda: AsyncNewsParserService(
+        container.register_singleton_factory(INewsRepository, lambda: AsyncNewsRepository(
+            self.config.database, 
+            container.resolve(IMetricsCollector),
+            pool=container.resolve(AsyncSQLitePool)
+        ))
+        
+        container.register_singleton_factory(SQLiteFeedWatermarkStore, lambda: SQLiteFeedWatermarkStore(
+            container.resolve(AsyncSQLitePool),
+            container.resolve(IMetricsCollector),
+            max_keys=self.config.parsing.feed_watermark_keys
+        ))
+        
+        container.register_singleton_factory(AdaptiveSourceScheduler, lambda: AdaptiveSourceScheduler(
+            self.config.scheduler,
+            self.config.news_sources,
+            container.resolve(IMetricsCollector),
+            initial_interval_minutes=self.config.parsing.interval_minutes
+        ))
+        
+        # Register business services with factory functions.
+        # Stateful services are singletons so the bot service and the
+        # context managers in _get_service_contexts share the same instances
+        container.register_singleton_factory(INewsParser, lambda: AsyncNewsParserService(
             self.config.parsing,
             self.config.news_sources,
             container.resolve(NewsValidationChain),
-            container.resolve(IMetricsCollector)
+            container.resolve(IMetricsCollector),
+            watermarks=container.resolve(SQLiteFeedWatermarkStore) if self.config.parsing.feed_watermark_keys > 0 else None,
+            scheduler=container.resolve(AdaptiveSourceScheduler) if self.config.scheduler.adaptive else None
         ))
         
-        container.register_factory(IContentProcessor, lambda: GigaChatContentProcessor(
+        container.register_singleton_factory(SQLiteRephraseCache, lambda: SQLiteRephraseCache(
+            container.resolve(AsyncSQLitePool),
+            container.resolve(IMetricsCollector),
+            ttl_seconds=self.config.gigachat.cache_ttl_seconds,
+            max_entries=self.config.gigachat.cache_max_entries
+        ))
+        
+        container.register_singleton_factory(IContentProcessor, lambda: GigaChatContentProcessor(
             self.config.gigachat,
-            container.resolve(IMetricsCollector)
+            container.resolve(IMetricsCollector),
+            keyword_automaton=container.resolve(KeywordAutomaton),
+            cache=container.resolve(SQLiteRephraseCache) if self.config.gigachat.cache_max_entries > 0 else None
         ))
         
-        container.register_factory(INotificationService, lambda: TelegramNotificationService(
+        container.register_singleton_factory(INotificationService, lambda: TelegramNotificationService(
             self.config.telegram,
             container.resolve(IMetricsCollector)
         ))
         
-        container.register_factory(IHealthChecker, lambda: HealthCheckerService(
+        container.register_singleton_factory(IHealthChecker, lambda: HealthCheckerService(
             container.resolve(INewsRepository),
             container.resolve(IContentProcessor),
             container.resolve(INotificationService),
             container.resolve(IMetricsCollector)
         ))
         
-        container.register_factory(NewsBotService, lambda: NewsBotService(
+        container.register_singleton_factory(NewsBotService, lambda: NewsBotService(
             self.config,
             container.resolve(INewsParser),
             container.resolve(INewsRepository),
@@ -163,12 +217,16 @@ class Application:
         if not self.bot_service:
             raise RuntimeError("Application not initialized")
         
-        self.logger.info(f"Starting scheduler with {self.config.parsing.interval_minutes} minute intervals")
-        
         # Setup signal handlers
         self._setup_signal_handlers()
         
-        async with self._get_service_contexts():
+        if self.config.scheduler.adaptive:
+            await self._run_adaptive_scheduler()
+            return
+        
+        self.logger.info(f"Starting scheduler with {self.config.parsing.interval_minutes} minute intervals")
+        
+        async with self._get_service_contexts(), self._serve_metrics():
             # Run first cycle immediately
             await self.bot_service.run_full_cycle()
             
@@ -190,6 +248,54 @@ class Application:
         
         self.logger.info("Scheduler stopped")
     
+    async def _run_adaptive_scheduler(self):
+        """Poll each source on its own interval instead of all sources every interval_minutes"""
+        scheduler = self.container.resolve(AdaptiveSourceScheduler)
+        
+        self.logger.info(
+            f"Starting adaptive scheduler: {self.config.scheduler.min_interval_minutes}-"
+            f"{self.config.scheduler.max_interval_minutes} minute intervals, "
+            f"up to {self.config.scheduler.max_polls_per_minute} polls per minute"
+        )
+        
+        async with self._get_service_contexts(), self._serve_metrics():
+            while not self._shutdown_event.is_set():
+                try:
+                    due_sources = scheduler.take_due_sources()
+                    if due_sources:
+                        self.logger.info(f"Polling due sources: {', '.join(due_sources)}")
+                        await self.bot_service.run_full_cycle(due_sources)
+                    
+                    # Wait for the next due source or shutdown
+                    await asyncio.wait_for(
+                        self._shutdown_event.wait(),
+                        timeout=scheduler.seconds_until_due()
+                    )
+                    break  # Shutdown requested
+                except asyncio.TimeoutError:
+                    continue
+                except Exception as e:
+                    self.logger.error(f"Error in scheduler loop: {e}")
+                    await asyncio.sleep(60)  # Wait before retrying
+        
+        self.logger.info("Scheduler stopped")
+    
+    async def run_daemon(self):
+        """Run fetch, rephrase and send as independent long-running loops"""
+        if not self.bot_service:
+            raise RuntimeError("Application not initialized")
+        
+        self._setup_signal_handlers()
+        
+        scheduler = self.container.resolve(AdaptiveSourceScheduler) if self.config.scheduler.adaptive else None
+        
+        async with self._get_service_contexts(), self._serve_metrics():
+            health_status = await self.container.resolve(IHealthChecker).check_health()
+            if not health_status.get('overall', False):
+                self.logger.warning("Health check failed at daemon start, loops will retry on their own")
+            
+            await self.bot_service.run_daemon(self._shutdown_event, scheduler)
+    
     async def test_services(self):
         """Test all services"""
         if not self.bot_service:
@@ -253,13 +359,52 @@ class Application:
         
         print("=" * 50)
     
+    async def enable_incremental_vacuum(self):
+        """Rewrite the database once so cleanup can return free pages to the filesystem"""
+        repository = self.container.resolve(INewsRepository)
+        if await repository.enable_incremental_vacuum():
+            print("Incremental auto-vacuum enabled")
+        else:
+            print("Incremental auto-vacuum is already enabled")
+    
+    async def search_news(self, query: str, limit: int = 20):
+        """Full-text search over stored news"""
+        repository = self.container.resolve(INewsRepository)
+        results = await repository.search_news(query, limit)
+        
+        print(f"\nFound {len(results)} news for: {query}")
+        print("=" * 50)
+        for news in results:
+            created = news.created_date.strftime('%Y-%m-%d %H:%M') if news.created_date else '-'
+            print(f"[{news.id}] {created} {news.source} ({news.status.value})")
+            print(f"  {news.title}")
+            if news.url:
+                print(f"  {news.url}")
+        print("=" * 50)
+    
+    @asynccontextmanager
+    async def _serve_metrics(self):
+        """/metrics and /healthz endpoint for long-running modes, if a port is configured"""
+        if not self.config.metrics.http_port:
+            yield
+            return
+        
+        async with MetricsHttpServer(
+            self.config.metrics,
+            self.container.resolve(IMetricsCollector),
+            self.container.resolve(IHealthChecker),
+            repository=self.container.resolve(INewsRepository)
+        ):
+            yield
+    
     @asynccontextmanager
     async def _get_service_contexts(self):
         """Context manager for services that need async context management"""
         parser = self.container.resolve(INewsParser)
         content_processor = self.container.resolve(IContentProcessor)
+        lag_monitor = EventLoopLagMonitor(self.container.resolve(IMetricsCollector))
         
-        async with parser, content_processor:
+        async with parser, content_processor, lag_monitor:
             yield
     
     def _setup_signal_handlers(self):
@@ -273,8 +418,14 @@ class Application:
     
     async def shutdown(self):
         """Graceful shutdown"""
-        self.logger.info("Shutting down application")
+        if self.logger:
+            self.logger.info("Shutting down application")
         self._shutdown_event.set()
+        
+        if self.container:
+            await self.container.resolve(INewsRepository).close()
+        
+        LoggingSetup.shutdown_logging()
 
 
 async def main():
@@ -305,12 +456,27 @@ async def main():
             # Run scheduler
             await app.run_scheduler()
             
+        elif command == "daemon":
+            # Run independent stage loops
+            await app.run_daemon()
+            
+        elif command == "vacuum":
+            # One-time switch to incremental auto-vacuum
+            await app.enable_incremental_vacuum()
+            
+        elif command == "search" and len(sys.argv) > 2:
+            # Full-text search
+            await app.search_news(" ".join(sys.argv[2:]))
+            
         else:
             print("Available commands:")
             print("  python app.py run     - run with scheduler (default)")
+            print("  python app.py daemon  - run fetch/rephrase/send as continuous loops")
             print("  python app.py once    - single run")
             print("  python app.py test    - test all services")
             print("  python app.py stats   - show statistics")
+            print("  python app.py search <words> - full-text search over stored news")
+            print("  python app.py vacuum  - enable incremental auto-vacuum (rewrites the database once)")
             sys.exit(1)
     
     except KeyboardInterrupt:
@@ -0,0 +1,62 @@
+"""
+Micro-benchmark of the HTML backends on the saved fixture pages.
+
+    python -m benchmarks.html_backends [--iterations 200]
+
+Every available backend parses the listing page with the vzsar selector and
+extracts the article page; results are compared with html.parser.
+"""
+
+import argparse
+import time
+from pathlib import Path
+
+from services.parsing.extractors import extract_html_blocks, extract_article_text
+from services.parsing.html_backends import DEFAULT_HTML_BACKEND, available_html_backends
+
+
+FIXTURES = Path(__file__).parent / 'fixtures'
+LISTING_SELECTOR = 'article, .news-item, .post, h2, h3'
+BASE_URL = 'https://vzsar.ru'
+
+
+def measure(func, iterations: int) -> float:
+    func()  # warm-up: imports, selector compilation
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - start) / iterations * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare HTML parser backends')
+    parser.add_argument('--iterations', type=int, default=200)
+    args = parser.parse_args()
+
+    listing = (FIXTURES / 'listing.html').read_text(encoding='utf-8')
+    article = (FIXTURES / 'article.html').read_text(encoding='utf-8')
+
+    cases = {
+        'listing': lambda backend: extract_html_blocks(listing, LISTING_SELECTOR, BASE_URL, 100, backend),
+        'article': lambda backend: extract_article_text(article, 2000, backend),
+    }
+
+    backends = available_html_backends()
+    print(f"Backends: {', '.join(backends)}; {args.iterations} iterations\n")
+    print(f"{'case':<10}{'backend':<14}{'ms/page':>10}{'speedup':>10}  result")
+
+    for case, run in cases.items():
+        reference = run(DEFAULT_HTML_BACKEND)
+        baseline = None
+
+        for backend in backends:
+            elapsed = measure(lambda: run(backend), args.iterations)
+            baseline = baseline or elapsed
+            result = run(backend)
+            verdict = 'same' if result == reference else 'DIFFERS'
+            print(f"{case:<10}{backend:<14}{elapsed:>10.3f}{baseline / elapsed:>9.1f}x  {verdict}")
+
+
+if __name__ == '__main__':
+    main()
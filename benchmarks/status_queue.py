@@ -0,0 +1,157 @@
+"""
+Benchmark of the status queue queries on a large synthetic database.
+
+    python -m benchmarks.status_queue [--rows 2000000] [--pending 0.01] [--path /tmp/queue.db]
+
+The database is created through AsyncNewsRepository, so it carries the current
+schema and migrations, then filled with sent news followed by a backlog of
+parsed/processed rows. The queue queries are timed with only the legacy
+single-column indexes and again with the migrated idx_news_queue.
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import shutil
+import sqlite3
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from core.interfaces import NewsStatus
+from core.metrics import InMemoryMetricsCollector
+from infrastructure.config_manager import DatabaseConfig
+from infrastructure.database_repository import AsyncNewsRepository, NEWS_COLUMNS
+from infrastructure.migrations import NEWS_MIGRATIONS
+
+
+BATCH_SIZE = 50000
+LIMIT = 10
+
+QUERIES = {
+    # Statements as they were before the migration: bound status, every column
+    'select (legacy)': (
+        'SELECT * FROM news WHERE status = ? ORDER BY created_date ASC LIMIT ?',
+        (NewsStatus.PARSED.value, LIMIT)
+    ),
+    'select': (
+        f"SELECT {NEWS_COLUMNS} FROM news WHERE status = 'parsed' ORDER BY created_date ASC LIMIT ?",
+        (LIMIT,)
+    ),
+    'claim': (
+        f'''
+        UPDATE news SET status = 'processing', claimed_by = 'bench', lease_expires = 0
+        WHERE id IN (
+            SELECT id FROM news WHERE status = 'parsed' ORDER BY created_date ASC LIMIT ?
+        )
+        RETURNING {NEWS_COLUMNS}
+        ''',
+        (LIMIT,)
+    ),
+}
+
+
+def create_database(path: str):
+    config = DatabaseConfig(path=path, near_duplicate_distance=-1)
+    repository = AsyncNewsRepository(config, InMemoryMetricsCollector())
+
+    async def init():
+        await repository.initialize()
+        await repository.close()
+
+    asyncio.run(init())
+
+
+def fill(db: sqlite3.Connection, rows: int, pending: float):
+    start = datetime(2024, 1, 1)
+    body = 'Новость ' * 60
+    statuses = [NewsStatus.SENT.value] * 18 + [NewsStatus.FAILED.value] * 2
+
+    # Queued news are the newest ones; everything older has already been sent or failed
+    backlog_start = rows - int(rows * pending)
+
+    def generate(offset: int, count: int):
+        for i in range(offset, offset + count):
+            if i >= backlog_start:
+                status = random.choice((NewsStatus.PARSED.value, NewsStatus.PROCESSED.value))
+            else:
+                status = random.choice(statuses)
+            created = (start + timedelta(seconds=i * 15)).isoformat(sep=' ')
+            yield (
+                f'Заголовок {i}', body, f'https://example.com/news/{i}', f'source{i % 40}',
+                'Саратов', f'hash{i}', body if status != NewsStatus.PARSED.value else None,
+                created, created, status
+            )
+
+    db.execute('PRAGMA synchronous = OFF')
+    for offset in range(0, rows, BATCH_SIZE):
+        count = min(BATCH_SIZE, rows - offset)
+        db.executemany('''
+            INSERT INTO news (
+                title, content, url, source, city, original_hash, rephrased_content,
+                published_date, created_date, status
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', generate(offset, count))
+        db.commit()
+        print(f"  {offset + count:>10} rows", end='\r')
+    db.execute('ANALYZE')
+    db.commit()
+    print()
+
+
+def measure(db: sqlite3.Connection, sql: str, params, iterations: int) -> float:
+    def run():
+        db.execute(sql, params).fetchall()
+        # Claims are rolled back so every iteration sees the same queue
+        db.rollback()
+
+    run()
+    start = time.perf_counter()
+    for _ in range(iterations):
+        run()
+    return (time.perf_counter() - start) / iterations * 1000
+
+
+def report(db: sqlite3.Connection, label: str, iterations: int):
+    print(f"\n{label}")
+    for name, (sql, params) in QUERIES.items():
+        plan = '; '.join(row[3] for row in db.execute(f'EXPLAIN QUERY PLAN {sql}', params))
+        elapsed = measure(db, sql, params, iterations)
+        print(f"  {name:<16}{elapsed:>10.3f} ms  {plan}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the status queue queries')
+    parser.add_argument('--rows', type=int, default=2_000_000)
+    parser.add_argument('--pending', type=float, default=0.01, help='share of newest rows still queued')
+    parser.add_argument('--iterations', type=int, default=50)
+    parser.add_argument('--path', help='database file, kept after the run (default: temporary)')
+    args = parser.parse_args()
+
+    workdir = None if args.path else tempfile.mkdtemp()
+    path = args.path or os.path.join(workdir, 'queue.db')
+    if not os.path.exists(path):
+        print(f"Creating {args.rows} rows in {path}")
+        create_database(path)
+        with sqlite3.connect(path) as db:
+            fill(db, args.rows, args.pending)
+
+    db = sqlite3.connect(path)
+    try:
+        db.execute('DROP INDEX IF EXISTS idx_news_queue')
+        report(db, 'Legacy indexes', args.iterations)
+
+        for statement in NEWS_MIGRATIONS[0].statements:
+            db.execute(statement)
+        db.execute('ANALYZE')
+        db.commit()
+        report(db, 'With idx_news_queue', args.iterations)
+    finally:
+        db.close()
+        if workdir:
+            shutil.rmtree(workdir)
+
+
+if __name__ == '__main__':
+    main()
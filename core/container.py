@@ -1,4 +1,4 @@
-from typing import Dict, Any, TypeVar, Type, Callable, Optional
+from typing import Dict, Any, TypeVar, Type, Callable, Optional, Set
 import inspect
 from functools import wraps
 
@@ -10,6 +10,7 @@ class DIContainer:
         self._services: Dict[str, Any] = {}
         self._factories: Dict[str, Callable] = {}
         self._singletons: Dict[str, Any] = {}
+        self._singleton_factories: Set[str] = set()
         
     def register_singleton(self, interface: Type[T], implementation: Type[T]) -> 'DIContainer':
         key = self._get_key(interface)
@@ -31,6 +32,12 @@ class DIContainer:
         self._factories[key] = factory
         return self
     
+    def register_singleton_factory(self, interface: Type[T], factory: Callable[[], T]) -> 'DIContainer':
+        key = self._get_key(interface)
+        self._factories[key] = factory
+        self._singleton_factories.add(key)
+        return self
+    
     def resolve(self, interface: Type[T]) -> T:
         key = self._get_key(interface)
         
@@ -51,7 +58,10 @@ class DIContainer:
                 return instance
             else:
                 # It's a factory function
-                return factory()
+                instance = factory()
+                if key in self._singleton_factories:
+                    self._singletons[key] = instance
+                return instance
         
         raise ValueError(f"Service {interface.__name__} not registered")
     
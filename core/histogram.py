@@ -0,0 +1,131 @@
+import math
+import time
+from typing import Dict, List, Optional
+
+
+# Bucket bounds grow by 2^(1/8), so a reported quantile is within ~4.5% of the true value
+BUCKETS_PER_DOUBLING = 8
+MIN_VALUE = 1e-6  # 1 µs
+MAX_VALUE = 3600.0  # 1 h; larger values land in the last bucket
+
+_GROWTH = 2 ** (1 / BUCKETS_PER_DOUBLING)
+_LOG_GROWTH = math.log(_GROWTH)
+BUCKET_COUNT = math.ceil(math.log(MAX_VALUE / MIN_VALUE) / _LOG_GROWTH) + 1
+
+
+class LogHistogram:
+    """Fixed-size log-bucketed histogram: O(1) record, memory independent of the sample count."""
+
+    __slots__ = ('counts', 'count', 'total', 'min', 'max')
+
+    def __init__(self):
+        self.counts: List[int] = [0] * BUCKET_COUNT
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    @staticmethod
+    def bucket_index(value: float) -> int:
+        if value <= MIN_VALUE:
+            return 0
+        return min(BUCKET_COUNT - 1, math.ceil(math.log(value / MIN_VALUE) / _LOG_GROWTH))
+
+    @staticmethod
+    def bucket_upper_bound(index: int) -> float:
+        return MIN_VALUE * _GROWTH ** index
+
+    def record(self, value: float):
+        self.counts[self.bucket_index(value)] += 1
+        self.count += 1
+        self.total += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def merge(self, other: 'LogHistogram'):
+        if not other.count:
+            return
+        counts = self.counts
+        for index, bucket_count in enumerate(other.counts):
+            if bucket_count:
+                counts[index] += bucket_count
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def quantile(self, q: float) -> Optional[float]:
+        if not self.count:
+            return None
+
+        rank = q * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if bucket_count and seen >= rank:
+                # Geometric middle of the bucket, capped by the exact extremes
+                midpoint = self.bucket_upper_bound(index) / math.sqrt(_GROWTH)
+                return max(self.min, min(self.max, midpoint))
+        return self.max
+
+
+class WindowedHistogram:
+    """Lifetime histogram plus a sliding window of recent samples for rates and recent percentiles."""
+
+    __slots__ = ('lifetime', 'window_seconds', '_slot_seconds', '_slots', '_slot_ids')
+
+    def __init__(self, window_seconds: float = 60.0, slots: int = 6):
+        self.lifetime = LogHistogram()
+        self.window_seconds = window_seconds
+        self._slot_seconds = window_seconds / slots
+        self._slots = [LogHistogram() for _ in range(slots)]
+        self._slot_ids = [-1] * slots
+
+    def _slot(self, now: float) -> LogHistogram:
+        slot_id = int(now // self._slot_seconds)
+        position = slot_id % len(self._slots)
+        if self._slot_ids[position] != slot_id:
+            # The slot last held samples from a full window ago
+            self._slots[position] = LogHistogram()
+            self._slot_ids[position] = slot_id
+        return self._slots[position]
+
+    def record(self, value: float, now: Optional[float] = None):
+        self.lifetime.record(value)
+        self._slot(time.monotonic() if now is None else now).record(value)
+
+    def window(self, now: Optional[float] = None) -> LogHistogram:
+        current = int((time.monotonic() if now is None else now) // self._slot_seconds)
+        merged = LogHistogram()
+        for slot_id, slot in zip(self._slot_ids, self._slots):
+            if current - len(self._slots) < slot_id <= current:
+                merged.merge(slot)
+        return merged
+
+    def stats(self) -> Dict[str, float]:
+        lifetime = self.lifetime
+        if not lifetime.count:
+            return {}
+
+        recent = self.window()
+        stats = {
+            'count': lifetime.count,
+            'min': lifetime.min,
+            'max': lifetime.max,
+            'avg': lifetime.total / lifetime.count,
+            'total': lifetime.total,
+            'p50': lifetime.quantile(0.5),
+            'p90': lifetime.quantile(0.9),
+            'p99': lifetime.quantile(0.99),
+            'window_count': recent.count,
+            'window_rate': recent.count / self.window_seconds,
+        }
+        if recent.count:
+            stats.update({
+                'window_p50': recent.quantile(0.5),
+                'window_p90': recent.quantile(0.9),
+                'window_p99': recent.quantile(0.99),
+            })
+        return stats
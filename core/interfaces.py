@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import List, Dict, Optional, Any, AsyncIterator, Tuple
+from typing import List, Dict, Optional, Any, AsyncIterator, Iterable, Tuple
 from datetime import datetime
 from dataclasses import dataclass, field, replace
 from enum import Enum
@@ -8,11 +8,20 @@ import asyncio
 
 class NewsStatus(Enum):
     PARSED = "parsed"
+    PROCESSING = "processing"
     PROCESSED = "processed"
+    SENDING = "sending"
     SENT = "sent"
     FAILED = "failed"
 
 
+# Queue status -> in-flight status a claimed row holds until its lease expires
+CLAIM_STATES = {
+    NewsStatus.PARSED: NewsStatus.PROCESSING,
+    NewsStatus.PROCESSED: NewsStatus.SENDING,
+}
+
+
 @dataclass(frozen=True)
 class NewsItem:
     title: str
@@ -41,6 +50,7 @@ class SourceConfig:
     enabled: bool = True
     priority: int = 1
     timeout: int = 30
+    html_backend: Optional[str] = None
 
 
 @dataclass(frozen=True)
@@ -58,7 +68,26 @@ class INewsParser(ABC):
         pass
     
     @abstractmethod
-    async def parse_all_sources(self) -> List[NewsItem]:
+    async def parse_all_sources(self, source_names: Optional[Iterable[str]] = None) -> List[NewsItem]:
+        pass
+    
+    @abstractmethod
+    def parse_sources_stream(self, source_names: Optional[Iterable[str]] = None) -> AsyncIterator[List[NewsItem]]:
+        pass
+    
+    # Feed state (HTTP validators, watermarks) of parsed sources is persisted only
+    # once their items are saved; a discarded state makes the next poll refetch.
+    # saved_counts is the number of new rows per source, the poll's real yield
+    @abstractmethod
+    async def commit_parsed(
+        self, 
+        source_names: Optional[Iterable[str]] = None, 
+        saved_counts: Optional[Dict[str, int]] = None
+    ):
+        pass
+    
+    @abstractmethod
+    def discard_parsed(self, source_names: Optional[Iterable[str]] = None):
         pass
     
     @abstractmethod
@@ -71,10 +100,29 @@ class INewsRepository(ABC):
     async def save_news(self, news: NewsItem) -> Optional[int]:
         pass
     
+    @abstractmethod
+    async def save_news_batch(self, items: List[NewsItem]) -> List[Optional[int]]:
+        pass
+    
     @abstractmethod
     async def get_news_by_status(self, status: NewsStatus, limit: int = 10) -> List[NewsItem]:
         pass
     
+    @abstractmethod
+    async def claim_news(
+        self, 
+        status: NewsStatus, 
+        limit: int, 
+        worker_id: str, 
+        lease_seconds: float, 
+        news_ids: Optional[List[int]] = None
+    ) -> List[NewsItem]:
+        pass
+    
+    @abstractmethod
+    async def release_expired_leases(self) -> int:
+        pass
+    
     @abstractmethod
     async def update_news_status(self, news_id: int, status: NewsStatus, **kwargs) -> bool:
         pass
@@ -83,6 +131,10 @@ class INewsRepository(ABC):
     async def news_exists(self, news: NewsItem) -> bool:
         pass
     
+    @abstractmethod
+    async def search_news(self, query: str, limit: int = 20) -> List[NewsItem]:
+        pass
+    
     @abstractmethod
     async def get_statistics(self) -> Dict[str, Any]:
         pass
@@ -90,6 +142,10 @@ class INewsRepository(ABC):
     @abstractmethod
     async def cleanup_old_news(self, days: int) -> int:
         pass
+    
+    @abstractmethod
+    async def enable_incremental_vacuum(self) -> bool:
+        pass
 
 
 class IContentProcessor(ABC):
@@ -134,6 +190,19 @@ class IMetricsCollector(ABC):
     @abstractmethod
     def set_gauge(self, metric: str, value: float, tags: Dict[str, str] = None):
         pass
+    
+    # Bound handles: the key is built once, so hot paths can cache them at construction
+    @abstractmethod
+    def counter(self, metric: str, tags: Dict[str, str] = None) -> Any:
+        pass
+    
+    @abstractmethod
+    def gauge(self, metric: str, tags: Dict[str, str] = None) -> Any:
+        pass
+    
+    @abstractmethod
+    def histogram(self, metric: str, tags: Dict[str, str] = None) -> Any:
+        pass
 
 
 class IEventBus(ABC):
@@ -168,5 +237,11 @@ class ProcessingError(Exception):
     pass
 
 
+class RateLimitError(ProcessingError):
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
 class CircuitBreakerOpenError(Exception):
     pass
\ No newline at end of file
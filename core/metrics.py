@@ -1,31 +1,103 @@
+import asyncio
 import time
 import logging
-from typing import Dict, Optional, DefaultDict
+import weakref
+from typing import Callable, Dict, Optional, DefaultDict
 from collections import defaultdict
 from .interfaces import IMetricsCollector
+from .histogram import WindowedHistogram
+from .tracing import tracer
+
+
+class CounterHandle:
+    __slots__ = ('_counters', 'key')
+    
+    def __init__(self, counters: DefaultDict[str, int], key: str):
+        self._counters = counters
+        self.key = key
+    
+    def inc(self, amount: int = 1):
+        self._counters[self.key] += amount
+
+
+class GaugeHandle:
+    __slots__ = ('_gauges', 'key')
+    
+    def __init__(self, gauges: Dict[str, float], key: str):
+        self._gauges = gauges
+        self.key = key
+    
+    def set(self, value: float):
+        self._gauges[self.key] = value
+
+
+class HistogramHandle:
+    __slots__ = ('_histogram', 'key')
+    
+    def __init__(self, histogram: WindowedHistogram, key: str):
+        self._histogram = histogram
+        self.key = key
+    
+    def record(self, value: float):
+        self._histogram.record(value)
+
+
+class HandleFamily(dict):
+    """Handles of one metric keyed by the value of a single tag, bound on first use."""
+    
+    def __init__(self, factory: Callable, metric: str, tag: str):
+        super().__init__()
+        self._factory = factory
+        self._metric = metric
+        self._tag = tag
+    
+    def __missing__(self, value: str):
+        handle = self[value] = self._factory(self._metric, {self._tag: value})
+        return handle
 
 
 class InMemoryMetricsCollector(IMetricsCollector):
-    def __init__(self):
+    def __init__(self, window_seconds: float = 60.0):
         self.counters: DefaultDict[str, int] = defaultdict(int)
         self.gauges: Dict[str, float] = {}
-        self.durations: DefaultDict[str, list] = defaultdict(list)
+        # Bounded histograms: memory and stats cost stay flat however long the daemon runs
+        self.window_seconds = window_seconds
+        self.durations: Dict[str, WindowedHistogram] = {}
         self.logger = logging.getLogger(__name__)
     
     def increment_counter(self, metric: str, tags: Dict[str, str] = None):
         key = self._build_key(metric, tags)
         self.counters[key] += 1
-        self.logger.debug(f"Counter incremented: {key} = {self.counters[key]}")
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(f"Counter incremented: {key} = {self.counters[key]}")
     
     def record_duration(self, metric: str, duration: float, tags: Dict[str, str] = None):
         key = self._build_key(metric, tags)
-        self.durations[key].append(duration)
-        self.logger.debug(f"Duration recorded: {key} = {duration:.3f}s")
+        self._histogram(key).record(duration)
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(f"Duration recorded: {key} = {duration:.3f}s")
     
     def set_gauge(self, metric: str, value: float, tags: Dict[str, str] = None):
         key = self._build_key(metric, tags)
         self.gauges[key] = value
-        self.logger.debug(f"Gauge set: {key} = {value}")
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(f"Gauge set: {key} = {value}")
+    
+    def counter(self, metric: str, tags: Dict[str, str] = None) -> CounterHandle:
+        return CounterHandle(self.counters, self._build_key(metric, tags))
+    
+    def gauge(self, metric: str, tags: Dict[str, str] = None) -> GaugeHandle:
+        return GaugeHandle(self.gauges, self._build_key(metric, tags))
+    
+    def histogram(self, metric: str, tags: Dict[str, str] = None) -> HistogramHandle:
+        key = self._build_key(metric, tags)
+        return HistogramHandle(self._histogram(key), key)
+    
+    def _histogram(self, key: str) -> WindowedHistogram:
+        histogram = self.durations.get(key)
+        if histogram is None:
+            histogram = self.durations[key] = WindowedHistogram(self.window_seconds)
+        return histogram
     
     def get_counter(self, metric: str, tags: Dict[str, str] = None) -> int:
         key = self._build_key(metric, tags)
@@ -37,18 +109,8 @@ class InMemoryMetricsCollector(IMetricsCollector):
     
     def get_duration_stats(self, metric: str, tags: Dict[str, str] = None) -> Dict[str, float]:
         key = self._build_key(metric, tags)
-        durations = self.durations.get(key, [])
-        
-        if not durations:
-            return {}
-        
-        return {
-            'count': len(durations),
-            'min': min(durations),
-            'max': max(durations),
-            'avg': sum(durations) / len(durations),
-            'total': sum(durations)
-        }
+        histogram = self.durations.get(key)
+        return histogram.stats() if histogram else {}
     
     def _build_key(self, metric: str, tags: Dict[str, str] = None) -> str:
         if not tags:
@@ -61,64 +123,99 @@ class InMemoryMetricsCollector(IMetricsCollector):
         return {
             'counters': dict(self.counters),
             'gauges': dict(self.gauges),
-            'durations': {k: self.get_duration_stats(k.split('[')[0], 
-                                                   self._parse_tags(k)) 
-                         for k in self.durations.keys()}
+            'durations': {
+                key: histogram.stats() for key, histogram in self.durations.items()
+                if histogram.lifetime.count
+            }
         }
+
+
+class EventLoopLagMonitor:
+    def __init__(self, metrics: IMetricsCollector, interval: float = 0.5):
+        self.metrics = metrics
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
     
-    def _parse_tags(self, key: str) -> Optional[Dict[str, str]]:
-        if '[' not in key:
-            return None
-        
-        tag_part = key.split('[')[1].rstrip(']')
-        if not tag_part:
-            return None
-        
-        tags = {}
-        for tag in tag_part.split(','):
-            if '=' in tag:
-                k, v = tag.split('=', 1)
-                tags[k] = v
-        
-        return tags if tags else None
+    async def __aenter__(self):
+        self.start()
+        return self
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.stop()
+    
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.ensure_future(self._run())
+    
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+    
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            # Anything blocking the loop delays this wake-up beyond the interval
+            started = loop.time()
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, loop.time() - started - self.interval)
+            self.metrics.record_duration("event_loop.lag", lag)
+            self.metrics.set_gauge("event_loop.lag", lag)
 
 
 def timed_metric(metrics_getter, metric_name: str, tags: Dict[str, str] = None):
     def decorator(func):
-        async def async_wrapper(*args, **kwargs):
+        # Handles per collector, bound on the first call instead of rebuilding three keys per call.
+        # perf_counter_ns is monotonic and resolves the sub-millisecond calls time.time() rounds away
+        bound_handles = weakref.WeakKeyDictionary()
+        
+        def handles_for(instance):
             # Get metrics instance from the first argument (self)
-            metrics = metrics_getter(args[0]) if callable(metrics_getter) else metrics_getter
-            start_time = time.time()
+            metrics = metrics_getter(instance) if callable(metrics_getter) else metrics_getter
+            handles = bound_handles.get(metrics)
+            if handles is None:
+                handles = bound_handles[metrics] = (
+                    metrics.counter(f"{metric_name}.success", tags),
+                    metrics.counter(f"{metric_name}.error", tags),
+                    metrics.histogram(metric_name, tags)
+                )
+            return handles
+        
+        async def async_wrapper(*args, **kwargs):
+            success, error, duration = handles_for(args[0])
+            start_ns = time.perf_counter_ns()
             try:
-                result = await func(*args, **kwargs)
-                metrics.increment_counter(f"{metric_name}.success", tags)
+                with tracer.span(metric_name, tags):
+                    result = await func(*args, **kwargs)
+                success.inc()
                 return result
             except Exception as e:
-                metrics.increment_counter(f"{metric_name}.error", tags)
+                error.inc()
                 raise
             finally:
-                duration = time.time() - start_time
-                metrics.record_duration(metric_name, duration, tags)
+                duration.record((time.perf_counter_ns() - start_ns) / 1e9)
         
         def sync_wrapper(*args, **kwargs):
-            # Get metrics instance from the first argument (self)
-            metrics = metrics_getter(args[0]) if callable(metrics_getter) else metrics_getter
-            start_time = time.time()
+            success, error, duration = handles_for(args[0])
+            start_ns = time.perf_counter_ns()
             try:
-                result = func(*args, **kwargs)
-                metrics.increment_counter(f"{metric_name}.success", tags)
+                with tracer.span(metric_name, tags):
+                    result = func(*args, **kwargs)
+                success.inc()
                 return result
             except Exception as e:
-                metrics.increment_counter(f"{metric_name}.error", tags)
+                error.inc()
                 raise
             finally:
-                duration = time.time() - start_time
-                metrics.record_duration(metric_name, duration, tags)
+                duration.record((time.perf_counter_ns() - start_ns) / 1e9)
         
-        import asyncio
         if asyncio.iscoroutinefunction(func):
             return async_wrapper
         else:
             return sync_wrapper
     
-    return decorator
\ No newline at end of file
+    return decorator
@@ -0,0 +1,118 @@
+import asyncio
+import time
+import logging
+from typing import Dict, Optional
+
+from .interfaces import IMetricsCollector
+
+
+class TokenBucketRateLimiter:
+    """Token bucket with an in-flight cap and AIMD adaptation to 429 responses."""
+
+    def __init__(
+        self,
+        rate: float,
+        burst: int = 1,
+        max_in_flight: int = 1,
+        min_rate: Optional[float] = None,
+        metrics: Optional[IMetricsCollector] = None,
+        name: str = "default"
+    ):
+        if rate <= 0:
+            raise ValueError("Rate must be positive")
+
+        self.max_rate = rate
+        self.min_rate = min_rate or rate / 10
+        self.rate = rate
+        self.capacity = max(1, burst)
+        self.metrics = metrics
+        self.name = name
+        self.logger = logging.getLogger(__name__)
+
+        self._tokens = float(self.capacity)
+        self._updated_at = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = asyncio.Lock()
+        self._in_flight = asyncio.Semaphore(max(1, max_in_flight))
+        self._wait_metric = metrics.histogram("rate_limiter.wait", {"limiter": name}) if metrics else None
+
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        self.release()
+
+    async def acquire(self):
+        wait_start = time.monotonic()
+        await self._in_flight.acquire()
+        try:
+            await self._take_token()
+        except BaseException:
+            self._in_flight.release()
+            raise
+
+        if self._wait_metric:
+            self._wait_metric.record(time.monotonic() - wait_start)
+
+    def release(self):
+        self._in_flight.release()
+
+    async def _take_token(self):
+        # Waiters queue on the lock, so tokens are handed out in FIFO order
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self._blocked_until:
+                    await asyncio.sleep(self._blocked_until - now)
+                    continue
+
+                self._refill(now)
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+    def _refill(self, now: float):
+        elapsed = now - self._updated_at
+        self._updated_at = now
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+
+    def on_success(self):
+        # Additive increase back towards the configured rate
+        if self.rate < self.max_rate:
+            self.rate = min(self.max_rate, self.rate + self.max_rate * 0.1)
+            self._report_rate()
+
+    def on_rate_limited(self, retry_after: Optional[float] = None):
+        # Multiplicative decrease and a pause honouring Retry-After
+        self._refill(time.monotonic())
+        self.rate = max(self.min_rate, self.rate / 2)
+        self._tokens = 0.0
+
+        pause = retry_after if retry_after is not None else 1 / self.rate
+        self._blocked_until = max(self._blocked_until, time.monotonic() + pause)
+
+        self.logger.warning(f"Rate limited ({self.name}): rate lowered to {self.rate:.3f}/s, pausing {pause:.1f}s")
+        if self.metrics:
+            self.metrics.increment_counter("rate_limiter.throttled", {"limiter": self.name})
+        self._report_rate()
+
+    def _report_rate(self):
+        if self.metrics:
+            self.metrics.set_gauge("rate_limiter.rate", self.rate, {"limiter": self.name})
+
+
+class KeyedConcurrencyLimiter:
+    """Caps concurrent work per key (e.g. per host) for every caller sharing the instance."""
+
+    def __init__(self, limit: int = 1):
+        self.limit = max(1, limit)
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+
+    def slot(self, key: str) -> asyncio.Semaphore:
+        semaphore = self._semaphores.get(key)
+        if semaphore is None:
+            semaphore = self._semaphores[key] = asyncio.Semaphore(self.limit)
+        return semaphore
@@ -0,0 +1,130 @@
+import hashlib
+import re
+import time
+from collections import OrderedDict, defaultdict
+from typing import Dict, List, Optional, Set, Tuple
+
+
+FINGERPRINT_BITS = 64
+
+_WORD = re.compile(r'\w+')
+
+
+def shingles(text: str, size: int = 2) -> Set[str]:
+    words = _WORD.findall(text.lower())
+    if len(words) < size:
+        return set(words)
+    return {' '.join(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+
+def simhash(text: str, shingle_size: int = 2) -> int:
+    weights = [0] * FINGERPRINT_BITS
+
+    for shingle in shingles(text, shingle_size):
+        digest = hashlib.blake2b(shingle.encode('utf-8'), digest_size=8).digest()
+        value = int.from_bytes(digest, 'big')
+        for bit in range(FINGERPRINT_BITS):
+            weights[bit] += 1 if value >> bit & 1 else -1
+
+    fingerprint = 0
+    for bit, weight in enumerate(weights):
+        if weight > 0:
+            fingerprint |= 1 << bit
+    return fingerprint
+
+
+def hamming_distance(a: int, b: int) -> int:
+    return bin(a ^ b).count('1')
+
+
+def to_signed(fingerprint: int) -> int:
+    # SQLite integers are signed 64-bit
+    return fingerprint - (1 << FINGERPRINT_BITS) if fingerprint >= 1 << (FINGERPRINT_BITS - 1) else fingerprint
+
+
+def from_signed(value: int) -> int:
+    return value + (1 << FINGERPRINT_BITS) if value < 0 else value
+
+
+class SimHashIndex:
+    """LSH over SimHash fingerprints: max_distance + 1 bands guarantee a shared band for any match."""
+
+    def __init__(self, max_distance: int = 8):
+        if not 0 <= max_distance < FINGERPRINT_BITS:
+            raise ValueError(f"max_distance must be between 0 and {FINGERPRINT_BITS - 1}, got {max_distance}")
+        self.max_distance = max_distance
+        band_count = max_distance + 1
+        band_width = FINGERPRINT_BITS // band_count
+
+        self._bands: List[Tuple[int, int]] = []
+        for band in range(band_count):
+            shift = band * band_width
+            width = band_width if band < band_count - 1 else FINGERPRINT_BITS - shift
+            self._bands.append((shift, (1 << width) - 1))
+
+        self._buckets: Dict[Tuple[int, int], List[int]] = defaultdict(list)
+        self._fingerprints: Dict[int, int] = {}
+        # doc_id -> time added, oldest first, for evicting entries that left the window
+        self._added: 'OrderedDict[int, float]' = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._fingerprints)
+
+    def _keys(self, fingerprint: int):
+        for band, (shift, mask) in enumerate(self._bands):
+            yield band, fingerprint >> shift & mask
+
+    def add(self, doc_id: int, fingerprint: int, added_at: Optional[float] = None):
+        if doc_id in self._fingerprints:
+            self.remove(doc_id)
+
+        self._fingerprints[doc_id] = fingerprint
+        self._added[doc_id] = time.time() if added_at is None else added_at
+        for key in self._keys(fingerprint):
+            self._buckets[key].append(doc_id)
+
+    def remove(self, doc_id: int):
+        fingerprint = self._fingerprints.pop(doc_id, None)
+        if fingerprint is None:
+            return
+        self._added.pop(doc_id, None)
+
+        for key in self._keys(fingerprint):
+            bucket = self._buckets.get(key)
+            if bucket and doc_id in bucket:
+                bucket.remove(doc_id)
+                if not bucket:
+                    del self._buckets[key]
+
+    def clear(self):
+        self._buckets.clear()
+        self._fingerprints.clear()
+        self._added.clear()
+
+    def evict_older_than(self, cutoff: float) -> int:
+        # Entries are added in time order, so only the head needs checking
+        evicted = 0
+        while self._added:
+            doc_id, added_at = next(iter(self._added.items()))
+            if added_at >= cutoff:
+                break
+            self.remove(doc_id)
+            evicted += 1
+        return evicted
+
+    def find_near(self, fingerprint: int) -> Optional[Tuple[int, int]]:
+        # Returns (doc_id, distance) of the closest candidate within max_distance
+        best: Optional[Tuple[int, int]] = None
+        seen = set()
+
+        for key in self._keys(fingerprint):
+            for doc_id in self._buckets.get(key, ()):
+                if doc_id in seen:
+                    continue
+                seen.add(doc_id)
+
+                distance = hamming_distance(fingerprint, self._fingerprints[doc_id])
+                if distance <= self.max_distance and (best is None or distance < best[1]):
+                    best = (doc_id, distance)
+
+        return best
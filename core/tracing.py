@@ -0,0 +1,159 @@
+import asyncio
+import threading
+import time
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, List, Optional
+
+
+class Span:
+    """One timed operation; children are the spans started while it was current."""
+
+    __slots__ = ('name', 'attributes', 'start_ns', 'end_ns', 'lane', 'children')
+
+    def __init__(self, name: str, attributes: Dict[str, Any]):
+        self.name = name
+        self.attributes = attributes
+        self.start_ns = time.perf_counter_ns()
+        self.end_ns: Optional[int] = None
+        self.lane = _current_lane()
+        self.children: List['Span'] = []
+
+    @property
+    def duration(self) -> float:
+        end_ns = self.end_ns if self.end_ns is not None else time.perf_counter_ns()
+        return (end_ns - self.start_ns) / 1e9
+
+    def walk(self):
+        yield self
+        for child in self.children:
+            yield from child.walk()
+
+
+def _current_lane() -> int:
+    # Spans of one asyncio task nest strictly, so each task gets its own row in the trace viewer
+    try:
+        task = asyncio.current_task()
+    except RuntimeError:
+        task = None
+    return id(task) if task is not None else threading.get_ident()
+
+
+# Each asyncio task inherits the span that was current when it was created
+_current_span: ContextVar[Optional[Span]] = ContextVar('current_span', default=None)
+
+
+class _SpanScope:
+    __slots__ = ('_tracer', '_name', '_attributes', '_span', '_token')
+
+    def __init__(self, tracer: 'Tracer', name: str, attributes: Dict[str, Any]):
+        self._tracer = tracer
+        self._name = name
+        self._attributes = attributes
+
+    def __enter__(self) -> Span:
+        self._span = Span(self._name, self._attributes)
+        self._token = _current_span.set(self._span)
+        return self._span
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        span = self._span
+        span.end_ns = time.perf_counter_ns()
+        if exc_type is not None:
+            span.attributes['error'] = exc_type.__name__
+
+        try:
+            _current_span.reset(self._token)
+        except ValueError:
+            # Exited from another context (e.g. an async generator resumed by a different task)
+            pass
+
+        parent = self._token.old_value
+        if isinstance(parent, Span):
+            parent.children.append(span)
+        else:
+            self._tracer._finish(span)
+        return False
+
+
+class _NoopScope:
+    __slots__ = ()
+
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        return False
+
+
+_NOOP_SCOPE = _NoopScope()
+
+
+class Tracer:
+    """Nested spans over perf_counter_ns; a finished root span is handed to on_finish as a tree."""
+
+    def __init__(self):
+        self.on_finish: Optional[Callable[[Span], None]] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.on_finish is not None
+
+    def configure(self, on_finish: Optional[Callable[[Span], None]]):
+        self.on_finish = on_finish
+
+    def span(self, name: str, attributes: Optional[Dict[str, Any]] = None):
+        # Disabled tracing costs one attribute check per span
+        if self.on_finish is None:
+            return _NOOP_SCOPE
+        return _SpanScope(self, name, dict(attributes) if attributes else {})
+
+    def _finish(self, root: Span):
+        on_finish = self.on_finish
+        if on_finish is not None:
+            on_finish(root)
+
+
+tracer = Tracer()
+
+
+def span(name: str, **attributes):
+    return tracer.span(name, attributes)
+
+
+def annotate(**attributes):
+    # Attach attributes to the current span, e.g. the source a decorated method is working on
+    current = _current_span.get()
+    if current is not None:
+        current.attributes.update(attributes)
+
+
+def to_chrome_trace(roots: List[Span], pid: int = 0) -> Dict[str, Any]:
+    """Chrome trace-event JSON (chrome://tracing, Perfetto): complete events, one row per task."""
+    events = []
+    lanes: Dict[int, int] = {}
+
+    for root in roots:
+        for node in root.walk():
+            if node.end_ns is None:
+                continue
+
+            tid = lanes.get(node.lane)
+            if tid is None:
+                tid = lanes[node.lane] = len(lanes) + 1
+                events.append({
+                    'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': tid,
+                    'args': {'name': node.name}
+                })
+
+            events.append({
+                'name': node.name,
+                'cat': node.name.split('.', 1)[0],
+                'ph': 'X',
+                'ts': node.start_ns / 1000,
+                'dur': (node.end_ns - node.start_ns) / 1000,
+                'pid': pid,
+                'tid': tid,
+                'args': {key: str(value) for key, value in node.attributes.items()}
+            })
+
+    return {'traceEvents': events, 'displayTimeUnit': 'ms'}
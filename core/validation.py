@@ -1,9 +1,136 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from collections import deque
+from dataclasses import dataclass
+from typing import List, Optional, Dict, Iterable, Tuple
 import re
 from .interfaces import NewsItem, NewsValidationError
 
 
+# Keyword categories produced by build_keyword_automaton
+REGION = 'region'
+EXCLUDE = 'exclude'
+SENSITIVE = 'sensitive'
+REGIONAL_ANCHOR = 'regional_anchor'
+
+# Ambiguous keywords that need context validation
+AMBIGUOUS_KEYWORDS = {
+    'пугачев': {
+        'geographic_context': ['город', 'районе', 'области', 'муниципальный', 'администрация', 'мэр', 'жители'],
+        'person_context': ['пугачева', 'алла', 'певица', 'артистка', 'интервью', 'концерт', 'песня', 'госдума', 'депутат']
+    },
+    'маркс': {
+        'geographic_context': ['город', 'районе', 'области', 'муниципальный', 'администрация', 'мэр', 'жители'],
+        'person_context': ['карл', 'философ', 'капитал', 'коммунизм', 'марксизм', 'теория']
+    },
+    'энгельс': {
+        'geographic_context': ['город', 'районе', 'области', 'муниципальный', 'администрация', 'мэр', 'жители'],
+        'person_context': ['фридрих', 'философ', 'коммунизм', 'маркс', 'теория']
+    }
+}
+
+# Words that confirm the region when an ambiguous keyword has unclear context
+REGIONAL_ANCHORS = ['саратов', 'саратовская область', 'саратовский']
+
+
+def context_category(keyword: str, context: str) -> str:
+    return f"{keyword}:{context}"
+
+
+@dataclass(frozen=True)
+class KeywordMatch:
+    keyword: str
+    category: str
+    start: int
+    end: int
+
+
+class KeywordAutomaton:
+    """Aho-Corasick matcher that finds every categorized keyword in a single pass."""
+    
+    def __init__(self, categories: Dict[str, Iterable[str]]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[Tuple[str, str]]] = [[]]
+        self.categories = {}
+        
+        for category, keywords in categories.items():
+            unique_keywords = list(dict.fromkeys(kw.lower() for kw in keywords if kw))
+            self.categories[category] = unique_keywords
+            for keyword in unique_keywords:
+                self._add(keyword, category)
+        
+        self._build_failure_links()
+    
+    def _add(self, keyword: str, category: str):
+        node = 0
+        for char in keyword:
+            next_node = self._goto[node].get(char)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+                self._goto[node][char] = next_node
+            node = next_node
+        self._output[node].append((keyword, category))
+    
+    def _build_failure_links(self):
+        queue = deque(self._goto[0].values())
+        
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(char, 0)
+                
+                # Inherit matches that end at the same position via the failure link
+                self._output[child] = self._output[child] + self._output[self._fail[child]]
+    
+    def find_all(self, text: str) -> List[KeywordMatch]:
+        goto, fail, output = self._goto, self._fail, self._output
+        matches = []
+        node = 0
+        
+        for position, char in enumerate(text):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            
+            for keyword, category in output[node]:
+                matches.append(KeywordMatch(keyword, category, position - len(keyword) + 1, position + 1))
+        
+        return matches
+    
+    def find_by_category(self, text: str) -> Dict[str, List[KeywordMatch]]:
+        result: Dict[str, List[KeywordMatch]] = {}
+        for match in self.find_all(text):
+            result.setdefault(match.category, []).append(match)
+        return result
+
+
+def build_keyword_automaton(
+    region_keywords: Iterable[str],
+    exclude_keywords: Iterable[str] = (),
+    sensitive_keywords: Iterable[str] = ()
+) -> KeywordAutomaton:
+    categories = {
+        REGION: region_keywords,
+        EXCLUDE: exclude_keywords,
+        SENSITIVE: sensitive_keywords,
+        REGIONAL_ANCHOR: REGIONAL_ANCHORS
+    }
+    
+    for keyword, contexts in AMBIGUOUS_KEYWORDS.items():
+        for context, words in contexts.items():
+            categories[context_category(keyword, context)] = words
+    
+    return KeywordAutomaton(categories)
+
+
 class INewsValidator(ABC):
     @abstractmethod
     def validate(self, news: NewsItem) -> Optional[str]:
@@ -69,57 +196,46 @@ class UrlValidator(INewsValidator):
 
 
 class RegionKeywordValidator(INewsValidator):
-    def __init__(self, keywords: List[str], exclude_keywords: List[str] = None):
+    def __init__(
+        self, 
+        keywords: List[str], 
+        exclude_keywords: List[str] = None,
+        automaton: Optional[KeywordAutomaton] = None
+    ):
         self.keywords = [kw.lower() for kw in keywords]
         self.exclude_keywords = [kw.lower() for kw in (exclude_keywords or [])]
-        
-        # Ambiguous keywords that need context validation
-        self.ambiguous_keywords = {
-            'пугачев': {
-                'geographic_context': ['город', 'районе', 'области', 'муниципальный', 'администрация', 'мэр', 'жители'],
-                'person_context': ['пугачева', 'алла', 'певица', 'артистка', 'интервью', 'концерт', 'песня', 'госдума', 'депутат']
-            },
-            'маркс': {
-                'geographic_context': ['город', 'районе', 'области', 'муниципальный', 'администрация', 'мэр', 'жители'],
-                'person_context': ['карл', 'философ', 'капитал', 'коммунизм', 'марксизм', 'теория']
-            },
-            'энгельс': {
-                'geographic_context': ['город', 'районе', 'области', 'муниципальный', 'администрация', 'мэр', 'жители'],
-                'person_context': ['фридрих', 'философ', 'коммунизм', 'маркс', 'теория']
-            }
-        }
+        self.ambiguous_keywords = AMBIGUOUS_KEYWORDS
+        self.automaton = automaton or build_keyword_automaton(self.keywords, self.exclude_keywords)
     
     def validate(self, news: NewsItem) -> Optional[str]:
         text = f"{news.title} {news.content}".lower()
+        hits = self.automaton.find_by_category(text)
         
         # Check for excluded keywords first
-        for exclude_word in self.exclude_keywords:
-            if exclude_word in text:
-                return f"News excluded due to keyword: {exclude_word}"
+        excluded = hits.get(EXCLUDE)
+        if excluded:
+            return f"News excluded due to keyword: {excluded[0].keyword}"
         
         # Check for required regional keywords
-        found_keywords = []
-        for keyword in self.keywords:
-            if keyword in text:
-                if self._is_valid_regional_keyword(keyword, text):
-                    found_keywords.append(keyword)
+        found_keywords = [
+            keyword for keyword in dict.fromkeys(match.keyword for match in hits.get(REGION, []))
+            if self._is_valid_regional_keyword(keyword, hits)
+        ]
         
         if not found_keywords:
             return "No relevant regional keywords found"
         
         return None
     
-    def _is_valid_regional_keyword(self, keyword: str, text: str) -> bool:
+    def _is_valid_regional_keyword(self, keyword: str, hits: Dict[str, List[KeywordMatch]]) -> bool:
         if keyword not in self.ambiguous_keywords:
             return True
         
-        ambiguous_data = self.ambiguous_keywords[keyword]
-        
         # Check for geographic context
-        geographic_found = any(geo_word in text for geo_word in ambiguous_data['geographic_context'])
+        geographic_found = context_category(keyword, 'geographic_context') in hits
         
         # Check for personal context
-        person_found = any(person_word in text for person_word in ambiguous_data['person_context'])
+        person_found = context_category(keyword, 'person_context') in hits
         
         # If geographic context found and no personal context - accept
         if geographic_found and not person_found:
@@ -130,7 +246,7 @@ class RegionKeywordValidator(INewsValidator):
             return False
         
         # If context unclear but other regional words present - accept
-        if any(regional_word in text for regional_word in ['саратов', 'саратовская область', 'саратовский']):
+        if REGIONAL_ANCHOR in hits:
             return True
         
         # If context unclear and no other regional words - reject
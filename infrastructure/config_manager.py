@@ -13,6 +13,14 @@ class DatabaseConfig:
     path: str = './data/news.db'
     connection_pool_size: int = 5
     timeout: float = 30.0
+    cache_size_kb: int = 16384
+    mmap_size: int = 256 * 1024 * 1024  # 256MB
+    near_duplicate_distance: int = 8  # max SimHash Hamming distance, -1 disables
+    near_duplicate_window_days: int = 7
+    near_duplicate_fts_candidates: int = 20  # older news checked via full-text search, 0 disables
+    cleanup_batch_size: int = 1000  # rows deleted per write transaction
+    archive_dir: Optional[str] = None  # gzip JSONL of cleaned-up news, None disables
+    vacuum_step_pages: int = 1000  # free pages returned to the OS per incremental_vacuum step
 
 
 @dataclass(frozen=True)
@@ -25,6 +33,11 @@ class GigaChatConfig:
     delay_seconds: float = 2.0
     max_retries: int = 3
     verify_ssl: bool = False
+    requests_per_second: float = 0.5
+    max_in_flight: int = 2
+    worker_count: int = 2
+    cache_ttl_seconds: float = 3 * 24 * 3600
+    cache_max_entries: int = 5000
 
 
 @dataclass(frozen=True)
@@ -44,6 +57,52 @@ class ParsingConfig:
     max_content_length: int = 2000
     timeout: float = 30.0
     max_concurrent_sources: int = 5
+    http_cache_path: Optional[str] = './data/http_cache.json'
+    parse_executor: str = 'process'  # process, thread or inline
+    parse_workers: int = 2
+    article_fetch_concurrency: int = 4
+    article_fetch_per_host: int = 2
+    feed_watermark_keys: int = 300  # 0 disables skipping of already seen feed entries
+
+
+@dataclass(frozen=True)
+class PipelineConfig:
+    streaming: bool = False
+    # Queue bounds between stages; a full queue blocks the upstream stage
+    save_queue_size: int = 10
+    process_queue_size: int = 20
+    send_queue_size: int = 20
+    # Claimed news stay in flight this long before the reaper returns them to the queue
+    claim_lease_seconds: float = 600.0
+    worker_id: Optional[str] = None  # defaults to hostname:pid
+
+
+@dataclass(frozen=True)
+class SchedulerConfig:
+    adaptive: bool = False
+    min_interval_minutes: float = 2.0
+    max_interval_minutes: float = 180.0
+    max_polls_per_minute: int = 10
+    jitter: float = 0.1  # +-10% of the interval
+    state_path: Optional[str] = './data/scheduler_state.json'
+
+
+@dataclass(frozen=True)
+class DaemonConfig:
+    # Idle re-check of the status queues; new work also wakes the loops directly
+    poll_seconds: float = 30.0
+    drain_timeout_seconds: float = 120.0
+
+
+@dataclass(frozen=True)
+class MetricsConfig:
+    window_seconds: float = 60.0  # sliding window of recent rates and percentiles
+    http_port: int = 0  # /metrics and /healthz endpoint, 0 disables
+    http_host: str = '127.0.0.1'
+    health_cache_seconds: float = 30.0
+    trace_dir: Optional[str] = None  # Chrome trace-event JSON per traced cycle, None disables tracing
+    trace_min_seconds: float = 1.0  # shorter root spans are not written
+    trace_keep: int = 20  # newest trace files kept
 
 
 @dataclass(frozen=True)
@@ -53,6 +112,9 @@ class LoggingConfig:
     format: str = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
     max_file_size: int = 10 * 1024 * 1024  # 10MB
     backup_count: int = 5
+    queue: bool = True  # handlers run on a background thread, the caller only enqueues
+    queue_size: int = 10000  # records beyond this are dropped and counted
+    sampling: Dict[str, float] = field(default_factory=dict)  # logger prefix -> share of DEBUG/INFO kept
 
 
 @dataclass(frozen=True)
@@ -79,6 +141,10 @@ class AppConfig:
     logging: LoggingConfig
     circuit_breaker: CircuitBreakerConfig
     retry: RetryConfig
+    pipeline: PipelineConfig = field(default_factory=PipelineConfig)
+    scheduler: SchedulerConfig = field(default_factory=SchedulerConfig)
+    daemon: DaemonConfig = field(default_factory=DaemonConfig)
+    metrics: MetricsConfig = field(default_factory=MetricsConfig)
     news_sources: Dict[str, SourceConfig] = field(default_factory=dict)
     region_keywords: List[str] = field(default_factory=list)
     exclude_keywords: List[str] = field(default_factory=list)
@@ -106,11 +172,26 @@ class ConfigManager:
         if missing_vars:
             raise ValueError(f"Missing required environment variables: {', '.join(missing_vars)}")
         
+        # The SimHash index splits 64 bits into max_distance + 1 bands, each at least one bit wide
+        near_duplicate_distance = int(os.getenv('NEAR_DUPLICATE_MAX_DISTANCE', '8'))
+        if not -1 <= near_duplicate_distance < 64:
+            raise ValueError(
+                f"NEAR_DUPLICATE_MAX_DISTANCE must be -1 (disabled) or between 0 and 63, got {near_duplicate_distance}"
+            )
+        
         return AppConfig(
             database=DatabaseConfig(
                 path=os.getenv('DATABASE_PATH', './data/news.db'),
                 connection_pool_size=int(os.getenv('DB_POOL_SIZE', '5')),
-                timeout=float(os.getenv('DB_TIMEOUT', '30.0'))
+                timeout=float(os.getenv('DB_TIMEOUT', '30.0')),
+                cache_size_kb=int(os.getenv('DB_CACHE_SIZE_KB', '16384')),
+                mmap_size=int(os.getenv('DB_MMAP_SIZE', str(256 * 1024 * 1024))),
+                near_duplicate_distance=near_duplicate_distance,
+                near_duplicate_window_days=int(os.getenv('NEAR_DUPLICATE_WINDOW_DAYS', '7')),
+                near_duplicate_fts_candidates=int(os.getenv('NEAR_DUPLICATE_FTS_CANDIDATES', '20')),
+                cleanup_batch_size=int(os.getenv('DB_CLEANUP_BATCH_SIZE', '1000')),
+                archive_dir=os.getenv('DB_ARCHIVE_DIR') or None,
+                vacuum_step_pages=int(os.getenv('DB_VACUUM_STEP_PAGES', '1000'))
             ),
             gigachat=GigaChatConfig(
                 credentials=required_vars['GIGACHAT_CREDENTIALS'],
@@ -120,7 +201,15 @@ class ConfigManager:
                 timeout=float(os.getenv('GIGACHAT_TIMEOUT', '60.0')),
                 delay_seconds=float(os.getenv('GIGACHAT_DELAY_SECONDS', '2.0')),
                 max_retries=int(os.getenv('GIGACHAT_MAX_RETRIES', '3')),
-                verify_ssl=os.getenv('GIGACHAT_VERIFY_SSL', 'false').lower() == 'true'
+                verify_ssl=os.getenv('GIGACHAT_VERIFY_SSL', 'false').lower() == 'true',
+                requests_per_second=float(os.getenv(
+                    'GIGACHAT_REQUESTS_PER_SECOND',
+                    str(1 / max(float(os.getenv('GIGACHAT_DELAY_SECONDS', '2.0')), 0.001))
+                )),
+                max_in_flight=int(os.getenv('GIGACHAT_MAX_IN_FLIGHT', '2')),
+                worker_count=int(os.getenv('GIGACHAT_WORKERS', '2')),
+                cache_ttl_seconds=float(os.getenv('REPHRASE_CACHE_TTL_SECONDS', str(3 * 24 * 3600))),
+                cache_max_entries=int(os.getenv('REPHRASE_CACHE_MAX_ENTRIES', '5000'))
             ),
             telegram=TelegramConfig(
                 bot_token=required_vars['TELEGRAM_BOT_TOKEN'],
@@ -135,14 +224,23 @@ class ConfigManager:
                 min_content_length=int(os.getenv('MIN_CONTENT_LENGTH', '100')),
                 max_content_length=int(os.getenv('MAX_CONTENT_LENGTH', '2000')),
                 timeout=float(os.getenv('PARSING_TIMEOUT', '30.0')),
-                max_concurrent_sources=int(os.getenv('MAX_CONCURRENT_SOURCES', '5'))
+                max_concurrent_sources=int(os.getenv('MAX_CONCURRENT_SOURCES', '5')),
+                http_cache_path=os.getenv('HTTP_CACHE_FILE', './data/http_cache.json') or None,
+                parse_executor=os.getenv('PARSE_EXECUTOR', 'process').lower(),
+                parse_workers=int(os.getenv('PARSE_WORKERS', '2')),
+                article_fetch_concurrency=int(os.getenv('ARTICLE_FETCH_CONCURRENCY', '4')),
+                article_fetch_per_host=int(os.getenv('ARTICLE_FETCH_PER_HOST', '2')),
+                feed_watermark_keys=int(os.getenv('FEED_WATERMARK_KEYS', '300'))
             ),
             logging=LoggingConfig(
                 level=os.getenv('LOG_LEVEL', 'INFO'),
                 file=os.getenv('LOG_FILE', './logs/bot.log'),
                 format=os.getenv('LOG_FORMAT', '%(asctime)s - %(name)s - %(levelname)s - %(message)s'),
                 max_file_size=int(os.getenv('LOG_MAX_FILE_SIZE', str(10 * 1024 * 1024))),
-                backup_count=int(os.getenv('LOG_BACKUP_COUNT', '5'))
+                backup_count=int(os.getenv('LOG_BACKUP_COUNT', '5')),
+                queue=os.getenv('LOG_QUEUE', 'true').lower() == 'true',
+                queue_size=int(os.getenv('LOG_QUEUE_SIZE', '10000')),
+                sampling=self._load_log_sampling()
             ),
             circuit_breaker=CircuitBreakerConfig(
                 failure_threshold=int(os.getenv('CIRCUIT_BREAKER_FAILURE_THRESHOLD', '5')),
@@ -155,6 +253,35 @@ class ConfigManager:
                 exponential_base=float(os.getenv('RETRY_EXPONENTIAL_BASE', '2.0')),
                 jitter=os.getenv('RETRY_JITTER', 'true').lower() == 'true'
             ),
+            pipeline=PipelineConfig(
+                streaming=os.getenv('PIPELINE_STREAMING', 'false').lower() == 'true',
+                save_queue_size=int(os.getenv('PIPELINE_SAVE_QUEUE_SIZE', '10')),
+                process_queue_size=int(os.getenv('PIPELINE_PROCESS_QUEUE_SIZE', '20')),
+                send_queue_size=int(os.getenv('PIPELINE_SEND_QUEUE_SIZE', '20')),
+                claim_lease_seconds=float(os.getenv('CLAIM_LEASE_SECONDS', '600')),
+                worker_id=os.getenv('WORKER_ID') or None
+            ),
+            scheduler=SchedulerConfig(
+                adaptive=os.getenv('ADAPTIVE_SCHEDULING', 'false').lower() == 'true',
+                min_interval_minutes=float(os.getenv('SCHEDULER_MIN_INTERVAL_MINUTES', '2')),
+                max_interval_minutes=float(os.getenv('SCHEDULER_MAX_INTERVAL_MINUTES', '180')),
+                max_polls_per_minute=int(os.getenv('SCHEDULER_MAX_POLLS_PER_MINUTE', '10')),
+                jitter=float(os.getenv('SCHEDULER_JITTER', '0.1')),
+                state_path=os.getenv('SCHEDULER_STATE_FILE', './data/scheduler_state.json') or None
+            ),
+            daemon=DaemonConfig(
+                poll_seconds=float(os.getenv('DAEMON_POLL_SECONDS', '30')),
+                drain_timeout_seconds=float(os.getenv('DAEMON_DRAIN_TIMEOUT_SECONDS', '120'))
+            ),
+            metrics=MetricsConfig(
+                window_seconds=float(os.getenv('METRICS_WINDOW_SECONDS', '60')),
+                http_port=int(os.getenv('METRICS_HTTP_PORT', '0')),
+                http_host=os.getenv('METRICS_HTTP_HOST', '127.0.0.1'),
+                health_cache_seconds=float(os.getenv('HEALTH_CACHE_SECONDS', '30')),
+                trace_dir=os.getenv('TRACE_DIR') or None,
+                trace_min_seconds=float(os.getenv('TRACE_MIN_SECONDS', '1')),
+                trace_keep=int(os.getenv('TRACE_KEEP', '20'))
+            ),
             news_sources=self._load_news_sources(),
             region_keywords=self._load_region_keywords(),
             exclude_keywords=self._load_exclude_keywords(),
@@ -184,7 +311,8 @@ class ConfigManager:
                             selector=source_data.get('selector'),
                             enabled=source_data.get('enabled', True),
                             priority=source_data.get('priority', 1),
-                            timeout=source_data.get('timeout', 30)
+                            timeout=source_data.get('timeout', 30),
+                            html_backend=source_data.get('html_backend')
                         )
             except Exception as e:
                 print(f"Warning: Failed to load sources from {sources_file}: {e}")
@@ -207,7 +335,8 @@ class ConfigManager:
                     selector=sources[source_id].selector,
                     enabled=source_id in enabled_sources,
                     priority=sources[source_id].priority,
-                    timeout=sources[source_id].timeout
+                    timeout=sources[source_id].timeout,
+                    html_backend=sources[source_id].html_backend
                 )
         
         # Отключаем источники из DISABLED_SOURCES
@@ -221,7 +350,8 @@ class ConfigManager:
                     selector=sources[source_id].selector,
                     enabled=False,
                     priority=sources[source_id].priority,
-                    timeout=sources[source_id].timeout
+                    timeout=sources[source_id].timeout,
+                    html_backend=sources[source_id].html_backend
                 )
         
         # 3. Если ничего не загрузилось, используем встроенные источники
@@ -259,6 +389,15 @@ class ConfigManager:
             )
         }
     
+    def _load_log_sampling(self) -> Dict[str, float]:
+        # LOG_SAMPLING=services.content_processor_service=0.1,infrastructure.database_repository=0.2
+        sampling = {}
+        for item in os.getenv('LOG_SAMPLING', '').split(','):
+            name, _, rate = item.partition('=')
+            if name.strip() and rate.strip():
+                sampling[name.strip()] = min(1.0, max(0.0, float(rate)))
+        return sampling
+    
     def _load_region_keywords(self) -> List[str]:
         return [
             # Основные города Саратовской области
@@ -1,87 +1,194 @@
-import aiosqlite
+import asyncio
+import gzip
 import hashlib
+import json
 import logging
+import math
+import os
+import re
+import time
 from datetime import datetime
-from typing import List, Dict, Optional, Any
+from functools import partial
+from typing import List, Dict, Optional, Any, Set
 from contextlib import asynccontextmanager
-import os
 
-from core.interfaces import INewsRepository, NewsItem, NewsStatus
+from core.interfaces import INewsRepository, NewsItem, NewsStatus, CLAIM_STATES
 from infrastructure.config_manager import DatabaseConfig
-from core.metrics import timed_metric, IMetricsCollector
+from infrastructure.sqlite_pool import AsyncSQLitePool
+from infrastructure.migrations import apply_migrations
+from core.metrics import timed_metric, HandleFamily, IMetricsCollector
+from core.similarity import SimHashIndex, simhash, hamming_distance, to_signed, from_signed
+
+
+# Columns mapped onto NewsItem; simhash and lease bookkeeping stay in the database
+NEWS_COLUMNS = (
+    'id, title, content, url, source, city, published_date, created_date, '
+    'status, rephrased_content, telegram_message_id'
+)
+
+
+def _status_literal(status: NewsStatus) -> str:
+    # Queue queries inline the status so SQLite can prove the partial idx_news_queue applies
+    return f"'{NewsStatus(status).value}'"
+
+
+def _fts_query(text: str, match_any: bool = False, column: Optional[str] = None) -> Optional[str]:
+    # Free text becomes quoted FTS5 terms, so user input never hits the query syntax
+    terms = list(dict.fromkeys(word.lower() for word in re.findall(r'\w+', text)))
+    if match_any:
+        # Short words barely discriminate and only inflate the OR
+        terms = [f'"{term}"' for term in terms if len(term) > 2][:16]
+    else:
+        # Prefix terms stand in for stemming: "энгельс" also finds "Энгельсе"
+        terms = [f'"{term}"*' for term in terms]
+    if not terms:
+        return None
+    
+    query = (' OR ' if match_any else ' ').join(terms)
+    return f'{column} : ({query})' if column else query
 
 
 class AsyncNewsRepository(INewsRepository):
-    def __init__(self, config: DatabaseConfig, metrics: IMetricsCollector):
+    def __init__(self, config: DatabaseConfig, metrics: IMetricsCollector, pool: Optional[AsyncSQLitePool] = None):
         self.config = config
         self.metrics = metrics
+        self.pool = pool or AsyncSQLitePool(config, metrics)
         self.logger = logging.getLogger(__name__)
         self._initialized = False
+        self._incremental_vacuum_enabled = False
+        
+        # Per-item counters of the save paths
+        self._saved_counters = HandleFamily(metrics.counter, "repository.news_saved", "source")
+        self._near_duplicate_counters = HandleFamily(metrics.counter, "repository.near_duplicate", "source")
+        
+        # Near-duplicate detection over recent news, warm-loaded from the simhash column
+        self.near_duplicates = (
+            SimHashIndex(config.near_duplicate_distance) 
+            if config.near_duplicate_distance >= 0 else None
+        )
     
     async def initialize(self):
         if not self._initialized:
+            await self.pool.open()
             await self._init_database()
             self._initialized = True
     
+    async def close(self):
+        await self.pool.close()
+        self._initialized = False
+    
     async def _init_database(self):
-        # Create directory if it doesn't exist
-        db_dir = os.path.dirname(self.config.path)
-        if db_dir:
-            os.makedirs(db_dir, exist_ok=True)
-        
-        async with aiosqlite.connect(self.config.path) as db:
-            # Create table if not exists
-            await db.execute('''
-                CREATE TABLE IF NOT EXISTS news (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    title TEXT NOT NULL,
-                    content TEXT NOT NULL,
-                    url TEXT,
-                    source TEXT NOT NULL,
-                    city TEXT,
-                    original_hash TEXT UNIQUE NOT NULL,
-                    rephrased_content TEXT,
-                    published_date DATETIME,
-                    created_date DATETIME DEFAULT CURRENT_TIMESTAMP,
-                    status TEXT DEFAULT 'parsed',
-                    telegram_message_id INTEGER
-                )
-            ''')
-            
-            # Check if status column exists and add it if not (migration)
-            cursor = await db.execute("PRAGMA table_info(news)")
-            columns = await cursor.fetchall()
-            column_names = [column[1] for column in columns]
-            
-            if 'status' not in column_names:
-                self.logger.info("Adding status column to existing database")
-                await db.execute('ALTER TABLE news ADD COLUMN status TEXT DEFAULT "parsed"')
-                
-                # Update existing records based on their current state
-                await db.execute('''
-                    UPDATE news SET status = CASE
-                        WHEN sent_to_telegram = 1 THEN 'sent'
-                        WHEN rephrased_content IS NOT NULL THEN 'processed'
-                        ELSE 'parsed'
-                    END
-                ''')
+        async with self.pool.writer() as db:
+            # Incremental auto-vacuum lets cleanup shrink the file; switching modes takes one VACUUM
+            cursor = await db.execute('PRAGMA auto_vacuum')
+            self._incremental_vacuum_enabled = (await cursor.fetchone())[0] == 2
+            if not self._incremental_vacuum_enabled:
+                cursor = await db.execute('SELECT COUNT(*) FROM sqlite_master')
+                if (await cursor.fetchone())[0] == 0:
+                    # Free on a new, empty file
+                    await self._switch_to_incremental_vacuum(db)
+                else:
+                    # Rewriting a large file holds the write lock for the whole VACUUM, never do it implicitly
+                    self.logger.warning(
+                        "Incremental auto-vacuum is off, cleanup will not shrink the database file; "
+                        "run 'python app.py vacuum' once while the bot is stopped"
+                    )
             
-            # Create indexes
-            await db.execute('CREATE INDEX IF NOT EXISTS idx_url ON news(url)')
-            await db.execute('CREATE INDEX IF NOT EXISTS idx_hash ON news(original_hash)')
-            await db.execute('CREATE INDEX IF NOT EXISTS idx_status ON news(status)')
-            await db.execute('CREATE INDEX IF NOT EXISTS idx_source ON news(source)')
-            await db.execute('CREATE INDEX IF NOT EXISTS idx_created_date ON news(created_date)')
+            # Baseline table on a new database, then every migration not applied yet
+            schema_version = await apply_migrations(db)
+            self.metrics.set_gauge("repository.schema_version", schema_version)
             
-            await db.commit()
+            await self._load_near_duplicate_index(db)
             
         self.logger.info("Database initialized successfully")
     
+    async def enable_incremental_vacuum(self) -> bool:
+        await self.initialize()
+        if self._incremental_vacuum_enabled:
+            return False
+        
+        async with self._get_connection(write=True) as db:
+            await self._switch_to_incremental_vacuum(db)
+        return True
+    
+    async def _switch_to_incremental_vacuum(self, db):
+        self.logger.info("Enabling incremental auto-vacuum (one-time VACUUM)")
+        await db.execute('PRAGMA auto_vacuum = INCREMENTAL')
+        await db.execute('VACUUM')
+        self._incremental_vacuum_enabled = True
+    
+    async def _load_near_duplicate_index(self, db):
+        if self.near_duplicates is None:
+            return
+        
+        self.near_duplicates.clear()
+        cursor = await db.execute('''
+            SELECT id, title, content, simhash, CAST(strftime('%s', created_date) AS REAL) AS created_at FROM news 
+            WHERE created_date >= datetime('now', '-' || ? || ' days')
+            ORDER BY created_date
+        ''', (self.config.near_duplicate_window_days,))
+        rows = await cursor.fetchall()
+        
+        # Rows saved before the simhash column existed get their fingerprint now
+        backfill = []
+        for row in rows:
+            if row['simhash'] is None:
+                fingerprint = self._fingerprint(row['title'], row['content'])
+                backfill.append((to_signed(fingerprint), row['id']))
+            else:
+                fingerprint = from_signed(row['simhash'])
+            self.near_duplicates.add(row['id'], fingerprint, row['created_at'])
+        
+        if backfill:
+            await db.executemany('UPDATE news SET simhash = ? WHERE id = ?', backfill)
+            await db.commit()
+        
+        self.metrics.set_gauge("repository.near_duplicate_index_size", len(self.near_duplicates))
+        self.logger.info(f"Near-duplicate index loaded with {len(self.near_duplicates)} fingerprints")
+    
+    @staticmethod
+    def _fingerprint(title: str, content: str) -> int:
+        return simhash(f"{title} {content}")
+    
+    def _find_near_duplicate(self, fingerprint: int) -> Optional[int]:
+        if self.near_duplicates is None:
+            return None
+        
+        # Long-running daemons never reload the index; news leaving the window drop out here
+        evicted = self.near_duplicates.evict_older_than(time.time() - self.config.near_duplicate_window_days * 86400)
+        if evicted:
+            self.metrics.set_gauge("repository.near_duplicate_index_size", len(self.near_duplicates))
+        
+        match = self.near_duplicates.find_near(fingerprint)
+        return match[0] if match else None
+    
+    async def _find_near_duplicate_in_history(self, db, title: str, fingerprint: int) -> Optional[int]:
+        # News older than the in-memory window: full-text candidates by title, then the SimHash check
+        limit = self.config.near_duplicate_fts_candidates
+        if self.near_duplicates is None or limit <= 0:
+            return None
+        
+        query = _fts_query(title, match_any=True, column='title')
+        if query is None:
+            return None
+        
+        cursor = await db.execute('''
+            SELECT n.id, n.simhash FROM news_fts
+            JOIN news n ON n.id = news_fts.rowid
+            WHERE news_fts MATCH ? AND n.simhash IS NOT NULL
+            ORDER BY bm25(news_fts)
+            LIMIT ?
+        ''', (query, limit))
+        for news_id, candidate in await cursor.fetchall():
+            if hamming_distance(fingerprint, from_signed(candidate)) <= self.near_duplicates.max_distance:
+                return news_id
+        return None
+    
     @asynccontextmanager
-    async def _get_connection(self):
+    async def _get_connection(self, write: bool = False):
         await self.initialize()
-        async with aiosqlite.connect(self.config.path) as db:
-            db.row_factory = aiosqlite.Row
+        connection = self.pool.writer() if write else self.pool.reader()
+        async with connection as db:
             yield db
     
     def _generate_content_hash(self, title: str, content: str) -> str:
@@ -91,26 +198,41 @@ class AsyncNewsRepository(INewsRepository):
     @timed_metric(lambda self: self.metrics, "repository.save_news")
     async def save_news(self, news: NewsItem) -> Optional[int]:
         try:
-            if await self.news_exists(news):
-                self.logger.debug(f"News already exists: {news.title[:50]}...")
-                return None
-            
             content_hash = self._generate_content_hash(news.title, news.content)
+            fingerprint = self._fingerprint(news.title, news.content)
             
-            async with self._get_connection() as db:
+            # Check and insert on the writer so both happen under the same lock
+            async with self._get_connection(write=True) as db:
+                if await self._exists(db, content_hash, news.url):
+                    self.logger.debug(f"News already exists: {news.title[:50]}...")
+                    return None
+                
+                duplicate_id = (
+                    self._find_near_duplicate(fingerprint)
+                    or await self._find_near_duplicate_in_history(db, news.title, fingerprint)
+                )
+                if duplicate_id:
+                    self._near_duplicate_counters[news.source].inc()
+                    self.logger.debug(f"News is a near-duplicate of {duplicate_id}: {news.title[:50]}...")
+                    return None
+                
                 cursor = await db.execute('''
                     INSERT INTO news (title, content, url, source, city, 
-                                    original_hash, published_date, status)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                                    original_hash, published_date, status, simhash)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
                 ''', (
                     news.title, news.content, news.url, news.source, 
-                    news.city, content_hash, news.published_date, news.status.value
+                    news.city, content_hash, news.published_date, news.status.value,
+                    to_signed(fingerprint)
                 ))
                 
                 news_id = cursor.lastrowid
                 await db.commit()
                 
-                self.metrics.increment_counter("repository.news_saved", {"source": news.source})
+                if self.near_duplicates is not None:
+                    self.near_duplicates.add(news_id, fingerprint)
+                
+                self._saved_counters[news.source].inc()
                 self.logger.info(f"News saved with ID {news_id}: {news.title[:50]}...")
                 return news_id
                 
@@ -119,25 +241,199 @@ class AsyncNewsRepository(INewsRepository):
             self.logger.error(f"Error saving news: {e}")
             return None
     
+    @timed_metric(lambda self: self.metrics, "repository.save_news_batch")
+    async def save_news_batch(self, items: List[NewsItem]) -> List[Optional[int]]:
+        if not items:
+            return []
+        
+        hashes = [self._generate_content_hash(news.title, news.content) for news in items]
+        fingerprints = [self._fingerprint(news.title, news.content) for news in items]
+        news_ids: List[Optional[int]] = [None] * len(items)
+        near_duplicate_count = 0
+        
+        try:
+            async with self._get_connection(write=True) as db:
+                known_hashes = await self._select_existing(db, 'original_hash', set(hashes))
+                known_urls = await self._select_existing(db, 'url', {news.url for news in items if news.url})
+                
+                # Set-based dedup against the table and within the batch itself
+                batch_index = SimHashIndex(self.near_duplicates.max_distance) if self.near_duplicates else None
+                survivors = []
+                for index, (news, content_hash) in enumerate(zip(items, hashes)):
+                    if content_hash in known_hashes or (news.url and news.url in known_urls):
+                        continue
+                    
+                    if batch_index is not None and (
+                        self._find_near_duplicate(fingerprints[index])
+                        or batch_index.find_near(fingerprints[index])
+                        or await self._find_near_duplicate_in_history(db, news.title, fingerprints[index])
+                    ):
+                        near_duplicate_count += 1
+                        self._near_duplicate_counters[news.source].inc()
+                        continue
+                    
+                    known_hashes.add(content_hash)
+                    if news.url:
+                        known_urls.add(news.url)
+                    if batch_index is not None:
+                        batch_index.add(index, fingerprints[index])
+                    survivors.append(index)
+                
+                if survivors:
+                    await db.executemany('''
+                        INSERT OR IGNORE INTO news (title, content, url, source, city, 
+                                                  original_hash, published_date, status, simhash)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    ''', [
+                        (
+                            items[i].title, items[i].content, items[i].url, items[i].source,
+                            items[i].city, hashes[i], items[i].published_date, items[i].status.value,
+                            to_signed(fingerprints[i])
+                        )
+                        for i in survivors
+                    ])
+                    
+                    ids_by_hash = await self._select_ids_by_hash(db, [hashes[i] for i in survivors])
+                    await db.commit()
+                    
+                    for i in survivors:
+                        news_ids[i] = ids_by_hash.get(hashes[i])
+                        if news_ids[i] and self.near_duplicates is not None:
+                            self.near_duplicates.add(news_ids[i], fingerprints[i])
+            
+            saved_count = 0
+            for news, news_id in zip(items, news_ids):
+                if news_id:
+                    saved_count += 1
+                    self._saved_counters[news.source].inc()
+            
+            self.metrics.increment_counter("repository.batch_saved")
+            self.metrics.set_gauge("repository.batch_duplicates", len(items) - saved_count)
+            self.logger.info(
+                f"Batch saved {saved_count} of {len(items)} news items "
+                f"({near_duplicate_count} near-duplicates dropped)"
+            )
+            return news_ids
+            
+        except Exception as e:
+            self.metrics.increment_counter("repository.save_error", {"source": "batch"})
+            self.logger.error(f"Error saving news batch: {e}")
+            # Callers must know nothing was stored, or they would commit the feed state of lost items
+            raise
+    
+    async def _select_existing(self, db, column: str, values: Set[str]) -> Set[str]:
+        found = set()
+        for chunk in self._chunked(list(values)):
+            placeholders = ','.join('?' * len(chunk))
+            cursor = await db.execute(
+                f'SELECT {column} FROM news WHERE {column} IN ({placeholders})', chunk
+            )
+            found.update(row[0] for row in await cursor.fetchall())
+        return found
+    
+    async def _select_ids_by_hash(self, db, hashes: List[str]) -> Dict[str, int]:
+        ids = {}
+        for chunk in self._chunked(hashes):
+            placeholders = ','.join('?' * len(chunk))
+            cursor = await db.execute(
+                f'SELECT original_hash, id FROM news WHERE original_hash IN ({placeholders})', chunk
+            )
+            ids.update((row[0], row[1]) for row in await cursor.fetchall())
+        return ids
+    
+    @staticmethod
+    def _chunked(values: List[str], size: int = 500) -> List[List[str]]:
+        # Stay well below SQLite's bound-parameter limit
+        return [values[i:i + size] for i in range(0, len(values), size)]
+    
     @timed_metric(lambda self: self.metrics, "repository.get_news_by_status")
     async def get_news_by_status(self, status: NewsStatus, limit: int = 10) -> List[NewsItem]:
         async with self._get_connection() as db:
-            cursor = await db.execute('''
-                SELECT * FROM news 
-                WHERE status = ? 
+            cursor = await db.execute(f'''
+                SELECT {NEWS_COLUMNS} FROM news 
+                WHERE status = {_status_literal(status)} 
                 ORDER BY created_date ASC 
                 LIMIT ?
-            ''', (status.value, limit))
+            ''', (limit,))
             
             rows = await cursor.fetchall()
             return [self._row_to_news_item(row) for row in rows]
     
+    @timed_metric(lambda self: self.metrics, "repository.claim_news")
+    async def claim_news(
+        self, 
+        status: NewsStatus, 
+        limit: int, 
+        worker_id: str, 
+        lease_seconds: float, 
+        news_ids: Optional[List[int]] = None
+    ) -> List[NewsItem]:
+        in_flight = CLAIM_STATES.get(status)
+        if in_flight is None:
+            raise ValueError(f"News with status {status.value} cannot be claimed")
+        
+        now = time.time()
+        id_filter, id_params = "", []
+        if news_ids is not None:
+            if not news_ids:
+                return []
+            id_filter = f"AND id IN ({','.join('?' * len(news_ids))})"
+            id_params = list(news_ids)
+        
+        async with self._get_connection(write=True) as db:
+            # Expired leases of this stage go back to the queue before claiming
+            await self._release_expired(db, now, [in_flight])
+            
+            # A single UPDATE ... RETURNING holds SQLite's write lock, so no two workers get the same row
+            cursor = await db.execute(f'''
+                UPDATE news SET status = ?, claimed_by = ?, lease_expires = ?
+                WHERE id IN (
+                    SELECT id FROM news 
+                    WHERE status = {_status_literal(status)} {id_filter}
+                    ORDER BY created_date ASC 
+                    LIMIT ?
+                )
+                RETURNING {NEWS_COLUMNS}
+            ''', [in_flight.value, worker_id, now + lease_seconds, *id_params, limit])
+            rows = await cursor.fetchall()
+            await db.commit()
+        
+        news_items = sorted((self._row_to_news_item(row) for row in rows), key=lambda news: news.id)
+        if news_items:
+            self.metrics.increment_counter("repository.news_claimed", {"status": status.value})
+            self.logger.debug(f"Worker {worker_id} claimed {len(news_items)} {status.value} news")
+        return news_items
+    
+    @timed_metric(lambda self: self.metrics, "repository.release_expired_leases")
+    async def release_expired_leases(self) -> int:
+        async with self._get_connection(write=True) as db:
+            released = await self._release_expired(db, time.time(), list(CLAIM_STATES.values()))
+            await db.commit()
+        return released
+    
+    async def _release_expired(self, db, now: float, in_flight: List[NewsStatus]) -> int:
+        released = 0
+        for queue_status, claimed_status in CLAIM_STATES.items():
+            if claimed_status not in in_flight:
+                continue
+            
+            cursor = await db.execute('''
+                UPDATE news SET status = ?, claimed_by = NULL, lease_expires = NULL
+                WHERE lease_expires < ? AND status = ?
+            ''', (queue_status.value, now, claimed_status.value))
+            released += cursor.rowcount
+        
+        if released > 0:
+            self.metrics.increment_counter("repository.leases_expired")
+            self.logger.warning(f"Returned {released} news with expired leases to the queue")
+        return released
+    
     @timed_metric(lambda self: self.metrics, "repository.update_news_status")
     async def update_news_status(self, news_id: int, status: NewsStatus, **kwargs) -> bool:
         try:
-            async with self._get_connection() as db:
-                # Build update query dynamically based on kwargs
-                update_fields = ["status = ?"]
+            async with self._get_connection(write=True) as db:
+                # Build update query dynamically based on kwargs; any transition ends the claim
+                update_fields = ["status = ?", "claimed_by = NULL", "lease_expires = NULL"]
                 params = [status.value]
                 
                 if 'rephrased_content' in kwargs:
@@ -152,6 +448,11 @@ class AsyncNewsRepository(INewsRepository):
                 
                 query = f"UPDATE news SET {', '.join(update_fields)} WHERE id = ?"
                 
+                # A worker whose lease was reaped and re-claimed must not overwrite the new owner
+                if 'worker_id' in kwargs:
+                    query += " AND claimed_by = ?"
+                    params.append(kwargs['worker_id'])
+                
                 cursor = await db.execute(query, params)
                 await db.commit()
                 
@@ -160,7 +461,7 @@ class AsyncNewsRepository(INewsRepository):
                     self.logger.debug(f"News {news_id} status updated to {status.value}")
                     return True
                 else:
-                    self.logger.warning(f"News {news_id} not found for status update")
+                    self.logger.warning(f"News {news_id} not found or no longer claimed for status update")
                     return False
                     
         except Exception as e:
@@ -173,66 +474,77 @@ class AsyncNewsRepository(INewsRepository):
         content_hash = self._generate_content_hash(news.title, news.content)
         
         async with self._get_connection() as db:
-            # Check by hash
-            cursor = await db.execute('SELECT id FROM news WHERE original_hash = ?', (content_hash,))
+            if await self._exists(db, content_hash, news.url):
+                return True
+        
+        return self._find_near_duplicate(self._fingerprint(news.title, news.content)) is not None
+    
+    async def _exists(self, db, content_hash: str, url: Optional[str]) -> bool:
+        # Check by hash
+        cursor = await db.execute('SELECT id FROM news WHERE original_hash = ?', (content_hash,))
+        if await cursor.fetchone():
+            return True
+        
+        # Check by URL if available
+        if url:
+            cursor = await db.execute('SELECT id FROM news WHERE url = ?', (url,))
             if await cursor.fetchone():
                 return True
-            
-            # Check by URL if available
-            if news.url:
-                cursor = await db.execute('SELECT id FROM news WHERE url = ?', (news.url,))
-                if await cursor.fetchone():
-                    return True
-            
-            return False
+        
+        return False
+    
+    @timed_metric(lambda self: self.metrics, "repository.search_news")
+    async def search_news(self, query: str, limit: int = 20) -> List[NewsItem]:
+        # Every word must start a word of the title, original or rephrased text; best bm25 rank first
+        fts_query = _fts_query(query)
+        if fts_query is None:
+            return []
+        
+        news_columns = ', '.join(f'n.{column.strip()}' for column in NEWS_COLUMNS.split(','))
+        async with self._get_connection() as db:
+            cursor = await db.execute(f'''
+                SELECT {news_columns} FROM news_fts
+                JOIN news n ON n.id = news_fts.rowid
+                WHERE news_fts MATCH ?
+                ORDER BY bm25(news_fts)
+                LIMIT ?
+            ''', (fts_query, limit))
+            rows = await cursor.fetchall()
+            return [self._row_to_news_item(row) for row in rows]
     
     @timed_metric(lambda self: self.metrics, "repository.get_statistics")
     async def get_statistics(self) -> Dict[str, Any]:
+        # Counters are kept by the news_stats triggers, so this costs O(sources) instead of table scans
         async with self._get_connection() as db:
-            stats = {}
-            
-            # Total news count
-            cursor = await db.execute('SELECT COUNT(*) FROM news')
-            row = await cursor.fetchone()
-            stats['total_news'] = row[0]
-            
-            # Count by status
             cursor = await db.execute('''
-                SELECT status, COUNT(*) as count 
-                FROM news 
-                GROUP BY status
-            ''')
-            rows = await cursor.fetchall()
-            stats['by_status'] = {row[0]: row[1] for row in rows}
-            
-            # Count by source
-            cursor = await db.execute('''
-                SELECT source, COUNT(*) as count 
-                FROM news 
-                GROUP BY source 
+                SELECT dimension, key, count FROM news_stats
+                WHERE count > 0
                 ORDER BY count DESC
             ''')
             rows = await cursor.fetchall()
-            stats['by_source'] = {row[0]: row[1] for row in rows}
             
-            # Count by city
-            cursor = await db.execute('''
-                SELECT city, COUNT(*) as count 
-                FROM news 
-                WHERE city IS NOT NULL 
-                GROUP BY city 
-                ORDER BY count DESC
-            ''')
-            rows = await cursor.fetchall()
-            stats['by_city'] = {row[0]: row[1] for row in rows}
+            counters: Dict[str, Dict[str, int]] = {'total': {}, 'status': {}, 'source': {}, 'city': {}}
+            for dimension, key, count in rows:
+                counters.setdefault(dimension, {})[key] = count
+            
+            stats = {
+                'total_news': counters['total'].get('', 0),
+                'by_status': counters['status'],
+                'by_source': counters['source'],
+                'by_city': counters['city'],
+            }
             
-            # Recent activity (last 24 hours)
+            # Recent activity (last 24 hours): whole hourly buckets plus an exact count of the partial first hour
             cursor = await db.execute('''
-                SELECT COUNT(*) FROM news 
-                WHERE created_date >= datetime('now', '-1 day')
+                SELECT
+                    (SELECT COALESCE(SUM(count), 0) FROM news_hourly
+                     WHERE hour > strftime('%Y-%m-%d %H:00:00', 'now', '-1 day')),
+                    (SELECT COUNT(*) FROM news
+                     WHERE created_date >= datetime('now', '-1 day')
+                     AND created_date < strftime('%Y-%m-%d %H:00:00', 'now', '-1 day', '+1 hour'))
             ''')
             row = await cursor.fetchone()
-            stats['last_24h'] = row[0]
+            stats['last_24h'] = row[0] + row[1]
             
             return stats
     
@@ -241,24 +553,120 @@ class AsyncNewsRepository(INewsRepository):
         try:
             async with self._get_connection() as db:
                 cursor = await db.execute('''
-                    DELETE FROM news 
-                    WHERE created_date < datetime('now', '-' || ? || ' days')
-                    AND status = 'sent'
-                ''', (days,))
-                
-                deleted_count = cursor.rowcount
+                    SELECT datetime('now', '-' || ? || ' days'),
+                           (SELECT MIN(id) FROM news),
+                           (SELECT MAX(id) FROM news WHERE created_date < datetime('now', '-' || ? || ' days'))
+                ''', (days, days))
+                cutoff, first_id, last_id = await cursor.fetchone()
+            
+            deleted_count = 0
+            if last_id is not None:
+                deleted_count = await self._delete_in_chunks(cutoff, first_id, last_id)
+            
+            async with self._get_connection(write=True) as db:
+                # Counters and buckets emptied by the delete trigger
+                await db.execute('DELETE FROM news_stats WHERE count <= 0')
+                await db.execute('DELETE FROM news_hourly WHERE count <= 0')
                 await db.commit()
                 
-                self.metrics.increment_counter("repository.news_cleaned")
-                self.metrics.set_gauge("repository.cleaned_count", deleted_count)
-                self.logger.info(f"Cleaned up {deleted_count} old news items")
-                return deleted_count
-                
+                if deleted_count > 0:
+                    await self._load_near_duplicate_index(db)
+            
+            if deleted_count > 0:
+                await self._incremental_vacuum()
+            
+            self.metrics.increment_counter("repository.news_cleaned")
+            self.metrics.set_gauge("repository.cleaned_count", deleted_count)
+            self.logger.info(f"Cleaned up {deleted_count} old news items")
+            return deleted_count
+        
         except Exception as e:
             self.metrics.increment_counter("repository.cleanup_error")
             self.logger.error(f"Error cleaning up old news: {e}")
             return 0
     
+    async def _delete_in_chunks(self, cutoff: str, first_id: int, last_id: int) -> int:
+        # Short rowid-range transactions keep the write lock free for the pipeline between chunks
+        batch_size = max(1, self.config.cleanup_batch_size)
+        archive_path = self._archive_path()
+        returning = f"RETURNING {NEWS_COLUMNS}" if archive_path else ""
+        loop = asyncio.get_running_loop()
+        deleted = 0
+        
+        for low in range(first_id, last_id + 1, batch_size):
+            high = min(low + batch_size, last_id + 1)
+            async with self._get_connection(write=True) as db:
+                cursor = await db.execute(f'''
+                    DELETE FROM news
+                    WHERE id >= ? AND id < ? AND created_date < ? AND status = 'sent'
+                    {returning}
+                ''', (low, high, cutoff))
+                
+                if archive_path:
+                    rows = await cursor.fetchall()
+                    try:
+                        # Rows are archived before the delete commits, so a failed write loses nothing
+                        await loop.run_in_executor(None, partial(self._write_archive, archive_path, rows))
+                    except Exception:
+                        await db.rollback()
+                        raise
+                    deleted += len(rows)
+                else:
+                    deleted += cursor.rowcount
+                
+                await db.commit()
+            
+            await asyncio.sleep(0)
+        
+        return deleted
+    
+    def _archive_path(self) -> Optional[str]:
+        if not self.config.archive_dir:
+            return None
+        os.makedirs(self.config.archive_dir, exist_ok=True)
+        return os.path.join(self.config.archive_dir, f"news-{datetime.now():%Y%m%d}.jsonl.gz")
+    
+    @staticmethod
+    def _write_archive(path: str, rows):
+        if not rows:
+            return
+        # Appending adds a gzip member; concatenated members read back as one stream
+        with gzip.open(path, 'at', encoding='utf-8') as archive:
+            for row in rows:
+                archive.write(json.dumps(dict(row), ensure_ascii=False) + '\n')
+    
+    async def _incremental_vacuum(self):
+        step = self.config.vacuum_step_pages
+        # incremental_vacuum is a no-op in the other auto_vacuum modes, the freelist would never drain
+        if step <= 0 or not self._incremental_vacuum_enabled:
+            return
+        
+        freed = 0
+        max_steps = None
+        while max_steps is None or max_steps > 0:
+            async with self._get_connection(write=True) as db:
+                cursor = await db.execute('PRAGMA freelist_count')
+                free_pages = (await cursor.fetchone())[0]
+                if free_pages == 0:
+                    break
+                if max_steps is None:
+                    # Bounded by the pages free at the start; concurrent writes may free more, left for next cleanup
+                    max_steps = math.ceil(free_pages / step) + 1
+                max_steps -= 1
+                # sqlite3 steps a plain execute() once, i.e. one page; executescript runs the pragma to completion
+                await db.executescript(f'PRAGMA incremental_vacuum({int(step)})')
+                freed += min(free_pages, step)
+            
+            await asyncio.sleep(0)
+        
+        if freed:
+            async with self._get_connection(write=True) as db:
+                # The main file only shrinks once the WAL is checkpointed
+                cursor = await db.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+                await cursor.fetchall()
+            self.metrics.set_gauge("repository.vacuumed_pages", freed)
+            self.logger.info(f"Returned {freed} free pages to the filesystem")
+    
     def _row_to_news_item(self, row) -> NewsItem:
         return NewsItem(
             id=row['id'],
@@ -0,0 +1,114 @@
+import json
+import logging
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, FrozenSet, Optional, Sequence, Tuple
+
+from core.interfaces import IMetricsCollector
+from infrastructure.sqlite_pool import AsyncSQLitePool
+from infrastructure.migrations import apply_migrations
+
+
+# Entries dated this much earlier than the newest seen one are treated as already ingested
+LATE_ENTRY_GRACE = timedelta(days=1)
+
+
+@dataclass(frozen=True)
+class FeedWatermark:
+    last_published: Optional[Tuple[int, ...]] = None
+    recent_keys: Tuple[str, ...] = ()
+
+    @property
+    def seen(self) -> FrozenSet[str]:
+        return frozenset(self.recent_keys)
+
+    @property
+    def published_cutoff(self) -> Optional[Tuple[int, ...]]:
+        if not self.last_published:
+            return None
+        # Also covers watermarks stored before future dates were clamped
+        last_published = min(self.last_published, tuple(time.gmtime()[:6]))
+        cutoff = datetime(*last_published) - LATE_ENTRY_GRACE
+        return cutoff.timetuple()[:6]
+
+
+class SQLiteFeedWatermarkStore:
+    """Per-source high-water mark of feed entries: newest publication date plus recent GUIDs/links."""
+
+    def __init__(self, pool: AsyncSQLitePool, metrics: IMetricsCollector, max_keys: int = 300):
+        self.pool = pool
+        self.metrics = metrics
+        self.max_keys = max_keys
+        self.logger = logging.getLogger(__name__)
+        self._cache: Dict[str, FeedWatermark] = {}
+        self._initialized = False
+
+    async def initialize(self):
+        if self._initialized:
+            return
+
+        # The table is part of the versioned schema; a no-op once the repository has migrated
+        async with self.pool.writer() as db:
+            await apply_migrations(db)
+
+        self._initialized = True
+
+    async def get(self, source: str) -> FeedWatermark:
+        watermark = self._cache.get(source)
+        if watermark is not None:
+            return watermark
+
+        await self.initialize()
+        async with self.pool.reader() as db:
+            cursor = await db.execute(
+                'SELECT last_published, recent_keys FROM feed_watermarks WHERE source = ?', (source,)
+            )
+            row = await cursor.fetchone()
+
+        watermark = FeedWatermark()
+        if row:
+            last_published = tuple(json.loads(row[0])) if row[0] else None
+            watermark = FeedWatermark(last_published, tuple(json.loads(row[1])))
+
+        self._cache[source] = watermark
+        return watermark
+
+    async def advance(
+        self,
+        source: str,
+        keys: Sequence[str],
+        latest_published: Optional[Tuple[int, ...]]
+    ) -> FeedWatermark:
+        current = await self.get(source)
+
+        # Newest keys first; the oldest fall off once max_keys is reached
+        fresh = list(dict.fromkeys(key for key in keys if key))
+        fresh_set = set(fresh)
+        recent_keys = tuple(fresh + [key for key in current.recent_keys if key not in fresh_set])[:self.max_keys]
+
+        last_published = current.last_published
+        if latest_published:
+            latest_published = min(tuple(latest_published), tuple(time.gmtime()[:6]))
+            if last_published is None or latest_published > last_published:
+                last_published = latest_published
+
+        watermark = FeedWatermark(last_published, recent_keys)
+        if watermark == current:
+            return current
+
+        async with self.pool.writer() as db:
+            await db.execute('''
+                INSERT OR REPLACE INTO feed_watermarks (source, last_published, recent_keys, updated_at)
+                VALUES (?, ?, ?, ?)
+            ''', (
+                source,
+                json.dumps(list(last_published)) if last_published else None,
+                json.dumps(list(recent_keys), ensure_ascii=False),
+                time.time()
+            ))
+            await db.commit()
+
+        self._cache[source] = watermark
+        self.metrics.set_gauge("feed_watermark.keys", len(recent_keys), {"source": source})
+        return watermark
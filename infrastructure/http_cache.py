@@ -0,0 +1,79 @@
+import json
+import logging
+import os
+from dataclasses import dataclass, asdict
+from typing import Dict, Optional
+
+
+@dataclass(frozen=True)
+class HttpValidators:
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+
+class HttpValidatorCache:
+    """Persistent ETag/Last-Modified store keyed by fetched URL."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.logger = logging.getLogger(__name__)
+        self._validators: Dict[str, HttpValidators] = {}
+        self._load()
+
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        validators = self._validators.get(url)
+        if not validators:
+            return {}
+
+        headers = {}
+        if validators.etag:
+            headers['If-None-Match'] = validators.etag
+        if validators.last_modified:
+            headers['If-Modified-Since'] = validators.last_modified
+        return headers
+
+    def store(self, url: str, etag: Optional[str], last_modified: Optional[str]):
+        if not etag and not last_modified:
+            # Server doesn't support conditional requests, forget stale validators
+            if self._validators.pop(url, None):
+                self._save()
+            return
+
+        validators = HttpValidators(etag=etag, last_modified=last_modified)
+        if self._validators.get(url) == validators:
+            return
+
+        self._validators[url] = validators
+        self._save()
+
+    def invalidate(self, url: str):
+        if self._validators.pop(url, None):
+            self._save()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self._validators = {
+                url: HttpValidators(**values) for url, values in data.items()
+            }
+            self.logger.debug(f"Loaded HTTP validators for {len(self._validators)} URLs")
+        except Exception as e:
+            self.logger.warning(f"Failed to load HTTP validator cache {self.path}: {e}")
+            self._validators = {}
+
+    def _save(self):
+        cache_dir = os.path.dirname(self.path)
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+        tmp_path = f"{self.path}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({url: asdict(v) for url, v in self._validators.items()}, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            self.logger.warning(f"Failed to save HTTP validator cache {self.path}: {e}")
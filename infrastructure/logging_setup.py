@@ -1,8 +1,11 @@
+import atexit
+import itertools
 import logging
 import logging.handlers
 import os
+import queue
 import sys
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from infrastructure.config_manager import LoggingConfig
 
 
@@ -25,7 +28,65 @@ class StructuredFormatter(logging.Formatter):
         return formatted
 
 
+class SamplingFilter(logging.Filter):
+    """Keeps every n-th DEBUG/INFO record of the configured loggers; WARNING and above always pass."""
+    
+    def __init__(self, rates: Dict[str, float]):
+        super().__init__()
+        self.rates = rates
+        # Logger name -> (keep every n-th, running counter), resolved once per logger
+        self._samplers: Dict[str, Optional[tuple]] = {}
+    
+    def _sampler(self, name: str) -> Optional[tuple]:
+        sampler = self._samplers.get(name, False)
+        if sampler is False:
+            # The longest configured prefix wins, so "services" and "services.parsing" can differ
+            prefix = max(
+                (p for p in self.rates if name == p or name.startswith(p + '.')),
+                key=len, default=None
+            )
+            rate = self.rates[prefix] if prefix is not None else 1.0
+            if rate >= 1.0:
+                sampler = None
+            else:
+                sampler = (round(1 / rate) if rate > 0 else 0, itertools.count())
+            self._samplers[name] = sampler
+        return sampler
+    
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        
+        sampler = self._sampler(record.name)
+        if sampler is None:
+            return True
+        
+        every, counter = sampler
+        return every > 0 and next(counter) % every == 0
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """Never blocks the caller: a record that does not fit into the bounded queue is dropped and counted."""
+    
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+        self.dropped_counter = None
+    
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+            if self.dropped_counter is not None:
+                self.dropped_counter.inc()
+
+
 class LoggingSetup:
+    _listener: Optional[logging.handlers.QueueListener] = None
+    _queue_handler: Optional[DroppingQueueHandler] = None
+    _atexit_registered = False
+    
     @staticmethod
     def setup_logging(config: LoggingConfig) -> None:
         # Create logs directory if it doesn't exist
@@ -38,6 +99,9 @@ class LoggingSetup:
         root_logger.setLevel(getattr(logging, config.level.upper()))
         
         # Clear existing handlers
+        LoggingSetup.shutdown_logging()
+        for handler in root_logger.handlers:
+            handler.close()
         root_logger.handlers.clear()
         
         # Create formatter
@@ -47,7 +111,6 @@ class LoggingSetup:
         console_handler = logging.StreamHandler(sys.stdout)
         console_handler.setLevel(getattr(logging, config.level.upper()))
         console_handler.setFormatter(formatter)
-        root_logger.addHandler(console_handler)
         
         # File handler with rotation
         file_handler = logging.handlers.RotatingFileHandler(
@@ -58,7 +121,27 @@ class LoggingSetup:
         )
         file_handler.setLevel(getattr(logging, config.level.upper()))
         file_handler.setFormatter(formatter)
-        root_logger.addHandler(file_handler)
+        
+        handlers = [console_handler, file_handler]
+        if config.queue:
+            # Console and file I/O, including rotation, happen on the listener thread,
+            # the logging call on the event loop only formats the message and enqueues it
+            queue_handler = DroppingQueueHandler(queue.Queue(maxsize=max(1, config.queue_size)))
+            listener = logging.handlers.QueueListener(queue_handler.queue, *handlers, respect_handler_level=True)
+            listener.start()
+            if not LoggingSetup._atexit_registered:
+                atexit.register(LoggingSetup.shutdown_logging)
+                LoggingSetup._atexit_registered = True
+            
+            LoggingSetup._listener = listener
+            LoggingSetup._queue_handler = queue_handler
+            handlers = [queue_handler]
+        
+        for handler in handlers:
+            if config.sampling:
+                # Runs before enqueueing, so sampled-out records take no queue space
+                handler.addFilter(SamplingFilter(config.sampling))
+            root_logger.addHandler(handler)
         
         # Reduce noise from third-party libraries
         logging.getLogger('urllib3').setLevel(logging.WARNING)
@@ -68,6 +151,36 @@ class LoggingSetup:
         
         logging.info("Logging system initialized", extra={'component': 'logging'})
     
+    @staticmethod
+    def bind_metrics(metrics) -> None:
+        # The collector is created after logging, so drops are counted from then on
+        if LoggingSetup._queue_handler is not None:
+            counter = metrics.counter("logging.dropped")
+            counter.inc(LoggingSetup._queue_handler.dropped)
+            LoggingSetup._queue_handler.dropped_counter = counter
+    
+    @staticmethod
+    def shutdown_logging() -> None:
+        # Flushes the queued records; safe to call more than once
+        listener, LoggingSetup._listener = LoggingSetup._listener, None
+        queue_handler, LoggingSetup._queue_handler = LoggingSetup._queue_handler, None
+        if listener is None:
+            return
+        
+        listener.stop()
+        
+        # Records logged after shutdown (asyncio teardown, atexit) go straight to the handlers,
+        # nothing drains the queue any more
+        root_logger = logging.getLogger()
+        if queue_handler is not None:
+            root_logger.removeHandler(queue_handler)
+            for handler in listener.handlers:
+                # Sampling counters are per handler, so each gets its own filter
+                handler.filters = [
+                    SamplingFilter(f.rates) if isinstance(f, SamplingFilter) else f for f in queue_handler.filters
+                ]
+                root_logger.addHandler(handler)
+    
     @staticmethod
     def get_logger(name: str) -> logging.Logger:
         return logging.getLogger(name)
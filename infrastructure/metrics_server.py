@@ -0,0 +1,184 @@
+"""
+Embedded HTTP endpoint exposing metrics and health for scraping.
+
+    GET /metrics  - OpenMetrics text: counters, gauges, duration summaries
+    GET /healthz  - HealthCheckerService result as JSON, 200 when healthy, 503 otherwise
+
+Rendering walks the metric keys once; duration histograms are fixed-size, so
+a scrape costs the same however many samples were recorded.
+"""
+
+import asyncio
+import json
+import logging
+import re
+import time
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+from aiohttp import web
+
+from core.interfaces import IHealthChecker, INewsRepository, NewsStatus
+from core.metrics import InMemoryMetricsCollector
+from infrastructure.config_manager import MetricsConfig
+
+
+OPENMETRICS_CONTENT_TYPE = 'application/openmetrics-text; version=1.0.0; charset=utf-8'
+METRIC_PREFIX = 'news_bot'
+SUMMARY_QUANTILES = (0.5, 0.9, 0.99)
+
+
+@lru_cache(maxsize=4096)
+def parse_metric_key(key: str) -> Tuple[str, Tuple[Tuple[str, str], ...]]:
+    # Inverse of InMemoryMetricsCollector._build_key: "name[k=v,k2=v2]"
+    if not key.endswith(']') or '[' not in key:
+        return key, ()
+
+    name, tag_part = key[:-1].split('[', 1)
+    tags = tuple(tuple(tag.split('=', 1)) for tag in tag_part.split(',') if '=' in tag)
+    return name, tags
+
+
+@lru_cache(maxsize=4096)
+def metric_name(name: str, suffix: str = '') -> str:
+    sanitized = re.sub(r'[^a-zA-Z0-9_]', '_', name).strip('_')
+    return f"{METRIC_PREFIX}_{sanitized}{suffix}"
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', r'\\').replace('"', r'\"').replace('\n', r'\n')
+
+
+def _labels(tags: Tuple[Tuple[str, str], ...], extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(tags) + ([extra] if extra else [])
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{re.sub(r"[^a-zA-Z0-9_]", "_", k)}="{_escape(v)}"' for k, v in pairs) + '}'
+
+
+def _number(value: float) -> str:
+    return repr(float(value)) if value == value else 'NaN'
+
+
+def render_openmetrics(metrics: InMemoryMetricsCollector) -> str:
+    families: Dict[str, Tuple[str, List[str]]] = {}
+
+    def family(name: str, metric_type: str) -> Tuple[str, List[str]]:
+        # A family name is unique across types; a clash gets the type appended,
+        # and samples must be named after the final family name
+        if name in families and families[name][0] != metric_type:
+            name = f"{name}_{metric_type}"
+        return name, families.setdefault(name, (metric_type, []))[1]
+
+    for key, value in list(metrics.counters.items()):
+        name, tags = parse_metric_key(key)
+        base, samples = family(metric_name(name), 'counter')
+        samples.append(f"{base}_total{_labels(tags)} {value}")
+
+    for key, value in list(metrics.gauges.items()):
+        name, tags = parse_metric_key(key)
+        base, samples = family(metric_name(name), 'gauge')
+        samples.append(f"{base}{_labels(tags)} {_number(value)}")
+
+    for key, histogram in list(metrics.durations.items()):
+        name, tags = parse_metric_key(key)
+        lifetime = histogram.lifetime
+        if not lifetime.count:
+            continue
+
+        base, samples = family(metric_name(name, '_seconds'), 'summary')
+        for q in SUMMARY_QUANTILES:
+            samples.append(f"{base}{_labels(tags, ('quantile', str(q)))} {_number(lifetime.quantile(q))}")
+        samples.append(f"{base}_sum{_labels(tags)} {_number(lifetime.total)}")
+        samples.append(f"{base}_count{_labels(tags)} {lifetime.count}")
+
+    lines = []
+    for name, (metric_type, samples) in families.items():
+        lines.append(f"# TYPE {name} {metric_type}")
+        if metric_type == 'summary' and name.endswith('_seconds'):
+            # The unit must be the family name's suffix, a renamed family has none
+            lines.append(f"# UNIT {name} seconds")
+        lines.extend(samples)
+    lines.append('# EOF')
+    return '\n'.join(lines) + '\n'
+
+
+class MetricsHttpServer:
+    def __init__(
+        self,
+        config: MetricsConfig,
+        metrics: InMemoryMetricsCollector,
+        health_checker: IHealthChecker,
+        repository: Optional[INewsRepository] = None
+    ):
+        self.config = config
+        self.metrics = metrics
+        self.health_checker = health_checker
+        self.repository = repository
+        self.logger = logging.getLogger(__name__)
+
+        self._runner: Optional[web.AppRunner] = None
+        self._health: Optional[Dict[str, bool]] = None
+        self._health_checked = 0.0
+        self._health_lock = asyncio.Lock()
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.stop()
+
+    async def start(self):
+        if self._runner is not None:
+            return
+
+        app = web.Application()
+        app.router.add_get('/metrics', self._handle_metrics)
+        app.router.add_get('/healthz', self._handle_health)
+
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.config.http_host, self.config.http_port)
+        await site.start()
+        self.logger.info(f"Serving metrics on http://{self.config.http_host}:{self.config.http_port}/metrics")
+
+    async def stop(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def _handle_metrics(self, request: web.Request) -> web.Response:
+        if self.repository is not None:
+            await self._refresh_queue_gauges()
+
+        body = render_openmetrics(self.metrics)
+        return web.Response(body=body.encode('utf-8'), headers={'Content-Type': OPENMETRICS_CONTENT_TYPE})
+
+    async def _refresh_queue_gauges(self):
+        # Statistics come from trigger-maintained counters, so this is cheap on every scrape
+        try:
+            stats = await self.repository.get_statistics()
+        except Exception as e:
+            self.logger.warning(f"Failed to refresh queue gauges: {e}")
+            return
+
+        by_status = stats.get('by_status', {})
+        for status in NewsStatus:
+            # Emptied statuses drop out of the statistics but must read 0, not their last value
+            self.metrics.set_gauge("repository.news", by_status.get(status.value, 0), {"status": status.value})
+        self.metrics.set_gauge("repository.news_last_24h", stats.get('last_24h', 0))
+
+    async def _handle_health(self, request: web.Request) -> web.Response:
+        # Health checks call GigaChat and Telegram; probes share one result per cache period
+        async with self._health_lock:
+            if self._health is None or time.monotonic() - self._health_checked >= self.config.health_cache_seconds:
+                self._health = await self.health_checker.check_health()
+                self._health_checked = time.monotonic()
+
+        healthy = self._health.get('overall', False)
+        return web.Response(
+            text=json.dumps(self._health),
+            status=200 if healthy else 503,
+            content_type='application/json'
+        )
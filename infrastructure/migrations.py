@@ -0,0 +1,294 @@
+import logging
+from dataclasses import dataclass
+from typing import Sequence, Set, Tuple
+
+
+@dataclass(frozen=True)
+class Migration:
+    version: int
+    description: str
+    statements: Tuple[str, ...] = ()
+    # (table, column, declaration); added before the statements run, skipped where the column exists
+    # already, since databases from before versioning may have gained it unversioned
+    columns: Tuple[Tuple[str, str, str], ...] = ()
+
+
+# Version 0: the news table as the bot first shipped it
+BASELINE_TABLE = '''
+    CREATE TABLE IF NOT EXISTS news (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        title TEXT NOT NULL,
+        content TEXT NOT NULL,
+        url TEXT,
+        source TEXT NOT NULL,
+        city TEXT,
+        original_hash TEXT UNIQUE NOT NULL,
+        rephrased_content TEXT,
+        published_date DATETIME,
+        created_date DATETIME DEFAULT CURRENT_TIMESTAMP,
+        status TEXT DEFAULT 'parsed',
+        telegram_message_id INTEGER
+    )
+'''
+
+BASELINE_INDEXES: Tuple[str, ...] = (
+    'CREATE INDEX IF NOT EXISTS idx_url ON news(url)',
+    'CREATE INDEX IF NOT EXISTS idx_hash ON news(original_hash)',
+    'CREATE INDEX IF NOT EXISTS idx_status ON news(status)',
+    'CREATE INDEX IF NOT EXISTS idx_source ON news(source)',
+    'CREATE INDEX IF NOT EXISTS idx_created_date ON news(created_date)',
+)
+
+
+# Append only: a released migration is never edited, a new version is added instead.
+NEWS_MIGRATIONS: Tuple[Migration, ...] = (
+    Migration(
+        version=1,
+        description="partial (status, created_date) index for the pending status queue",
+        statements=(
+            # Only queued rows are indexed, so sent and failed history does not bloat it.
+            # SQLite matches "status = 'parsed'" against an OR of equalities, not against IN (...)
+            '''
+            CREATE INDEX IF NOT EXISTS idx_news_queue ON news(status, created_date)
+            WHERE status = 'parsed' OR status = 'processed'
+            ''',
+        )
+    ),
+    Migration(
+        version=2,
+        description="trigger-maintained news counters and hourly rollups for statistics",
+        statements=(
+            # dimension is 'total' (key ''), 'status', 'source' or 'city'
+            '''
+            CREATE TABLE IF NOT EXISTS news_stats (
+                dimension TEXT NOT NULL,
+                key TEXT NOT NULL,
+                count INTEGER NOT NULL,
+                PRIMARY KEY (dimension, key)
+            ) WITHOUT ROWID
+            ''',
+            '''
+            CREATE TABLE IF NOT EXISTS news_hourly (
+                hour TEXT PRIMARY KEY,
+                count INTEGER NOT NULL
+            ) WITHOUT ROWID
+            ''',
+            '''
+            INSERT INTO news_stats (dimension, key, count)
+            SELECT 'total', '', COUNT(*) FROM news
+            UNION ALL
+            SELECT 'status', status, COUNT(*) FROM news WHERE status IS NOT NULL GROUP BY status
+            UNION ALL
+            SELECT 'source', source, COUNT(*) FROM news GROUP BY source
+            UNION ALL
+            SELECT 'city', city, COUNT(*) FROM news WHERE city IS NOT NULL GROUP BY city
+            ''',
+            '''
+            INSERT INTO news_hourly (hour, count)
+            SELECT strftime('%Y-%m-%d %H:00:00', created_date) AS hour, COUNT(*) FROM news
+            WHERE hour IS NOT NULL
+            GROUP BY hour
+            ''',
+            '''
+            CREATE TRIGGER IF NOT EXISTS news_stats_insert AFTER INSERT ON news
+            BEGIN
+                INSERT INTO news_stats (dimension, key, count) VALUES ('total', '', 1)
+                ON CONFLICT (dimension, key) DO UPDATE SET count = count + 1;
+                INSERT INTO news_stats (dimension, key, count) SELECT 'status', NEW.status, 1
+                WHERE NEW.status IS NOT NULL
+                ON CONFLICT (dimension, key) DO UPDATE SET count = count + 1;
+                INSERT INTO news_stats (dimension, key, count) VALUES ('source', NEW.source, 1)
+                ON CONFLICT (dimension, key) DO UPDATE SET count = count + 1;
+                INSERT INTO news_stats (dimension, key, count) SELECT 'city', NEW.city, 1
+                WHERE NEW.city IS NOT NULL
+                ON CONFLICT (dimension, key) DO UPDATE SET count = count + 1;
+                INSERT INTO news_hourly (hour, count) SELECT strftime('%Y-%m-%d %H:00:00', NEW.created_date), 1
+                WHERE NEW.created_date IS NOT NULL
+                ON CONFLICT (hour) DO UPDATE SET count = count + 1;
+            END
+            ''',
+            '''
+            CREATE TRIGGER IF NOT EXISTS news_stats_delete AFTER DELETE ON news
+            BEGIN
+                UPDATE news_stats SET count = count - 1 WHERE dimension = 'total' AND key = '';
+                UPDATE news_stats SET count = count - 1 WHERE dimension = 'status' AND key = OLD.status;
+                UPDATE news_stats SET count = count - 1 WHERE dimension = 'source' AND key = OLD.source;
+                UPDATE news_stats SET count = count - 1 WHERE dimension = 'city' AND key = OLD.city;
+                UPDATE news_hourly SET count = count - 1
+                WHERE hour = strftime('%Y-%m-%d %H:00:00', OLD.created_date);
+            END
+            ''',
+            # Status changes on every pipeline step; the other dimensions are only touched when they change
+            '''
+            CREATE TRIGGER IF NOT EXISTS news_stats_update_status AFTER UPDATE OF status ON news
+            WHEN OLD.status IS NOT NEW.status
+            BEGIN
+                UPDATE news_stats SET count = count - 1 WHERE dimension = 'status' AND key = OLD.status;
+                INSERT INTO news_stats (dimension, key, count) SELECT 'status', NEW.status, 1
+                WHERE NEW.status IS NOT NULL
+                ON CONFLICT (dimension, key) DO UPDATE SET count = count + 1;
+            END
+            ''',
+            '''
+            CREATE TRIGGER IF NOT EXISTS news_stats_update_origin AFTER UPDATE OF source, city ON news
+            WHEN OLD.source IS NOT NEW.source OR OLD.city IS NOT NEW.city
+            BEGIN
+                UPDATE news_stats SET count = count - 1 WHERE dimension = 'source' AND key = OLD.source;
+                INSERT INTO news_stats (dimension, key, count) VALUES ('source', NEW.source, 1)
+                ON CONFLICT (dimension, key) DO UPDATE SET count = count + 1;
+                UPDATE news_stats SET count = count - 1 WHERE dimension = 'city' AND key = OLD.city;
+                INSERT INTO news_stats (dimension, key, count) SELECT 'city', NEW.city, 1
+                WHERE NEW.city IS NOT NULL
+                ON CONFLICT (dimension, key) DO UPDATE SET count = count + 1;
+            END
+            ''',
+        )
+    ),
+    Migration(
+        version=3,
+        description="FTS5 full-text index over news titles and texts",
+        statements=(
+            # External-content table: the text lives in news only, the index holds just the postings
+            '''
+            CREATE VIRTUAL TABLE IF NOT EXISTS news_fts USING fts5(
+                title, content, rephrased_content,
+                content='news', content_rowid='id',
+                tokenize='unicode61 remove_diacritics 2'
+            )
+            ''',
+            "INSERT INTO news_fts (news_fts) VALUES ('rebuild')",
+            '''
+            CREATE TRIGGER IF NOT EXISTS news_fts_insert AFTER INSERT ON news
+            BEGIN
+                INSERT INTO news_fts (rowid, title, content, rephrased_content)
+                VALUES (NEW.id, NEW.title, NEW.content, NEW.rephrased_content);
+            END
+            ''',
+            '''
+            CREATE TRIGGER IF NOT EXISTS news_fts_delete AFTER DELETE ON news
+            BEGIN
+                INSERT INTO news_fts (news_fts, rowid, title, content, rephrased_content)
+                VALUES ('delete', OLD.id, OLD.title, OLD.content, OLD.rephrased_content);
+            END
+            ''',
+            '''
+            CREATE TRIGGER IF NOT EXISTS news_fts_update AFTER UPDATE OF title, content, rephrased_content ON news
+            BEGIN
+                INSERT INTO news_fts (news_fts, rowid, title, content, rephrased_content)
+                VALUES ('delete', OLD.id, OLD.title, OLD.content, OLD.rephrased_content);
+                INSERT INTO news_fts (rowid, title, content, rephrased_content)
+                VALUES (NEW.id, NEW.title, NEW.content, NEW.rephrased_content);
+            END
+            ''',
+        )
+    ),
+    Migration(
+        version=4,
+        description="simhash fingerprint column for near-duplicate detection",
+        # Rows without a fingerprint get one when the near-duplicate index is loaded
+        columns=(('news', 'simhash', 'INTEGER'),)
+    ),
+    Migration(
+        version=5,
+        description="claim and lease columns for workers sharing one database",
+        columns=(
+            ('news', 'claimed_by', 'TEXT'),
+            ('news', 'lease_expires', 'REAL'),
+        ),
+        statements=(
+            'CREATE INDEX IF NOT EXISTS idx_lease_expires ON news(lease_expires) WHERE lease_expires IS NOT NULL',
+        )
+    ),
+    Migration(
+        version=6,
+        description="rephrase cache table",
+        statements=(
+            '''
+            CREATE TABLE IF NOT EXISTS rephrase_cache (
+                key TEXT PRIMARY KEY,
+                content TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_used REAL NOT NULL
+            )
+            ''',
+            'CREATE INDEX IF NOT EXISTS idx_rephrase_cache_last_used ON rephrase_cache(last_used)',
+        )
+    ),
+    Migration(
+        version=7,
+        description="feed watermark table",
+        statements=(
+            '''
+            CREATE TABLE IF NOT EXISTS feed_watermarks (
+                source TEXT PRIMARY KEY,
+                last_published TEXT,
+                recent_keys TEXT NOT NULL,
+                updated_at REAL NOT NULL
+            )
+            ''',
+        )
+    ),
+)
+
+
+async def get_schema_version(db) -> int:
+    cursor = await db.execute('PRAGMA user_version')
+    row = await cursor.fetchone()
+    return row[0]
+
+
+async def _create_baseline(db, logger: logging.Logger):
+    await db.execute(BASELINE_TABLE)
+
+    # Databases older than the status queue tracked sending in a flag
+    if 'status' not in await _column_names(db, 'news'):
+        logger.info("Adding status column to existing database")
+        await db.execute("ALTER TABLE news ADD COLUMN status TEXT DEFAULT 'parsed'")
+        await db.execute('''
+            UPDATE news SET status = CASE
+                WHEN sent_to_telegram = 1 THEN 'sent'
+                WHEN rephrased_content IS NOT NULL THEN 'processed'
+                ELSE 'parsed'
+            END
+        ''')
+
+    for statement in BASELINE_INDEXES:
+        await db.execute(statement)
+    await db.commit()
+
+
+async def _column_names(db, table: str) -> Set[str]:
+    cursor = await db.execute(f'PRAGMA table_info({table})')
+    return {row[1] for row in await cursor.fetchall()}
+
+
+async def apply_migrations(db, migrations: Sequence[Migration] = NEWS_MIGRATIONS) -> int:
+    logger = logging.getLogger(__name__)
+    current = await get_schema_version(db)
+
+    if current == 0:
+        await _create_baseline(db, logger)
+
+    for migration in sorted(migrations, key=lambda m: m.version):
+        if migration.version <= current:
+            continue
+
+        # Each migration and its version bump commit together or not at all
+        await db.execute('BEGIN')
+        try:
+            for table, column, declaration in migration.columns:
+                if column not in await _column_names(db, table):
+                    await db.execute(f'ALTER TABLE {table} ADD COLUMN {column} {declaration}')
+            for statement in migration.statements:
+                await db.execute(statement)
+            await db.execute(f'PRAGMA user_version = {int(migration.version)}')
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            logger.error(f"Schema migration {migration.version} failed: {migration.description}")
+            raise
+
+        current = migration.version
+        logger.info(f"Applied schema migration {migration.version}: {migration.description}")
+
+    return current
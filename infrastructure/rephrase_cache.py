@@ -0,0 +1,105 @@
+import hashlib
+import logging
+import re
+import time
+from typing import Optional
+
+from core.interfaces import IMetricsCollector
+from infrastructure.sqlite_pool import AsyncSQLitePool
+from infrastructure.migrations import apply_migrations
+
+
+_NON_WORD = re.compile(r'[^\w\s]+')
+_WHITESPACE = re.compile(r'\s+')
+
+
+def normalized_content_hash(title: str, content: str, city: Optional[str] = None, prompt_version: str = '') -> str:
+    # Case, punctuation and spacing differences between reprints map to the same key.
+    # City and prompt version are part of the prompt, so they are part of the key too
+    text = f"{title} {content}".lower()
+    text = _NON_WORD.sub(' ', text)
+    text = _WHITESPACE.sub(' ', text).strip()
+    key = '\0'.join((prompt_version, (city or '').strip().lower(), text))
+    return hashlib.sha256(key.encode('utf-8')).hexdigest()
+
+
+class SQLiteRephraseCache:
+    """Content-addressed store of rephrased texts with TTL and LRU size eviction."""
+
+    def __init__(
+        self,
+        pool: AsyncSQLitePool,
+        metrics: IMetricsCollector,
+        ttl_seconds: float = 3 * 24 * 3600,
+        max_entries: int = 5000
+    ):
+        self.pool = pool
+        self.metrics = metrics
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.logger = logging.getLogger(__name__)
+        self._initialized = False
+
+    async def initialize(self):
+        if self._initialized:
+            return
+
+        # The table is part of the versioned schema; a no-op once the repository has migrated
+        async with self.pool.writer() as db:
+            await apply_migrations(db)
+
+        self._initialized = True
+
+    async def get(self, key: str) -> Optional[str]:
+        await self.initialize()
+        now = time.time()
+
+        async with self.pool.reader() as db:
+            cursor = await db.execute(
+                'SELECT content FROM rephrase_cache WHERE key = ? AND created_at >= ?',
+                (key, now - self.ttl_seconds)
+            )
+            row = await cursor.fetchone()
+
+        if not row:
+            self.metrics.increment_counter("rephrase_cache.miss")
+            return None
+
+        async with self.pool.writer() as db:
+            await db.execute('UPDATE rephrase_cache SET last_used = ? WHERE key = ?', (now, key))
+            await db.commit()
+
+        self.metrics.increment_counter("rephrase_cache.hit")
+        return row[0]
+
+    async def put(self, key: str, content: str):
+        await self.initialize()
+        now = time.time()
+
+        async with self.pool.writer() as db:
+            await db.execute('''
+                INSERT OR REPLACE INTO rephrase_cache (key, content, created_at, last_used)
+                VALUES (?, ?, ?, ?)
+            ''', (key, content, now, now))
+
+            # Drop expired entries, then the least recently used ones above the size limit
+            cursor = await db.execute(
+                'DELETE FROM rephrase_cache WHERE created_at < ?', (now - self.ttl_seconds,)
+            )
+            evicted = cursor.rowcount
+
+            cursor = await db.execute('''
+                DELETE FROM rephrase_cache WHERE key IN (
+                    SELECT key FROM rephrase_cache
+                    ORDER BY last_used DESC
+                    LIMIT -1 OFFSET ?
+                )
+            ''', (self.max_entries,))
+            evicted += cursor.rowcount
+
+            await db.commit()
+
+        self.metrics.increment_counter("rephrase_cache.store")
+        if evicted > 0:
+            self.metrics.increment_counter("rephrase_cache.evicted")
+            self.logger.debug(f"Evicted {evicted} rephrase cache entries")
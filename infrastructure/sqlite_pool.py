@@ -0,0 +1,138 @@
+import aiosqlite
+import asyncio
+import logging
+import os
+import time
+from contextlib import asynccontextmanager
+from typing import List, Optional
+
+from core.interfaces import IMetricsCollector
+from infrastructure.config_manager import DatabaseConfig
+
+
+class AsyncSQLitePool:
+    """Long-lived aiosqlite connections: one serialized writer plus a set of readers."""
+
+    def __init__(self, config: DatabaseConfig, metrics: IMetricsCollector):
+        self.config = config
+        self.metrics = metrics
+        self.logger = logging.getLogger(__name__)
+
+        # One connection is always the writer, the rest serve reads (WAL allows them concurrently)
+        self.reader_count = max(1, config.connection_pool_size - 1)
+        self.size = self.reader_count + 1
+
+        self._writer: Optional[aiosqlite.Connection] = None
+        self._writer_lock = asyncio.Lock()
+        self._readers: List[aiosqlite.Connection] = []
+        self._idle_readers: asyncio.Queue = asyncio.Queue()
+        self._open_lock = asyncio.Lock()
+        self._in_use = 0
+        self._opened = False
+
+        # Touched on every acquire/release
+        self._wait_metrics = {role: metrics.histogram("db_pool.wait", {"role": role}) for role in ("writer", "reader")}
+        self._in_use_gauge = metrics.gauge("db_pool.in_use")
+        self._utilization_gauge = metrics.gauge("db_pool.utilization")
+
+    @property
+    def is_open(self) -> bool:
+        return self._opened
+
+    async def open(self):
+        async with self._open_lock:
+            if self._opened:
+                return
+
+            db_dir = os.path.dirname(self.config.path)
+            if db_dir:
+                os.makedirs(db_dir, exist_ok=True)
+
+            self._writer = await self._connect()
+            # journal_mode is persistent, so setting it once on the writer is enough
+            await self._pragma(self._writer, 'journal_mode=WAL')
+
+            for _ in range(self.reader_count):
+                reader = await self._connect()
+                self._readers.append(reader)
+                self._idle_readers.put_nowait(reader)
+
+            self._opened = True
+            self.metrics.set_gauge("db_pool.size", self.size)
+            self.logger.info(f"SQLite pool opened: 1 writer + {self.reader_count} readers")
+
+    async def close(self):
+        async with self._open_lock:
+            if not self._opened:
+                return
+
+            for connection in [self._writer] + self._readers:
+                try:
+                    await connection.close()
+                except Exception as e:
+                    self.logger.warning(f"Error closing SQLite connection: {e}")
+
+            self._writer = None
+            self._readers = []
+            self._idle_readers = asyncio.Queue()
+            self._opened = False
+            self.logger.info("SQLite pool closed")
+
+    async def _connect(self) -> aiosqlite.Connection:
+        connection = await aiosqlite.connect(self.config.path, timeout=self.config.timeout)
+        connection.row_factory = aiosqlite.Row
+
+        await self._pragma(connection, 'synchronous=NORMAL')
+        await self._pragma(connection, f'cache_size=-{int(self.config.cache_size_kb)}')
+        await self._pragma(connection, f'mmap_size={int(self.config.mmap_size)}')
+        await self._pragma(connection, f'busy_timeout={int(self.config.timeout * 1000)}')
+        await self._pragma(connection, 'temp_store=MEMORY')
+        return connection
+
+    async def _pragma(self, connection: aiosqlite.Connection, pragma: str):
+        # Some pragmas return a row; drain it so no statement stays open on a long-lived connection
+        async with connection.execute(f'PRAGMA {pragma}') as cursor:
+            await cursor.fetchall()
+
+    @asynccontextmanager
+    async def writer(self):
+        await self.open()
+
+        wait_start = time.perf_counter()
+        async with self._writer_lock:
+            self._on_acquired("writer", time.perf_counter() - wait_start)
+            try:
+                yield self._writer
+            finally:
+                # Never hand a half-finished transaction to the next writer
+                if self._writer.in_transaction:
+                    await self._writer.rollback()
+                self._on_released("writer")
+
+    @asynccontextmanager
+    async def reader(self):
+        await self.open()
+
+        wait_start = time.perf_counter()
+        connection = await self._idle_readers.get()
+        self._on_acquired("reader", time.perf_counter() - wait_start)
+        try:
+            yield connection
+        finally:
+            if connection.in_transaction:
+                await connection.rollback()
+            self._idle_readers.put_nowait(connection)
+            self._on_released("reader")
+
+    def _on_acquired(self, role: str, wait_time: float):
+        self._in_use += 1
+        self._wait_metrics[role].record(wait_time)
+        self._report_utilization()
+
+    def _on_released(self, role: str):
+        self._in_use -= 1
+        self._report_utilization()
+
+    def _report_utilization(self):
+        self._in_use_gauge.set(self._in_use)
+        self._utilization_gauge.set(self._in_use / self.size)
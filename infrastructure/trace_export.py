@@ -0,0 +1,54 @@
+import asyncio
+import glob
+import json
+import logging
+import os
+from datetime import datetime
+
+from core.tracing import Span, to_chrome_trace
+from infrastructure.config_manager import MetricsConfig
+
+
+class ChromeTraceExporter:
+    """Writes each slow enough root span (e.g. one full cycle) as a Chrome trace-event JSON file."""
+
+    def __init__(self, config: MetricsConfig):
+        self.trace_dir = config.trace_dir
+        self.min_seconds = config.trace_min_seconds
+        self.keep = config.trace_keep
+        self.logger = logging.getLogger(__name__)
+        os.makedirs(self.trace_dir, exist_ok=True)
+
+    def __call__(self, root: Span):
+        if root.duration < self.min_seconds:
+            return
+
+        timestamp = datetime.now().strftime('%Y%m%d-%H%M%S-%f')
+        path = os.path.join(self.trace_dir, f"trace-{timestamp}-{root.name}.json")
+        trace = to_chrome_trace([root], pid=os.getpid())
+
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._write(path, trace)
+            return
+        # Serializing and writing a cycle's tree is file I/O; keep it off the event loop
+        loop.run_in_executor(None, self._write, path, trace)
+
+    def _write(self, path: str, trace: dict):
+        try:
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(trace, f, ensure_ascii=False)
+            self._prune()
+        except Exception as e:
+            self.logger.warning(f"Failed to write trace {path}: {e}")
+
+    def _prune(self):
+        # Timestamped names sort chronologically
+        traces = sorted(glob.glob(os.path.join(self.trace_dir, 'trace-*.json')))
+        for path in traces[:max(0, len(traces) - self.keep)]:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                # Already pruned by a concurrent write
+                pass
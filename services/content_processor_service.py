@@ -6,12 +6,35 @@ import logging
 import re
 from typing import Optional, Dict, Any
 from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
 
-from core.interfaces import IContentProcessor, NewsItem
+from core.interfaces import IContentProcessor, NewsItem, RateLimitError
 from core.circuit_breaker import CircuitBreaker
+from core.rate_limiter import TokenBucketRateLimiter
 from core.retry import smart_retry
 from core.metrics import timed_metric, IMetricsCollector
+from core.validation import KeywordAutomaton, SENSITIVE
 from infrastructure.config_manager import GigaChatConfig
+from infrastructure.rephrase_cache import SQLiteRephraseCache, normalized_content_hash
+
+
+# Part of the rephrase cache key; bump when the GigaChat prompt changes
+PROMPT_VERSION = '1'
+
+# Sensitive topics that GigaChat might block
+SENSITIVE_KEYWORDS = [
+    'путин', 'зеленский', 'байден', 'трамп', 'навальный', 'оппозиция',
+    'выборы', 'голосование', 'референдум', 'протест', 'митинг', 'демонстрация',
+    'санкции', 'блокировка', 'запрет', 'цензура', 'репрессии',
+    'война', 'военный', 'армия', 'солдат', 'офицер', 'генерал',
+    'украина', 'донбасс', 'луганск', 'донецк', 'крым', 'херсон',
+    'сво', 'спецоперация', 'мобилизация', 'призыв', 'военкомат',
+    'оружие', 'танк', 'самолет', 'ракета', 'бомба', 'взрыв',
+    'атака', 'обстрел', 'удар', 'наступление', 'оборона',
+    'коррупция', 'взятка', 'откат', 'хищение', 'мошенничество',
+    'убийство', 'смерть', 'теракт', 'взрыв', 'пожар', 'авария',
+    'катастрофа', 'трагедия', 'жертвы', 'пострадавшие'
+]
 
 
 @dataclass
@@ -22,27 +45,29 @@ class TokenInfo:
 
 
 class GigaChatContentProcessor(IContentProcessor):
-    def __init__(self, config: GigaChatConfig, metrics: IMetricsCollector):
+    def __init__(
+        self, 
+        config: GigaChatConfig, 
+        metrics: IMetricsCollector,
+        keyword_automaton: Optional[KeywordAutomaton] = None,
+        cache: Optional[SQLiteRephraseCache] = None
+    ):
         self.config = config
         self.metrics = metrics
         self.logger = logging.getLogger(__name__)
         self.token_info: Optional[TokenInfo] = None
+        self.cache = cache
         self.circuit_breaker = CircuitBreaker(failure_threshold=3, recovery_timeout=300.0)
+        self.rate_limiter = TokenBucketRateLimiter(
+            rate=config.requests_per_second,
+            burst=config.max_in_flight,
+            max_in_flight=config.max_in_flight,
+            metrics=metrics,
+            name="gigachat"
+        )
         
-        # Sensitive topics that GigaChat might block
-        self.sensitive_keywords = [
-            'путин', 'зеленский', 'байден', 'трамп', 'навальный', 'оппозиция',
-            'выборы', 'голосование', 'референдум', 'протест', 'митинг', 'демонстрация',
-            'санкции', 'блокировка', 'запрет', 'цензура', 'репрессии',
-            'война', 'военный', 'армия', 'солдат', 'офицер', 'генерал',
-            'украина', 'донбасс', 'луганск', 'донецк', 'крым', 'херсон',
-            'сво', 'спецоперация', 'мобилизация', 'призыв', 'военкомат',
-            'оружие', 'танк', 'самолет', 'ракета', 'бомба', 'взрыв',
-            'атака', 'обстрел', 'удар', 'наступление', 'оборона',
-            'коррупция', 'взятка', 'откат', 'хищение', 'мошенничество',
-            'убийство', 'смерть', 'теракт', 'взрыв', 'пожар', 'авария',
-            'катастрофа', 'трагедия', 'жертвы', 'пострадавшие'
-        ]
+        self.sensitive_keywords = SENSITIVE_KEYWORDS
+        self.keyword_automaton = keyword_automaton or KeywordAutomaton({SENSITIVE: self.sensitive_keywords})
         
         self.gigachat_block_phrases = [
             'чувствительными темами',
@@ -74,6 +99,14 @@ class GigaChatContentProcessor(IContentProcessor):
                 self.metrics.increment_counter("content_processor.sensitive_topic")
                 return self._create_alternative_rephrasing(news.title, news.content, news.city)
             
+            # Copies of the same wire story reuse an earlier rephrasing without an API call
+            cache_key = normalized_content_hash(news.title, news.content, news.city, PROMPT_VERSION)
+            if self.cache:
+                cached = await self._get_cached(cache_key)
+                if cached:
+                    self.logger.debug(f"Rephrase cache hit: {news.title[:50]}...")
+                    return cached
+            
             # Try GigaChat processing
             try:
                 result = await self.circuit_breaker.call(self._process_with_gigachat, news)
@@ -86,6 +119,8 @@ class GigaChatContentProcessor(IContentProcessor):
                 
                 if result:
                     self.metrics.increment_counter("content_processor.gigachat_success")
+                    if self.cache:
+                        await self._store_cached(cache_key, result)
                     return result
                     
             except Exception as e:
@@ -101,7 +136,20 @@ class GigaChatContentProcessor(IContentProcessor):
             self.metrics.increment_counter("content_processor.critical_error")
             return f"Заголовок: {news.title}\nТекст: {news.content}"
     
-    @smart_retry(max_attempts=2, base_delay=2.0, exceptions=(aiohttp.ClientError, asyncio.TimeoutError))
+    async def _get_cached(self, cache_key: str) -> Optional[str]:
+        try:
+            return await self.cache.get(cache_key)
+        except Exception as e:
+            self.logger.warning(f"Rephrase cache lookup failed: {e}")
+            return None
+    
+    async def _store_cached(self, cache_key: str, content: str):
+        try:
+            await self.cache.put(cache_key, content)
+        except Exception as e:
+            self.logger.warning(f"Rephrase cache store failed: {e}")
+    
+    @smart_retry(max_attempts=2, base_delay=2.0, exceptions=(aiohttp.ClientError, asyncio.TimeoutError, RateLimitError))
     async def _process_with_gigachat(self, news: NewsItem) -> Optional[str]:
         token = await self._get_access_token()
         if not token:
@@ -175,13 +223,14 @@ class GigaChatContentProcessor(IContentProcessor):
             'Authorization': f'Bearer {token}'
         }
         
-        async with self.session.post(
+        async with self.rate_limiter, self.session.post(
             f"{self.config.base_url}/chat/completions",
             headers=headers,
             json=payload,
             ssl=self.config.verify_ssl
         ) as response:
             if response.status == 200:
+                self.rate_limiter.on_success()
                 result = await response.json()
                 
                 if 'choices' not in result or not result['choices']:
@@ -199,7 +248,9 @@ class GigaChatContentProcessor(IContentProcessor):
                 self.token_info = None
                 raise Exception("Authentication error")
             elif response.status == 429:
-                raise Exception("Rate limit exceeded")
+                retry_after = self._parse_retry_after(response.headers.get('Retry-After'))
+                self.rate_limiter.on_rate_limited(retry_after)
+                raise RateLimitError("Rate limit exceeded", retry_after)
             else:
                 raise Exception(f"API error: {response.status}")
     
@@ -238,6 +289,22 @@ class GigaChatContentProcessor(IContentProcessor):
             else:
                 raise Exception(f"Token request failed: {response.status}")
     
+    @staticmethod
+    def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+        if not value:
+            return None
+        
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        
+        try:
+            retry_at = parsedate_to_datetime(value)
+            return max(0.0, retry_at.timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+    
     def _is_token_valid(self) -> bool:
         if not self.token_info:
             return False
@@ -318,9 +385,9 @@ class GigaChatContentProcessor(IContentProcessor):
     def _is_sensitive_topic(self, title: str, content: str) -> bool:
         text = f"{title} {content}".lower()
         
-        for keyword in self.sensitive_keywords:
-            if keyword in text:
-                self.logger.debug(f"Sensitive keyword detected: {keyword}")
+        for match in self.keyword_automaton.find_all(text):
+            if match.category == SENSITIVE:
+                self.logger.debug(f"Sensitive keyword detected: {match.keyword}")
                 return True
         
         return False
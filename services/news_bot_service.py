@@ -1,14 +1,24 @@
 import asyncio
 import logging
-from datetime import datetime
-from typing import List, Dict, Any
+import os
+import socket
+import time
+from collections import Counter
+from datetime import datetime, date
+from typing import List, Dict, Any, Iterable, Optional, Tuple
 
 from core.interfaces import (
     INewsParser, INewsRepository, IContentProcessor, INotificationService, 
-    IHealthChecker, IMetricsCollector, IEventBus, NewsStatus, ProcessingResult
+    IHealthChecker, IMetricsCollector, IEventBus, NewsItem, NewsStatus, ProcessingResult, SourceConfig
 )
 from core.metrics import timed_metric
+from core.tracing import span
 from infrastructure.config_manager import AppConfig
+from services.parsing.scheduler import AdaptiveSourceScheduler
+
+
+# Marks the end of a stage's output in the streaming pipeline
+_STREAM_END = object()
 
 
 class NewsBotService:
@@ -33,6 +43,10 @@ class NewsBotService:
         self.event_bus = event_bus
         self.logger = logging.getLogger(__name__)
         
+        # Identifies this process's claims when several workers share one database
+        self.worker_id = config.pipeline.worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self.lease_seconds = config.pipeline.claim_lease_seconds
+        
         # Subscribe to events
         self._setup_event_handlers()
     
@@ -43,17 +57,18 @@ class NewsBotService:
         self.event_bus.subscribe('error.occurred', self._on_error_occurred)
     
     @timed_metric(lambda self: self.metrics, "bot.full_cycle")
-    async def run_full_cycle(self) -> ProcessingResult:
+    async def run_full_cycle(self, source_names: Optional[Iterable[str]] = None) -> ProcessingResult:
         self.logger.info("=" * 50)
         self.logger.info("Starting full news processing cycle")
         self.logger.info("=" * 50)
         
-        start_time = asyncio.get_event_loop().time()
+        start_ns = time.perf_counter_ns()
         errors = []
         
         try:
             # 1. Health check
-            health_status = await self.health_checker.check_health()
+            with span("bot.health_check"):
+                health_status = await self.health_checker.check_health()
             if not health_status.get('overall', False):
                 error_msg = "Health check failed, skipping cycle"
                 self.logger.error(error_msg)
@@ -66,17 +81,21 @@ class NewsBotService:
                     processed_count=0,
                     failed_count=0,
                     errors=[error_msg],
-                    duration=asyncio.get_event_loop().time() - start_time
+                    duration=(time.perf_counter_ns() - start_ns) / 1e9
                 )
             
-            # 2. Parse and save news
-            parsed_count = await self._parse_and_save_news()
-            
-            # 3. Process content
-            processed_count = await self._process_news_content()
-            
-            # 4. Send notifications
-            sent_count = await self._send_notifications()
+            if self.config.pipeline.streaming:
+                # 2-4. Parse, save, process and send as overlapping stages
+                parsed_count, processed_count, sent_count = await self._run_streaming_pipeline(source_names)
+            else:
+                # 2. Parse and save news
+                parsed_count = await self._parse_and_save_news(source_names)
+                
+                # 3. Process content
+                processed_count = await self._process_news_content()
+                
+                # 4. Send notifications
+                sent_count = await self._send_notifications()
             
             # 5. Cleanup old news if needed
             cleanup_count = 0
@@ -88,7 +107,7 @@ class NewsBotService:
             # 6. Get final statistics
             stats = await self.repository.get_statistics()
             
-            duration = asyncio.get_event_loop().time() - start_time
+            duration = (time.perf_counter_ns() - start_ns) / 1e9
             
             self.logger.info("Cycle completed successfully:")
             self.logger.info(f"  - Parsed new news: {parsed_count}")
@@ -124,7 +143,7 @@ class NewsBotService:
             )
             
         except Exception as e:
-            duration = asyncio.get_event_loop().time() - start_time
+            duration = (time.perf_counter_ns() - start_ns) / 1e9
             error_msg = f"Critical error in full cycle: {e}"
             self.logger.error(error_msg)
             errors.append(error_msg)
@@ -144,32 +163,32 @@ class NewsBotService:
             )
     
     @timed_metric(lambda self: self.metrics, "bot.parse_and_save")
-    async def _parse_and_save_news(self) -> int:
+    async def _parse_and_save_news(self, source_names: Optional[Iterable[str]] = None) -> int:
         self.logger.info("Starting news parsing and saving")
         
         try:
             # Parse news from all sources
-            news_items = await self.parser.parse_all_sources()
+            news_items = await self.parser.parse_all_sources(source_names)
             
             if not news_items:
                 self.logger.warning("No news items found")
+                await self.parser.commit_parsed(source_names)
                 return 0
             
-            # Save news items to repository
+            # Save news items to repository in a single transaction
+            news_ids = await self.repository.save_news_batch(news_items)
+            saved_counts = Counter(news.source for news, news_id in zip(news_items, news_ids) if news_id)
+            await self.parser.commit_parsed(source_names, saved_counts)
+            
             saved_count = 0
-            for news in news_items:
-                try:
-                    news_id = await self.repository.save_news(news)
-                    if news_id:
-                        saved_count += 1
-                        await self.event_bus.publish('news.parsed', {
-                            'news_id': news_id,
-                            'source': news.source,
-                            'title': news.title[:100]
-                        })
-                except Exception as e:
-                    self.logger.error(f"Error saving news '{news.title[:50]}...': {e}")
-                    continue
+            for news, news_id in zip(news_items, news_ids):
+                if news_id:
+                    saved_count += 1
+                    await self.event_bus.publish('news.parsed', {
+                        'news_id': news_id,
+                        'source': news.source,
+                        'title': news.title[:100]
+                    })
             
             self.logger.info(f"Saved {saved_count} new news items from {len(news_items)} parsed")
             self.metrics.set_gauge("bot.save_success_rate", saved_count / len(news_items) if news_items else 0)
@@ -179,6 +198,7 @@ class NewsBotService:
         except Exception as e:
             self.logger.error(f"Error in parse and save: {e}")
             self.metrics.increment_counter("bot.parse_save_error")
+            self.parser.discard_parsed(source_names)
             return 0
     
     @timed_metric(lambda self: self.metrics, "bot.process_content")
@@ -186,48 +206,27 @@ class NewsBotService:
         self.logger.info("Starting content processing")
         
         try:
-            # Get unprocessed news
-            unprocessed_news = await self.repository.get_news_by_status(
+            # Claim unprocessed news so no other worker rephrases them too
+            unprocessed_news = await self.repository.claim_news(
                 NewsStatus.PARSED, 
-                limit=self.config.parsing.max_news_per_run
+                self.config.parsing.max_news_per_run,
+                self.worker_id,
+                self.lease_seconds
             )
             
             if not unprocessed_news:
                 self.logger.info("No news items to process")
                 return 0
             
-            processed_count = 0
-            for news in unprocessed_news:
-                try:
-                    # Process content
-                    rephrased_content = await self.content_processor.process_content(news)
-                    
-                    if rephrased_content:
-                        # Update news status
-                        success = await self.repository.update_news_status(
-                            news.id,
-                            NewsStatus.PROCESSED,
-                            rephrased_content=rephrased_content
-                        )
-                        
-                        if success:
-                            processed_count += 1
-                            await self.event_bus.publish('news.processed', {
-                                'news_id': news.id,
-                                'source': news.source,
-                                'title': news.title[:100]
-                            })
-                        
-                        # Delay between processing to respect rate limits
-                        await asyncio.sleep(self.config.gigachat.delay_seconds)
-                    else:
-                        self.logger.warning(f"Failed to process content for news {news.id}")
-                        await self.repository.update_news_status(news.id, NewsStatus.FAILED)
-                
-                except Exception as e:
-                    self.logger.error(f"Error processing news {news.id}: {e}")
-                    await self.repository.update_news_status(news.id, NewsStatus.FAILED)
-                    continue
+            # Worker pool; the processor's rate limiter paces the actual API calls
+            semaphore = asyncio.Semaphore(self.config.gigachat.worker_count)
+            
+            async def process_with_worker(news: NewsItem) -> Optional[NewsItem]:
+                async with semaphore:
+                    return await self._process_single_news(news)
+            
+            results = await asyncio.gather(*(process_with_worker(news) for news in unprocessed_news))
+            processed_count = sum(1 for result in results if result)
             
             self.logger.info(f"Processed {processed_count} news items")
             return processed_count
@@ -237,15 +236,51 @@ class NewsBotService:
             self.metrics.increment_counter("bot.process_content_error")
             return 0
     
+    async def _process_single_news(self, news: NewsItem) -> Optional[NewsItem]:
+        try:
+            # Process content
+            rephrased_content = await self.content_processor.process_content(news)
+            
+            if not rephrased_content:
+                self.logger.warning(f"Failed to process content for news {news.id}")
+                await self.repository.update_news_status(news.id, NewsStatus.FAILED, worker_id=self.worker_id)
+                return None
+            
+            # Update news status
+            success = await self.repository.update_news_status(
+                news.id,
+                NewsStatus.PROCESSED,
+                rephrased_content=rephrased_content,
+                worker_id=self.worker_id
+            )
+            
+            processed_news = None
+            if success:
+                processed_news = news.with_status(NewsStatus.PROCESSED, rephrased_content=rephrased_content)
+                await self.event_bus.publish('news.processed', {
+                    'news_id': news.id,
+                    'source': news.source,
+                    'title': news.title[:100]
+                })
+            
+            return processed_news
+        
+        except Exception as e:
+            self.logger.error(f"Error processing news {news.id}: {e}")
+            await self.repository.update_news_status(news.id, NewsStatus.FAILED, worker_id=self.worker_id)
+            return None
+    
     @timed_metric(lambda self: self.metrics, "bot.send_notifications")
     async def _send_notifications(self) -> int:
         self.logger.info("Starting notification sending")
         
         try:
-            # Get processed news ready for sending
-            ready_news = await self.repository.get_news_by_status(
+            # Claim processed news ready for sending
+            ready_news = await self.repository.claim_news(
                 NewsStatus.PROCESSED,
-                limit=5  # Limit to avoid spam
+                5,  # Limit to avoid spam
+                self.worker_id,
+                self.lease_seconds
             )
             
             if not ready_news:
@@ -257,6 +292,8 @@ class NewsBotService:
             for news in ready_news:
                 if news.rephrased_content:
                     news_to_send.append((news, news.rephrased_content))
+                else:
+                    await self.repository.update_news_status(news.id, NewsStatus.FAILED, worker_id=self.worker_id)
             
             if not news_to_send:
                 self.logger.warning("No news items have rephrased content")
@@ -272,7 +309,8 @@ class NewsBotService:
                     await self.repository.update_news_status(
                         news_id,
                         NewsStatus.SENT,
-                        telegram_message_id=message_id
+                        telegram_message_id=message_id,
+                        worker_id=self.worker_id
                     )
                     sent_count += 1
                     
@@ -286,7 +324,7 @@ class NewsBotService:
                             'title': news_item.title[:100]
                         })
                 else:
-                    await self.repository.update_news_status(news_id, NewsStatus.FAILED)
+                    await self.repository.update_news_status(news_id, NewsStatus.FAILED, worker_id=self.worker_id)
             
             self.logger.info(f"Sent {sent_count} notifications")
             return sent_count
@@ -296,6 +334,322 @@ class NewsBotService:
             self.metrics.increment_counter("bot.send_notifications_error")
             return 0
     
+    @timed_metric(lambda self: self.metrics, "bot.streaming_pipeline")
+    async def _run_streaming_pipeline(self, source_names: Optional[Iterable[str]] = None) -> Tuple[int, int, int]:
+        self.logger.info("Starting streaming pipeline")
+        
+        pipeline_config = self.config.pipeline
+        save_queue = asyncio.Queue(maxsize=pipeline_config.save_queue_size)
+        process_queue = asyncio.Queue(maxsize=pipeline_config.process_queue_size)
+        send_queue = asyncio.Queue(maxsize=pipeline_config.send_queue_size)
+        counts = {'parsed': 0, 'processed': 0, 'sent': 0}
+        saved_counts = Counter()
+        
+        async def drain(queue: asyncio.Queue) -> int:
+            # A consumer that gave up keeps reading to the end marker, so its producer never blocks on a full queue
+            dropped = 0
+            while await queue.get() is not _STREAM_END:
+                dropped += 1
+            return dropped
+        
+        async def fetch_stage():
+            try:
+                async for news_items in self.parser.parse_sources_stream(source_names):
+                    await save_queue.put(news_items)
+                    self.metrics.set_gauge("pipeline.queue_depth", save_queue.qsize(), {"stage": "save"})
+            except Exception as e:
+                self.logger.error(f"Error in pipeline fetch stage: {e}")
+                self.metrics.increment_counter("pipeline.stage_error", {"stage": "fetch"})
+            finally:
+                await save_queue.put(_STREAM_END)
+        
+        async def save_stage():
+            stream_open = True
+            try:
+                # Items left unprocessed by earlier cycles go first
+                backlog = await self.repository.claim_news(
+                    NewsStatus.PARSED, 
+                    self.config.parsing.max_news_per_run,
+                    self.worker_id,
+                    self.lease_seconds
+                )
+                for news in backlog:
+                    await process_queue.put(news)
+                
+                while (news_items := await save_queue.get()) is not _STREAM_END:
+                    try:
+                        news_ids = await self.repository.save_news_batch(news_items)
+                    except Exception as e:
+                        # The next poll of these sources must refetch the feed in full
+                        self.logger.error(f"Error in pipeline save stage: {e}")
+                        self.metrics.increment_counter("pipeline.stage_error", {"stage": "save"})
+                        self.parser.discard_parsed({news.source for news in news_items})
+                        continue
+                    
+                    saved_ids = []
+                    for news, news_id in zip(news_items, news_ids):
+                        if not news_id:
+                            continue
+                        saved_ids.append(news_id)
+                        counts['parsed'] += 1
+                        saved_counts[news.source] += 1
+                        await self.event_bus.publish('news.parsed', {
+                            'news_id': news_id,
+                            'source': news.source,
+                            'title': news.title[:100]
+                        })
+                    
+                    # Fresh rows are claimed too, another worker may already be polling the queue
+                    claimed = await self.repository.claim_news(
+                        NewsStatus.PARSED, len(saved_ids), self.worker_id, self.lease_seconds, news_ids=saved_ids
+                    )
+                    for news in claimed:
+                        await process_queue.put(news)
+                        self.metrics.set_gauge("pipeline.queue_depth", process_queue.qsize(), {"stage": "process"})
+                stream_open = False
+                
+                # Every streamed batch is settled by now, failed ones are already discarded
+                await self.parser.commit_parsed(source_names, saved_counts)
+            except Exception as e:
+                self.logger.error(f"Error in pipeline save stage: {e}")
+                self.metrics.increment_counter("pipeline.stage_error", {"stage": "save"})
+                if stream_open:
+                    await drain(save_queue)
+                # Discarded once the fetch stage is done, so no later source keeps its state either
+                self.parser.discard_parsed(source_names)
+            finally:
+                await process_queue.put(_STREAM_END)
+        
+        async def process_worker():
+            while (news := await process_queue.get()) is not _STREAM_END:
+                try:
+                    processed_news = await self._process_single_news(news)
+                    if not processed_news:
+                        continue
+                    
+                    counts['processed'] += 1
+                    claimed = await self.repository.claim_news(
+                        NewsStatus.PROCESSED, 1, self.worker_id, self.lease_seconds, news_ids=[news.id]
+                    )
+                    for claimed_news in claimed:
+                        await send_queue.put(claimed_news)
+                        self.metrics.set_gauge("pipeline.queue_depth", send_queue.qsize(), {"stage": "send"})
+                except Exception as e:
+                    self.logger.error(f"Error in pipeline process stage: {e}")
+                    self.metrics.increment_counter("pipeline.stage_error", {"stage": "process"})
+            # Let the remaining workers see the end marker too
+            await process_queue.put(_STREAM_END)
+        
+        async def process_stage():
+            try:
+                backlog = await self.repository.claim_news(
+                    NewsStatus.PROCESSED, 5, self.worker_id, self.lease_seconds
+                )
+                for news in backlog:
+                    await send_queue.put(news)
+                
+                # Every worker runs to its end, one failing does not cut the others short
+                results = await asyncio.gather(
+                    *(process_worker() for _ in range(self.config.gigachat.worker_count)), 
+                    return_exceptions=True
+                )
+                for result in results:
+                    if isinstance(result, Exception):
+                        self.logger.error(f"Pipeline process worker failed: {result}")
+                        self.metrics.increment_counter("pipeline.stage_error", {"stage": "process"})
+            except Exception as e:
+                self.logger.error(f"Error in pipeline process stage: {e}")
+                self.metrics.increment_counter("pipeline.stage_error", {"stage": "process"})
+            
+            # No worker is left; items still queued keep their claim until the lease expires
+            dropped = await drain(process_queue)
+            if dropped:
+                self.logger.warning(f"Pipeline process stage stopped, {dropped} claimed news left for lease expiry")
+            await send_queue.put(_STREAM_END)
+        
+        async def send_stage():
+            while (news := await send_queue.get()) is not _STREAM_END:
+                try:
+                    if await self._send_single_news(news):
+                        counts['sent'] += 1
+                except Exception as e:
+                    self.logger.error(f"Error in pipeline send stage: {e}")
+                    self.metrics.increment_counter("pipeline.stage_error", {"stage": "send"})
+        
+        await asyncio.gather(fetch_stage(), save_stage(), process_stage(), send_stage())
+        
+        self.logger.info(
+            f"Streaming pipeline finished: saved {counts['parsed']}, "
+            f"processed {counts['processed']}, sent {counts['sent']}"
+        )
+        return counts['parsed'], counts['processed'], counts['sent']
+    
+    async def run_daemon(self, stop_event: asyncio.Event, scheduler: Optional[AdaptiveSourceScheduler] = None):
+        # Independent loops coordinated through the news status column:
+        # one fetcher per source -> PARSED -> rephraser -> PROCESSED -> sender -> SENT
+        sources = [source for source in self.config.news_sources.values() if source.enabled]
+        self.logger.info(f"Starting daemon: {len(sources)} source fetchers, rephraser and sender loops")
+        
+        fetch_slots = asyncio.Semaphore(self.config.parsing.max_concurrent_sources)
+        parsed_available = asyncio.Event()
+        processed_available = asyncio.Event()
+        processing_stopped = asyncio.Event()
+        
+        fetchers = [
+            asyncio.create_task(self._fetch_loop(source, stop_event, fetch_slots, parsed_available, scheduler))
+            for source in sources
+        ]
+        workers = [
+            asyncio.create_task(self._process_loop(stop_event, parsed_available, processed_available, processing_stopped)),
+            asyncio.create_task(self._send_loop(stop_event, processed_available, processing_stopped)),
+            asyncio.create_task(self._maintenance_loop(stop_event))
+        ]
+        
+        await stop_event.wait()
+        self.logger.info("Stopping daemon: finishing in-flight work")
+        
+        # Fetchers are safe to interrupt: a half-done poll is repeated on the next start
+        for task in fetchers:
+            task.cancel()
+        
+        # The rephraser finishes its batch and the sender drains what is already rephrased
+        tasks = fetchers + workers
+        _, pending = await asyncio.wait(tasks, timeout=self.config.daemon.drain_timeout_seconds)
+        if pending:
+            self.logger.warning(f"Drain timeout reached, cancelling {len(pending)} daemon tasks")
+            for task in pending:
+                task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        
+        self.logger.info("Daemon stopped")
+    
+    async def _fetch_loop(
+        self, 
+        source: SourceConfig, 
+        stop_event: asyncio.Event, 
+        fetch_slots: asyncio.Semaphore,
+        parsed_available: asyncio.Event,
+        scheduler: Optional[AdaptiveSourceScheduler]
+    ):
+        while not stop_event.is_set():
+            if scheduler:
+                # Daemon fetchers share the scheduler's per-minute poll budget with each other
+                budget_wait = scheduler.reserve_poll(source.name)
+                if budget_wait > 0:
+                    await self._wait_for_event(stop_event, budget_wait)
+                    continue
+            
+            async with fetch_slots:
+                saved_count = await self._parse_and_save_news([source.name])
+            
+            if saved_count:
+                parsed_available.set()
+            
+            if scheduler:
+                delay = scheduler.seconds_until_source_due(source.name)
+            else:
+                delay = self.config.parsing.interval_minutes * 60
+            await self._wait_for_event(stop_event, delay)
+    
+    async def _process_loop(
+        self, 
+        stop_event: asyncio.Event, 
+        parsed_available: asyncio.Event, 
+        processed_available: asyncio.Event,
+        processing_stopped: asyncio.Event
+    ):
+        try:
+            while not stop_event.is_set():
+                processed_count = await self._process_news_content()
+                if processed_count:
+                    processed_available.set()
+                    continue  # There may be more backlog
+                
+                await self._wait_for_event(stop_event, self.config.daemon.poll_seconds, parsed_available)
+        finally:
+            processing_stopped.set()
+            processed_available.set()
+    
+    async def _send_loop(
+        self, 
+        stop_event: asyncio.Event, 
+        processed_available: asyncio.Event, 
+        processing_stopped: asyncio.Event
+    ):
+        while True:
+            sent_count = await self._send_notifications()
+            if sent_count:
+                continue
+            
+            # Exit only once the rephraser has stopped producing and nothing is left to send
+            if stop_event.is_set() and processing_stopped.is_set():
+                break
+            
+            await self._wait_for_event(processing_stopped, self.config.daemon.poll_seconds, processed_available)
+    
+    async def _maintenance_loop(self, stop_event: asyncio.Event):
+        last_cleanup: Optional[date] = None
+        
+        while not stop_event.is_set():
+            try:
+                await self.repository.release_expired_leases()
+            except Exception as e:
+                self.logger.error(f"Error releasing expired leases: {e}")
+            
+            now = datetime.now()
+            if now.hour == self.config.cleanup_hour and last_cleanup != now.date():
+                try:
+                    cleanup_count = await self.repository.cleanup_old_news(days=7)
+                    self.logger.info(f"Cleaned up {cleanup_count} old news items")
+                except Exception as e:
+                    self.logger.error(f"Error cleaning up old news: {e}")
+                last_cleanup = now.date()
+            
+            await self._wait_for_event(stop_event, 600)
+    
+    async def _wait_for_event(self, stop_event: asyncio.Event, timeout: float, wake_event: Optional[asyncio.Event] = None):
+        # Sleeps until timeout, shutdown or wake_event, whichever comes first
+        waiters = [asyncio.ensure_future(stop_event.wait())]
+        if wake_event:
+            waiters.append(asyncio.ensure_future(wake_event.wait()))
+        
+        try:
+            await asyncio.wait(waiters, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for waiter in waiters:
+                waiter.cancel()
+        
+        if wake_event:
+            wake_event.clear()
+    
+    async def _send_single_news(self, news: NewsItem) -> bool:
+        if not news.rephrased_content:
+            self.logger.warning(f"News {news.id} has no rephrased content")
+            return False
+        
+        message_id = await self.notification_service.send_news(news, news.rephrased_content)
+        
+        if message_id is None:
+            await self.repository.update_news_status(news.id, NewsStatus.FAILED, worker_id=self.worker_id)
+            return False
+        
+        await self.repository.update_news_status(
+            news.id,
+            NewsStatus.SENT,
+            telegram_message_id=message_id,
+            worker_id=self.worker_id
+        )
+        await self.event_bus.publish('news.sent', {
+            'news_id': news.id,
+            'message_id': message_id,
+            'source': news.source,
+            'title': news.title[:100]
+        })
+        
+        # Delay between sends to respect rate limits
+        await asyncio.sleep(self.config.telegram.delay_seconds)
+        return True
+    
     async def get_statistics(self) -> Dict[str, Any]:
         try:
             db_stats = await self.repository.get_statistics()
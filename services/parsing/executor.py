@@ -0,0 +1,54 @@
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Optional
+
+
+def _process_context():
+    # fork would copy locks held by our threads (aiosqlite connections, the logging listener,
+    # the default executor) into a child that can then deadlock; forkserver is not on Windows
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+
+
+class ParseExecutor:
+    """Runs CPU-bound parsing off the event loop ('process', 'thread' or 'inline' mode)."""
+
+    MODES = ('process', 'thread', 'inline')
+
+    def __init__(self, mode: str = 'process', max_workers: Optional[int] = None):
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown parse executor mode: {mode}")
+
+        self.mode = mode
+        self.max_workers = max_workers
+        self.logger = logging.getLogger(__name__)
+        self._executor: Optional[Executor] = None
+
+    def _get_executor(self) -> Optional[Executor]:
+        if self.mode == 'inline':
+            return None
+
+        if self._executor is None:
+            if self.mode == 'process':
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=_process_context())
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='parse')
+            self.logger.info(f"Parse executor started: {self.mode} pool, max_workers={self.max_workers}")
+
+        return self._executor
+
+    async def run(self, func: Callable, *args, **kwargs) -> Any:
+        executor = self._get_executor()
+        if executor is None:
+            return func(*args, **kwargs)
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor, partial(func, *args, **kwargs))
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
@@ -0,0 +1,190 @@
+"""
+CPU-bound parsing functions run by ParseExecutor.
+
+Everything here is a module-level function taking and returning plain picklable
+values so it can run in a worker process.
+"""
+
+import re
+import time
+import feedparser
+from typing import FrozenSet, List, NamedTuple, Optional, Tuple
+from urllib.parse import urljoin
+
+from .html_backends import get_html_backend
+
+
+class RssEntryRecord(NamedTuple):
+    title: str
+    content: str
+    url: str
+    guid: str
+    published: Optional[Tuple[int, ...]]
+
+
+class RssFeedExtract(NamedTuple):
+    bozo: bool
+    entries: List[RssEntryRecord]
+    keys: List[str]  # GUID/link of every entry in the window, including skipped ones
+    latest_published: Optional[Tuple[int, ...]]
+    skipped: int
+
+
+class HtmlBlockRecord(NamedTuple):
+    title: str
+    url: str
+    content: str
+    date_text: str
+
+
+ARTICLE_CONTENT_SELECTORS = [
+    'article', '.article', '.content', '.post-content',
+    '.entry-content', '.news-content', '.text', '.body'
+]
+
+TITLE_SELECTOR = 'h1, h2, h3, h4, a'
+BLOCK_TEXT_SELECTOR = 'p, div, span'
+DATE_SELECTOR = 'time, .date, .time'
+BOILERPLATE_SELECTOR = 'script, style, nav, header, footer, aside'
+
+
+def clean_text(text: str) -> str:
+    if not text:
+        return ""
+
+    # Remove HTML tags
+    text = re.sub(r'<[^>]+>', '', text)
+
+    # Normalize whitespace
+    text = re.sub(r'\s+', ' ', text)
+
+    # Remove special characters but keep basic punctuation
+    text = re.sub(r'[^\w\s\-.,!?:;()«»""\']', ' ', text)
+    text = re.sub(r'\s+', ' ', text)
+
+    return text.strip()
+
+
+def extract_rss_entries(
+    content: str,
+    max_items: int,
+    seen: FrozenSet[str] = frozenset(),
+    published_cutoff: Optional[Tuple[int, ...]] = None
+) -> RssFeedExtract:
+    feed = feedparser.parse(content)
+
+    records = []
+    keys = []
+    latest_published = None
+    skipped = 0
+    # Feed dates are UTC; a future-dated entry must not push the watermark past real entries
+    now = tuple(time.gmtime()[:6])
+
+    for entry in feed.entries[:max_items]:
+        url = getattr(entry, 'link', '')
+        guid = getattr(entry, 'id', '') or url
+
+        published = None
+        if hasattr(entry, 'published_parsed') and entry.published_parsed:
+            published = tuple(entry.published_parsed[:6])
+        elif hasattr(entry, 'updated_parsed') and entry.updated_parsed:
+            published = tuple(entry.updated_parsed[:6])
+
+        if guid:
+            keys.append(guid)
+        if published and (latest_published is None or published > latest_published):
+            latest_published = min(published, now)
+
+        # Entries known from earlier polls are dropped before any text cleaning
+        if guid in seen or (published and published_cutoff and published < published_cutoff):
+            skipped += 1
+            continue
+
+        title = clean_text(getattr(entry, 'title', ''))
+        text = clean_text(
+            getattr(entry, 'description', '') or
+            getattr(entry, 'summary', '')
+        )
+
+        if not title or not text:
+            continue
+
+        records.append(RssEntryRecord(
+            title=title,
+            content=text,
+            url=url,
+            guid=guid,
+            published=published
+        ))
+
+    return RssFeedExtract(bool(feed.bozo), records, keys, latest_published, skipped)
+
+
+def extract_html_blocks(
+    content: str,
+    selector: str,
+    base_url: str,
+    max_items: int,
+    backend: Optional[str] = None
+) -> List[HtmlBlockRecord]:
+    html = get_html_backend(backend)
+    document = html.parse(content)
+
+    records = []
+    for block in html.select(document, selector)[:max_items]:
+        # Extract title
+        title_elem = html.find_first(block, TITLE_SELECTOR)
+        if title_elem is None:
+            continue
+
+        title = clean_text(html.text(title_elem))
+        if not title or len(title) < 10:
+            continue
+
+        # Extract URL
+        link_elem = html.find_first(block, 'a')
+        url = ""
+        href = html.attribute(link_elem, 'href') if link_elem is not None else None
+        if href:
+            url = urljoin(base_url, href)
+
+        # Extract content
+        content_elem = html.find_first(block, BLOCK_TEXT_SELECTOR)
+        text = clean_text(html.text(content_elem)) if content_elem is not None else ""
+
+        # Extract date
+        date_elem = html.find_first(block, DATE_SELECTOR)
+        date_text = ""
+        if date_elem is not None:
+            date_text = html.text(date_elem) or html.attribute(date_elem, 'datetime') or ''
+
+        records.append(HtmlBlockRecord(title=title, url=url, content=text, date_text=date_text))
+
+    return records
+
+
+def extract_article_text(content: str, max_length: int = 2000, backend: Optional[str] = None) -> Optional[str]:
+    html = get_html_backend(backend)
+    document = html.parse(content)
+
+    # Remove unwanted elements
+    html.remove(document, BOILERPLATE_SELECTOR)
+
+    # Try to find main content
+    content_text = ""
+    for selector in ARTICLE_CONTENT_SELECTORS:
+        content_elem = html.find_first(document, selector)
+        if content_elem is not None:
+            content_text = clean_text(html.text(content_elem))
+            break
+
+    # Fallback to all paragraphs
+    if not content_text:
+        paragraphs = html.select(document, 'p')
+        content_text = ' '.join([clean_text(html.text(p)) for p in paragraphs])
+
+    # Limit content length
+    if len(content_text) > max_length:
+        content_text = content_text[:max_length] + "..."
+
+    return content_text if len(content_text) > 50 else None
@@ -0,0 +1,197 @@
+"""
+Interchangeable HTML parser backends for the extractors.
+
+Backends only expose the handful of DOM operations the extraction heuristics
+need, so every backend yields the same records for the same page. lxml and
+selectolax are optional: a source asking for a missing backend falls back to
+BeautifulSoup's html.parser.
+"""
+
+import logging
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Type
+
+
+DEFAULT_HTML_BACKEND = 'html.parser'
+
+logger = logging.getLogger(__name__)
+
+
+class HtmlBackend(ABC):
+    name: str = ''
+
+    @abstractmethod
+    def parse(self, content: str) -> Any:
+        pass
+
+    @abstractmethod
+    def select(self, node: Any, selector: str) -> List[Any]:
+        pass
+
+    @abstractmethod
+    def find_first(self, node: Any, selector: str) -> Optional[Any]:
+        # First descendant of node (never node itself) matching selector, in document order
+        pass
+
+    @abstractmethod
+    def text(self, node: Any) -> str:
+        pass
+
+    @abstractmethod
+    def attribute(self, node: Any, name: str) -> Optional[str]:
+        pass
+
+    @abstractmethod
+    def remove(self, document: Any, selector: str):
+        pass
+
+
+class BeautifulSoupBackend(HtmlBackend):
+    name = 'html.parser'
+
+    def __init__(self):
+        from bs4 import BeautifulSoup
+        self._soup = BeautifulSoup
+
+    def parse(self, content: str) -> Any:
+        return self._soup(content, 'html.parser')
+
+    def select(self, node: Any, selector: str) -> List[Any]:
+        return node.select(selector)
+
+    def find_first(self, node: Any, selector: str) -> Optional[Any]:
+        return node.select_one(selector)
+
+    def text(self, node: Any) -> str:
+        return node.get_text()
+
+    def attribute(self, node: Any, name: str) -> Optional[str]:
+        return node.get(name)
+
+    def remove(self, document: Any, selector: str):
+        for element in document.select(selector):
+            element.decompose()
+
+
+class LxmlBackend(HtmlBackend):
+    name = 'lxml'
+
+    def __init__(self):
+        import lxml.html
+        from lxml import etree
+        from cssselect import HTMLTranslator
+
+        self._html = lxml.html
+        self._etree = etree
+        self._translator = HTMLTranslator()
+        self._parser = lxml.html.HTMLParser(encoding='utf-8')
+
+    @lru_cache(maxsize=256)
+    def _xpath(self, selector: str, prefix: str):
+        return self._etree.XPath(self._translator.css_to_xpath(selector, prefix=prefix))
+
+    def parse(self, content: str) -> Any:
+        # lxml refuses empty documents and str input carrying an encoding declaration
+        data = content.encode('utf-8') if content and content.strip() else b'<html></html>'
+        return self._html.document_fromstring(data, parser=self._parser)
+
+    def select(self, node: Any, selector: str) -> List[Any]:
+        return self._xpath(selector, 'descendant-or-self::')(node)
+
+    def find_first(self, node: Any, selector: str) -> Optional[Any]:
+        matches = self._xpath(selector, 'descendant::')(node)
+        return matches[0] if matches else None
+
+    def text(self, node: Any) -> str:
+        return node.text_content()
+
+    def attribute(self, node: Any, name: str) -> Optional[str]:
+        return node.get(name)
+
+    def remove(self, document: Any, selector: str):
+        for element in self.select(document, selector):
+            element.drop_tree()
+
+
+class SelectolaxBackend(HtmlBackend):
+    name = 'selectolax'
+
+    def __init__(self):
+        from selectolax.lexbor import LexborHTMLParser
+        self._parser = LexborHTMLParser
+
+    def parse(self, content: str) -> Any:
+        return self._parser(content or '')
+
+    def select(self, node: Any, selector: str) -> List[Any]:
+        # Lexbor yields an element once per selector of a group it matches
+        seen = set()
+        matches = []
+        for match in node.css(selector):
+            if match.mem_id not in seen:
+                seen.add(match.mem_id)
+                matches.append(match)
+        return matches
+
+    def find_first(self, node: Any, selector: str) -> Optional[Any]:
+        # Lexbor matches the context node itself too; the parsed document has no mem_id
+        own_id = getattr(node, 'mem_id', None)
+        for match in node.css(selector):
+            if match.mem_id != own_id:
+                return match
+        return None
+
+    def text(self, node: Any) -> str:
+        return node.text()
+
+    def attribute(self, node: Any, name: str) -> Optional[str]:
+        return node.attributes.get(name)
+
+    def remove(self, document: Any, selector: str):
+        # decompose() frees the whole subtree, so only outermost matches are removed
+        matches = self.select(document, selector)
+        matched_ids = {element.mem_id for element in matches}
+
+        for element in matches:
+            parent = element.parent
+            while parent is not None and parent.mem_id not in matched_ids:
+                parent = parent.parent
+            if parent is None:
+                element.decompose()
+
+
+HTML_BACKENDS: Dict[str, Type[HtmlBackend]] = {
+    BeautifulSoupBackend.name: BeautifulSoupBackend,
+    LxmlBackend.name: LxmlBackend,
+    SelectolaxBackend.name: SelectolaxBackend,
+}
+
+
+@lru_cache(maxsize=None)
+def get_html_backend(name: Optional[str] = None) -> HtmlBackend:
+    name = name or DEFAULT_HTML_BACKEND
+
+    backend_class = HTML_BACKENDS.get(name)
+    if backend_class is None:
+        logger.warning(f"Unknown HTML backend '{name}', falling back to {DEFAULT_HTML_BACKEND}")
+        return get_html_backend(DEFAULT_HTML_BACKEND)
+
+    try:
+        return backend_class()
+    except ImportError as e:
+        if name == DEFAULT_HTML_BACKEND:
+            raise
+        logger.warning(f"HTML backend '{name}' is not installed ({e}), falling back to {DEFAULT_HTML_BACKEND}")
+        return get_html_backend(DEFAULT_HTML_BACKEND)
+
+
+def available_html_backends() -> List[str]:
+    available = []
+    for name, backend_class in HTML_BACKENDS.items():
+        try:
+            backend_class()
+        except ImportError:
+            continue
+        available.append(name)
+    return available
@@ -1,14 +1,20 @@
 import aiohttp
 import asyncio
 import logging
-from typing import List, Dict
+from typing import List, Dict, AsyncIterator, Iterable, Optional, Set
 
-from core.interfaces import INewsParser, NewsItem, SourceConfig
+from core.interfaces import INewsParser, NewsItem, SourceConfig, CircuitBreakerOpenError
 from core.validation import NewsValidationChain, INewsValidator
 from core.circuit_breaker import CircuitBreaker
-from core.metrics import timed_metric, IMetricsCollector
+from core.rate_limiter import KeyedConcurrencyLimiter
+from core.metrics import timed_metric, HandleFamily, IMetricsCollector
+from core.tracing import annotate, span
 from infrastructure.config_manager import ParsingConfig
-from .strategies import ParsingStrategyFactory
+from infrastructure.http_cache import HttpValidatorCache
+from infrastructure.feed_watermarks import SQLiteFeedWatermarkStore
+from .executor import ParseExecutor
+from .scheduler import AdaptiveSourceScheduler
+from .strategies import ParsingStrategyFactory, PendingFeedState
 
 
 class AsyncNewsParserService(INewsParser):
@@ -17,18 +23,39 @@ class AsyncNewsParserService(INewsParser):
         config: ParsingConfig,
         sources: Dict[str, SourceConfig],
         validation_chain: NewsValidationChain,
-        metrics: IMetricsCollector
+        metrics: IMetricsCollector,
+        watermarks: Optional[SQLiteFeedWatermarkStore] = None,
+        scheduler: Optional[AdaptiveSourceScheduler] = None
     ):
         self.config = config
         self.sources = sources
         self.validation_chain = validation_chain
         self.metrics = metrics
+        self.watermarks = watermarks
+        self.scheduler = scheduler
         self.logger = logging.getLogger(__name__)
         
+        # Bumped once per parsed item
+        self._validated = HandleFamily(metrics.counter, "parser.news_validated", "source")
+        self._rejected = HandleFamily(metrics.counter, "parser.news_rejected", "source")
+        
+        # Conditional GET validators survive restarts so the first poll can also be a 304
+        self.http_cache = HttpValidatorCache(config.http_cache_path) if config.http_cache_path else None
+        # Per source, from parse until the caller has saved the items
+        self._pending_states: Dict[str, PendingFeedState] = {}
+        # Polled sources whose scheduler record waits for the saved count
+        self._polled: Set[str] = set()
+        
+        # feedparser/BeautifulSoup work runs here instead of on the event loop
+        self.executor = ParseExecutor(config.parse_executor, config.parse_workers)
+        
+        # Shared across sources so two sources on one host do not double its load
+        self.host_limiter = KeyedConcurrencyLimiter(config.article_fetch_per_host)
+        
         # Circuit breakers for each source
         self.circuit_breakers = {
-            name: CircuitBreaker(failure_threshold=3, recovery_timeout=300.0)
-            for name in sources.keys()
+            source.name: CircuitBreaker(failure_threshold=3, recovery_timeout=300.0)
+            for source in sources.values()
         }
         
         # HTTP session configuration
@@ -58,12 +85,13 @@ class AsyncNewsParserService(INewsParser):
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         if hasattr(self, 'session'):
             await self.session.close()
+        self.executor.shutdown()
     
     @timed_metric(lambda self: self.metrics, "parser.parse_all_sources")
-    async def parse_all_sources(self) -> List[NewsItem]:
+    async def parse_all_sources(self, source_names: Optional[Iterable[str]] = None) -> List[NewsItem]:
         enabled_sources = {
             name: source for name, source in self.sources.items() 
-            if source.enabled
+            if source.enabled and (source_names is None or source.name in source_names)
         }
         
         if not enabled_sources:
@@ -104,15 +132,7 @@ class AsyncNewsParserService(INewsParser):
             self.logger.warning(f"Failed sources: {', '.join(failed_sources)}")
         
         # Validate all news items
-        validated_news = []
-        for news in all_news:
-            try:
-                self.validation_chain.validate(news)
-                validated_news.append(news)
-                self.metrics.increment_counter("parser.news_validated", {"source": news.source})
-            except Exception as e:
-                self.logger.debug(f"News validation failed: {e}")
-                self.metrics.increment_counter("parser.news_rejected", {"source": news.source})
+        validated_news = self._validate_news(all_news)
         
         self.logger.info(
             f"Parsing completed: {len(validated_news)} valid news from "
@@ -122,29 +142,78 @@ class AsyncNewsParserService(INewsParser):
         self.metrics.set_gauge("parser.total_news", len(validated_news))
         return validated_news
     
+    async def parse_sources_stream(self, source_names: Optional[Iterable[str]] = None) -> AsyncIterator[List[NewsItem]]:
+        # Yields validated items per source as soon as that source finishes
+        enabled_sources = [
+            source for source in self.sources.values() 
+            if source.enabled and (source_names is None or source.name in source_names)
+        ]
+        
+        if not enabled_sources:
+            self.logger.warning("No enabled sources found")
+            return
+        
+        semaphore = asyncio.Semaphore(self.config.max_concurrent_sources)
+        tasks = [
+            asyncio.ensure_future(self._parse_source_with_semaphore(semaphore, source.name, source))
+            for source in enabled_sources
+        ]
+        
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                news_items = await next_done
+                validated_news = self._validate_news(news_items)
+                if validated_news:
+                    yield validated_news
+        finally:
+            for task in tasks:
+                task.cancel()
+    
+    def _validate_news(self, news_items: List[NewsItem]) -> List[NewsItem]:
+        validated_news = []
+        with span("parser.validate", items=len(news_items)):
+            for news in news_items:
+                try:
+                    self.validation_chain.validate(news)
+                    validated_news.append(news)
+                    self._validated[news.source].inc()
+                except Exception as e:
+                    self.logger.debug("News validation failed: %s", e)
+                    self._rejected[news.source].inc()
+        return validated_news
+    
     async def _parse_source_with_semaphore(self, semaphore: asyncio.Semaphore, name: str, source: SourceConfig) -> List[NewsItem]:
         async with semaphore:
             return await self.parse_source(source)
     
     @timed_metric(lambda self: self.metrics, "parser.parse_source")
     async def parse_source(self, source: SourceConfig) -> List[NewsItem]:
+        annotate(source=source.name)
         circuit_breaker = self.circuit_breakers.get(source.name)
         if not circuit_breaker:
             circuit_breaker = CircuitBreaker()
             self.circuit_breakers[source.name] = circuit_breaker
         
         try:
-            # Check if source is available first
-            if not await self.is_source_available(source):
-                self.logger.warning(f"Source {source.name} is not available")
-                return []
-            
-            # Use circuit breaker to call parsing strategy
-            return await circuit_breaker.call(self._parse_source_internal, source)
+            # Availability is judged by the real fetch: network errors and timeouts
+            # count as breaker failures, a 304 or a parsed feed counts as success
+            news_items = await circuit_breaker.call(self._parse_source_internal, source)
+            if self.scheduler:
+                # Recorded on commit: re-served entries that turn out to be duplicates are not new
+                self._polled.add(source.name)
+            return news_items
             
+        except CircuitBreakerOpenError:
+            self.logger.warning(f"Source {source.name} skipped: circuit breaker is open")
+            self.metrics.increment_counter("parser.source_skipped", {"source": source.name})
+            if self.scheduler:
+                self.scheduler.record_poll(source.name, 0, failed=True)
+            return []
         except Exception as e:
             self.logger.error(f"Error parsing source {source.name}: {e}")
             self.metrics.increment_counter("parser.source_error", {"source": source.name})
+            if self.scheduler:
+                self.scheduler.record_poll(source.name, 0, failed=True)
             return []
     
     async def _parse_source_internal(self, source: SourceConfig) -> List[NewsItem]:
@@ -152,20 +221,68 @@ class AsyncNewsParserService(INewsParser):
         
         # Create parsing strategy
         strategy = ParsingStrategyFactory.create_strategy(
-            source, self.metrics, self.config.max_news_per_run
+            source, self.metrics, self.config.max_news_per_run, 
+            http_cache=self.http_cache, executor=self.executor,
+            article_concurrency=self.config.article_fetch_concurrency,
+            host_limiter=self.host_limiter,
+            watermarks=self.watermarks
         )
         
         # Parse using strategy
         news_items = await strategy.parse(source, self.session)
+        if strategy.pending_state:
+            self._pending_states[source.name] = strategy.pending_state
         
         self.logger.info(f"Source {source.name}: parsed {len(news_items)} items")
         return news_items
     
+    def _take_pending(self, source_names: Optional[Iterable[str]]) -> Dict[str, PendingFeedState]:
+        if source_names is None:
+            source_names = list(self._pending_states)
+        return {name: self._pending_states.pop(name) for name in source_names if name in self._pending_states}
+    
+    def _take_polled(self, source_names: Optional[Iterable[str]]) -> Set[str]:
+        polled = set(self._polled) if source_names is None else self._polled.intersection(source_names)
+        self._polled -= polled
+        return polled
+    
+    async def commit_parsed(
+        self, 
+        source_names: Optional[Iterable[str]] = None, 
+        saved_counts: Optional[Dict[str, int]] = None
+    ):
+        if source_names is not None:
+            source_names = list(source_names)
+        
+        for name in self._take_polled(source_names):
+            self.scheduler.record_poll(name, (saved_counts or {}).get(name, 0))
+        
+        # Only called for saves that succeeded; sources of a failed save were discarded first
+        for name, state in self._take_pending(source_names).items():
+            if self.http_cache:
+                self.http_cache.store(state.url, state.etag, state.last_modified)
+            if self.watermarks and state.keys is not None:
+                try:
+                    await self.watermarks.advance(name, state.keys, state.latest_published)
+                except Exception as e:
+                    # The items are saved already; a stale watermark only means dedup sees them again
+                    self.logger.error(f"Failed to advance feed watermark for {name}: {e}")
+                    self.metrics.increment_counter("parser.watermark_error", {"source": name})
+    
+    def discard_parsed(self, source_names: Optional[Iterable[str]] = None):
+        # Nothing is remembered, so the next poll fetches the feed unconditionally again;
+        # the scheduler keeps the interval it set when the poll was dispatched
+        if source_names is not None:
+            source_names = list(source_names)
+        self._take_pending(source_names)
+        self._take_polled(source_names)
+    
     @timed_metric(lambda self: self.metrics, "parser.check_availability")
     async def is_source_available(self, source: SourceConfig) -> bool:
+        # Probe the URL the strategy actually fetches, not the homepage
         try:
             async with self.session.head(
-                source.url, 
+                source.rss or source.url, 
                 timeout=aiohttp.ClientTimeout(total=10),
                 allow_redirects=True
             ) as response:
@@ -0,0 +1,207 @@
+import json
+import logging
+import os
+import random
+import time
+from collections import deque
+from dataclasses import dataclass, asdict
+from typing import Deque, Dict, List, Optional
+
+from core.interfaces import SourceConfig
+from core.metrics import IMetricsCollector
+from infrastructure.config_manager import SchedulerConfig
+
+
+# Smoothing factor of the per-source publish rate and hit ratio
+EWMA_ALPHA = 0.3
+
+# Sources falling due within this many seconds are polled together in one cycle
+COALESCE_SECONDS = 15.0
+
+
+@dataclass
+class SourcePollState:
+    interval: float  # seconds
+    next_due: float  # unix time, so the schedule survives restarts
+    publish_rate: float = 0.0  # EWMA of new entries per second
+    hit_ratio: float = 0.5  # EWMA of polls that returned new entries
+    last_poll: Optional[float] = None
+    polls: int = 0
+
+
+class AdaptiveSourceScheduler:
+    """Per-source polling intervals derived from each feed's observed publish rate."""
+
+    def __init__(
+        self,
+        config: SchedulerConfig,
+        sources: Dict[str, SourceConfig],
+        metrics: IMetricsCollector,
+        initial_interval_minutes: float = 30
+    ):
+        self.config = config
+        self.sources = {source.name: source for source in sources.values() if source.enabled}
+        self.metrics = metrics
+        self.logger = logging.getLogger(__name__)
+
+        self.min_interval = config.min_interval_minutes * 60
+        self.max_interval = config.max_interval_minutes * 60
+        self.initial_interval = self._clamp(initial_interval_minutes * 60)
+
+        self._states: Dict[str, SourcePollState] = {}
+        self._dispatched: Deque[float] = deque()
+        self._load()
+
+    def _clamp(self, interval: float) -> float:
+        return max(self.min_interval, min(self.max_interval, interval))
+
+    def _state(self, name: str) -> SourcePollState:
+        state = self._states.get(name)
+        if state is None:
+            # Unknown sources are polled right away and learn their rate from there
+            state = self._states[name] = SourcePollState(interval=self.initial_interval, next_due=time.time())
+        return state
+
+    def _weight(self, name: str) -> float:
+        # Priority 1 is the most important source; priority p is polled as if it published p times slower
+        return 1.0 / max(1, self.sources[name].priority)
+
+    def take_due_sources(self) -> List[str]:
+        now = time.time()
+        self._expire_dispatched(now)
+
+        due = [
+            name for name in self.sources
+            if self._state(name).next_due <= now + COALESCE_SECONDS
+        ]
+        if not due:
+            return []
+
+        # Under the request budget the sources most likely to have news go first
+        due.sort(key=lambda name: (-self._states[name].hit_ratio * self._weight(name), self._states[name].next_due))
+
+        budget = max(0, self.config.max_polls_per_minute - len(self._dispatched))
+        taken, deferred = due[:budget], due[budget:]
+
+        self._dispatch(taken, now)
+        if deferred:
+            self.metrics.increment_counter("scheduler.deferred")
+            self.logger.debug(f"Poll budget exhausted, deferred: {', '.join(deferred)}")
+
+        return taken
+
+    def reserve_poll(self, name: str) -> float:
+        # Daemon fetchers poll one source each; 0 means go ahead, otherwise seconds until the budget frees up
+        now = time.time()
+        self._expire_dispatched(now)
+
+        if len(self._dispatched) >= self.config.max_polls_per_minute:
+            self.metrics.increment_counter("scheduler.deferred")
+            return max(1.0, self._dispatched[0] + 60 - now)
+
+        if name in self.sources:
+            self._dispatch([name], now)
+        else:
+            self._dispatched.append(now)
+        return 0.0
+
+    def _dispatch(self, names: List[str], now: float):
+        self._dispatched.extend([now] * len(names))
+        for name in names:
+            # Not due again until record_poll reschedules it; a cycle that never reaches the
+            # poll (failed health check, aborted cycle) waits an interval instead of re-polling at once
+            self._state(name).next_due = now + self._state(name).interval
+
+    def seconds_until_due(self) -> float:
+        now = time.time()
+        self._expire_dispatched(now)
+
+        if not self.sources:
+            return self.max_interval
+
+        wait = min(self._state(name).next_due for name in self.sources) - now
+        if len(self._dispatched) >= self.config.max_polls_per_minute:
+            wait = max(wait, self._dispatched[0] + 60 - now)
+
+        return max(1.0, wait)
+
+    def seconds_until_source_due(self, name: str) -> float:
+        if name not in self.sources:
+            return self.initial_interval
+        return max(1.0, self._state(name).next_due - time.time())
+
+    def _expire_dispatched(self, now: float):
+        while self._dispatched and self._dispatched[0] <= now - 60:
+            self._dispatched.popleft()
+
+    def record_poll(self, name: str, new_items: int, failed: bool = False):
+        if name not in self.sources:
+            return
+
+        now = time.time()
+        state = self._state(name)
+        elapsed = now - state.last_poll if state.last_poll else state.interval
+
+        if failed:
+            # Back off without touching the rate estimate; the circuit breaker handles hard failures
+            state.interval = self._clamp(state.interval * 2)
+        else:
+            hit = 1.0 if new_items > 0 else 0.0
+            observed_rate = new_items / max(elapsed, 1.0)
+            state.publish_rate = EWMA_ALPHA * observed_rate + (1 - EWMA_ALPHA) * state.publish_rate
+            state.hit_ratio = EWMA_ALPHA * hit + (1 - EWMA_ALPHA) * state.hit_ratio
+
+            # Aim for about one new entry per poll; empty polls decay the rate and stretch the interval
+            weighted_rate = state.publish_rate * self._weight(name)
+            state.interval = self._clamp(1.0 / weighted_rate if weighted_rate > 0 else state.interval * 1.5)
+
+        jitter = random.uniform(1 - self.config.jitter, 1 + self.config.jitter)
+        state.next_due = now + state.interval * jitter
+        state.last_poll = now
+        state.polls += 1
+
+        tags = {"source": name}
+        self.metrics.set_gauge("scheduler.interval", state.interval, tags)
+        self.metrics.set_gauge("scheduler.publish_rate", state.publish_rate * 3600, tags)
+        self.metrics.set_gauge("scheduler.hit_ratio", state.hit_ratio, tags)
+        self.logger.debug(
+            f"Source {name}: {new_items} new, next poll in {state.interval * jitter / 60:.1f} min"
+        )
+
+        self._save()
+
+    def _load(self):
+        path = self.config.state_path
+        if not path or not os.path.exists(path):
+            return
+
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self._states = {
+                name: SourcePollState(**values) for name, values in data.items()
+                if name in self.sources
+            }
+            for state in self._states.values():
+                state.interval = self._clamp(state.interval)
+            self.logger.debug(f"Loaded scheduler state for {len(self._states)} sources")
+        except Exception as e:
+            self.logger.warning(f"Failed to load scheduler state {path}: {e}")
+            self._states = {}
+
+    def _save(self):
+        path = self.config.state_path
+        if not path:
+            return
+
+        state_dir = os.path.dirname(path)
+        if state_dir:
+            os.makedirs(state_dir, exist_ok=True)
+
+        tmp_path = f"{path}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({name: asdict(state) for name, state in self._states.items()}, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            self.logger.warning(f"Failed to save scheduler state {path}: {e}")
@@ -1,29 +1,81 @@
 import aiohttp
 import asyncio
-import feedparser
 import logging
 import re
 from abc import ABC, abstractmethod
+from dataclasses import dataclass
 from datetime import datetime
-from typing import List, Optional
-from bs4 import BeautifulSoup
-from urllib.parse import urljoin
+from typing import List, Optional, Sequence, Tuple
+from urllib.parse import urlparse
 
 from core.interfaces import NewsItem, SourceConfig
 from core.retry import smart_retry
+from core.rate_limiter import KeyedConcurrencyLimiter
 from core.metrics import timed_metric, IMetricsCollector
+from core.tracing import span
+from infrastructure.http_cache import HttpValidatorCache
+from infrastructure.feed_watermarks import SQLiteFeedWatermarkStore
+from .executor import ParseExecutor
+from .extractors import (
+    RssEntryRecord, HtmlBlockRecord, extract_rss_entries, extract_html_blocks, extract_article_text
+)
+
+
+@dataclass(frozen=True)
+class PendingFeedState:
+    """Feed state to persist once the parsed items are saved; until then the next poll refetches."""
+    url: str
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    # Feed watermark advance, RSS only
+    keys: Optional[Sequence[str]] = None
+    latest_published: Optional[Tuple[int, ...]] = None
 
 
 class IParsingStrategy(ABC):
+    # Set by a successful parse, committed by the parser service after the save
+    pending_state: Optional[PendingFeedState] = None
+    
     @abstractmethod
     async def parse(self, source: SourceConfig, session: aiohttp.ClientSession) -> List[NewsItem]:
         pass
+    
+    async def _fetch_if_modified(
+        self, 
+        url: str, 
+        source: SourceConfig, 
+        session: aiohttp.ClientSession,
+        http_cache: Optional[HttpValidatorCache]
+    ) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+        # Returns (content, etag, last_modified); content is None when the server answered 304
+        headers = http_cache.conditional_headers(url) if http_cache else {}
+        
+        with span("parsing.fetch", source=source.name) as fetch_span:
+            async with session.get(url, headers=headers, timeout=aiohttp.ClientTimeout(total=source.timeout)) as response:
+                if fetch_span:
+                    fetch_span.attributes['status'] = response.status
+                if response.status == 304:
+                    return None, None, None
+                
+                response.raise_for_status()
+                content = await response.text()
+                return content, response.headers.get('ETag'), response.headers.get('Last-Modified')
 
 
 class RSSParsingStrategy(IParsingStrategy):
-    def __init__(self, metrics: IMetricsCollector, max_items: int = 10):
+    def __init__(
+        self, 
+        metrics: IMetricsCollector, 
+        max_items: int = 10, 
+        http_cache: Optional[HttpValidatorCache] = None,
+        executor: Optional[ParseExecutor] = None,
+        watermarks: Optional[SQLiteFeedWatermarkStore] = None
+    ):
         self.metrics = metrics
         self.max_items = max_items
+        self.http_cache = http_cache
+        self.executor = executor or ParseExecutor('inline')
+        self.watermarks = watermarks
         self.logger = logging.getLogger(__name__)
     
     @timed_metric(lambda self: self.metrics, "parsing.rss")
@@ -35,56 +87,66 @@ class RSSParsingStrategy(IParsingStrategy):
         try:
             self.logger.debug(f"Parsing RSS: {source.name} - {source.rss}")
             
-            async with session.get(source.rss, timeout=aiohttp.ClientTimeout(total=source.timeout)) as response:
-                response.raise_for_status()
-                content = await response.text()
+            content, etag, last_modified = await self._fetch_if_modified(
+                source.rss, source, session, self.http_cache
+            )
+            
+            if content is None:
+                self.metrics.increment_counter("parsing.rss.not_modified", {"source": source.name})
+                self.logger.debug(f"RSS not modified since last fetch: {source.name}")
+                return []
             
-            # Parse RSS feed
-            feed = feedparser.parse(content)
+            seen, published_cutoff = frozenset(), None
+            if self.watermarks:
+                watermark = await self.watermarks.get(source.name)
+                seen, published_cutoff = watermark.seen, watermark.published_cutoff
             
-            if feed.bozo:
+            # Parse RSS feed off the event loop
+            with span("parsing.extract", source=source.name):
+                extract = await self.executor.run(
+                    extract_rss_entries, content, self.max_items, seen, published_cutoff
+                )
+            
+            if extract.bozo:
                 self.logger.warning(f"RSS feed may contain errors: {source.name}")
             
+            if extract.skipped:
+                self.metrics.set_gauge("parsing.rss.skipped_seen", extract.skipped, {"source": source.name})
+                self.logger.debug(f"Skipped {extract.skipped} already seen RSS entries: {source.name}")
+            
             news_items = []
-            for entry in feed.entries[:self.max_items]:
+            for entry in extract.entries:
                 try:
-                    news_item = await self._parse_rss_entry(entry, source)
-                    if news_item:
-                        news_items.append(news_item)
+                    news_items.append(self._build_news_item(entry, source))
                 except Exception as e:
                     self.logger.error(f"Error parsing RSS entry: {e}")
                     continue
             
+            # Validators and the watermark are stored only after the items are saved, so a failed save is refetched
+            self.pending_state = PendingFeedState(
+                source.rss, etag, last_modified, keys=extract.keys, latest_published=extract.latest_published
+            )
+            
             self.metrics.increment_counter("parsing.rss.success", {"source": source.name})
             self.logger.info(f"Parsed {len(news_items)} items from RSS {source.name}")
             return news_items
             
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            # Fetch failures propagate so retry and the source circuit breaker can see them
+            self.metrics.increment_counter("parsing.rss.fetch_error", {"source": source.name})
+            self.logger.warning(f"Error fetching RSS {source.name}: {e}")
+            raise
         except Exception as e:
             self.metrics.increment_counter("parsing.rss.error", {"source": source.name})
             self.logger.error(f"Error parsing RSS {source.name}: {e}")
             return []
     
-    async def _parse_rss_entry(self, entry, source: SourceConfig) -> Optional[NewsItem]:
-        title = self._clean_text(getattr(entry, 'title', ''))
-        content = self._clean_text(
-            getattr(entry, 'description', '') or 
-            getattr(entry, 'summary', '')
-        )
-        url = getattr(entry, 'link', '')
-        
-        if not title or not content:
-            return None
-        
+    def _build_news_item(self, entry: RssEntryRecord, source: SourceConfig) -> NewsItem:
         # Extract publication date
         published_date = None
-        if hasattr(entry, 'published_parsed') and entry.published_parsed:
-            try:
-                published_date = datetime(*entry.published_parsed[:6])
-            except (ValueError, TypeError):
-                pass
-        elif hasattr(entry, 'updated_parsed') and entry.updated_parsed:
+        if entry.published:
             try:
-                published_date = datetime(*entry.updated_parsed[:6])
+                published_date = datetime(*entry.published)
             except (ValueError, TypeError):
                 pass
         
@@ -92,37 +154,35 @@ class RSSParsingStrategy(IParsingStrategy):
             published_date = datetime.now()
         
         return NewsItem(
-            title=title,
-            content=content,
-            url=url,
+            title=entry.title,
+            content=entry.content,
+            url=entry.url,
             source=source.name,
             city=source.city,
             published_date=published_date
         )
-    
-    def _clean_text(self, text: str) -> str:
-        if not text:
-            return ""
-        
-        # Remove HTML tags
-        text = re.sub(r'<[^>]+>', '', text)
-        
-        # Normalize whitespace
-        text = re.sub(r'\s+', ' ', text)
-        
-        # Remove special characters but keep basic punctuation
-        text = re.sub(r'[^\w\s\-.,!?:;()«»""\']', ' ', text)
-        text = re.sub(r'\s+', ' ', text)
-        
-        return text.strip()
 
 
 class HTMLParsingStrategy(IParsingStrategy):
-    def __init__(self, metrics: IMetricsCollector, max_items: int = 10, min_content_length: int = 100):
+    def __init__(
+        self, 
+        metrics: IMetricsCollector, 
+        max_items: int = 10, 
+        min_content_length: int = 100,
+        http_cache: Optional[HttpValidatorCache] = None,
+        executor: Optional[ParseExecutor] = None,
+        article_concurrency: int = 4,
+        host_limiter: Optional[KeyedConcurrencyLimiter] = None
+    ):
         self.metrics = metrics
         self.max_items = max_items
         self.min_content_length = min_content_length
+        self.http_cache = http_cache
+        self.executor = executor or ParseExecutor('inline')
+        self.article_concurrency = max(1, article_concurrency)
+        self.host_limiter = host_limiter or KeyedConcurrencyLimiter(2)
         self.logger = logging.getLogger(__name__)
+        self._article_errors = metrics.counter("parsing.html.article_error")
     
     @timed_metric(lambda self: self.metrics, "parsing.html")
     @smart_retry(max_attempts=3, exceptions=(aiohttp.ClientError, asyncio.TimeoutError))
@@ -133,57 +193,63 @@ class HTMLParsingStrategy(IParsingStrategy):
         try:
             self.logger.debug(f"Parsing HTML: {source.name} - {source.url}")
             
-            async with session.get(source.url, timeout=aiohttp.ClientTimeout(total=source.timeout)) as response:
-                response.raise_for_status()
-                content = await response.text()
+            content, etag, last_modified = await self._fetch_if_modified(
+                source.url, source, session, self.http_cache
+            )
+            
+            if content is None:
+                self.metrics.increment_counter("parsing.html.not_modified", {"source": source.name})
+                self.logger.debug(f"HTML page not modified since last fetch: {source.name}")
+                return []
+            
+            with span("parsing.extract", source=source.name):
+                news_blocks = await self.executor.run(
+                    extract_html_blocks, content, source.selector, source.url, self.max_items, source.html_backend
+                )
             
-            soup = BeautifulSoup(content, 'html.parser')
-            news_blocks = soup.select(source.selector)
+            # Full articles are fetched concurrently; gather keeps listing order
+            fetch_slots = asyncio.Semaphore(self.article_concurrency)
+            results = await asyncio.gather(
+                *(self._parse_html_block(block, source, session, fetch_slots) for block in news_blocks),
+                return_exceptions=True
+            )
             
             news_items = []
-            for block in news_blocks[:self.max_items]:
-                try:
-                    news_item = await self._parse_html_block(block, source, session)
-                    if news_item:
-                        news_items.append(news_item)
-                except Exception as e:
-                    self.logger.error(f"Error parsing HTML block: {e}")
+            for result in results:
+                if isinstance(result, Exception):
+                    self.logger.error(f"Error parsing HTML block: {result}")
                     continue
+                if result:
+                    news_items.append(result)
+            
+            self.pending_state = PendingFeedState(source.url, etag, last_modified)
             
             self.metrics.increment_counter("parsing.html.success", {"source": source.name})
             self.logger.info(f"Parsed {len(news_items)} items from HTML {source.name}")
             return news_items
             
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            # Fetch failures propagate so retry and the source circuit breaker can see them
+            self.metrics.increment_counter("parsing.html.fetch_error", {"source": source.name})
+            self.logger.warning(f"Error fetching HTML {source.name}: {e}")
+            raise
         except Exception as e:
             self.metrics.increment_counter("parsing.html.error", {"source": source.name})
             self.logger.error(f"Error parsing HTML {source.name}: {e}")
             return []
     
-    async def _parse_html_block(self, block, source: SourceConfig, session: aiohttp.ClientSession) -> Optional[NewsItem]:
-        # Extract title
-        title_elem = block.find(['h1', 'h2', 'h3', 'h4', 'a'])
-        if not title_elem:
-            return None
-        
-        title = self._clean_text(title_elem.get_text())
-        if not title or len(title) < 10:
-            return None
-        
-        # Extract URL
-        link_elem = block.find('a')
-        url = ""
-        if link_elem and link_elem.get('href'):
-            url = urljoin(source.url, link_elem['href'])
-        
-        # Extract content
-        content_elem = block.find(['p', 'div', 'span'])
-        content = ""
-        if content_elem:
-            content = self._clean_text(content_elem.get_text())
+    async def _parse_html_block(
+        self, 
+        block: HtmlBlockRecord, 
+        source: SourceConfig, 
+        session: aiohttp.ClientSession,
+        fetch_slots: asyncio.Semaphore
+    ) -> Optional[NewsItem]:
+        content = block.content
         
         # If content is too short, try to get full article
-        if len(content) < self.min_content_length and url:
-            full_content = await self._get_full_article_content(url, session)
+        if len(content) < self.min_content_length and block.url:
+            full_content = await self._get_full_article_content(block.url, session, fetch_slots, source.html_backend)
             if full_content:
                 content = full_content
         
@@ -191,58 +257,39 @@ class HTMLParsingStrategy(IParsingStrategy):
             return None
         
         # Extract date
-        date_elem = block.find(['time', '.date', '.time'])
         published_date = datetime.now()
-        if date_elem:
-            date_text = date_elem.get_text() or date_elem.get('datetime', '')
-            published_date = self._extract_date_from_text(date_text) or datetime.now()
+        if block.date_text:
+            published_date = self._extract_date_from_text(block.date_text) or datetime.now()
         
         return NewsItem(
-            title=title,
+            title=block.title,
             content=content,
-            url=url,
+            url=block.url,
             source=source.name,
             city=source.city,
             published_date=published_date
         )
     
-    async def _get_full_article_content(self, url: str, session: aiohttp.ClientSession) -> Optional[str]:
+    async def _get_full_article_content(
+        self, 
+        url: str, 
+        session: aiohttp.ClientSession, 
+        fetch_slots: asyncio.Semaphore,
+        html_backend: Optional[str] = None
+    ) -> Optional[str]:
         try:
-            async with session.get(url, timeout=aiohttp.ClientTimeout(total=20)) as response:
-                response.raise_for_status()
-                content = await response.text()
-            
-            soup = BeautifulSoup(content, 'html.parser')
-            
-            # Remove unwanted elements
-            for element in soup(['script', 'style', 'nav', 'header', 'footer', 'aside']):
-                element.decompose()
-            
-            # Try to find main content
-            content_selectors = [
-                'article', '.article', '.content', '.post-content',
-                '.entry-content', '.news-content', '.text', '.body'
-            ]
-            
-            content_text = ""
-            for selector in content_selectors:
-                content_elem = soup.select_one(selector)
-                if content_elem:
-                    content_text = self._clean_text(content_elem.get_text())
-                    break
-            
-            # Fallback to all paragraphs
-            if not content_text:
-                paragraphs = soup.find_all('p')
-                content_text = ' '.join([self._clean_text(p.get_text()) for p in paragraphs])
+            # Per-source and per-host caps only cover the download, not the parse
+            async with fetch_slots, self.host_limiter.slot(urlparse(url).netloc):
+                with span("parsing.fetch_article", url=url):
+                    async with session.get(url, timeout=aiohttp.ClientTimeout(total=20)) as response:
+                        response.raise_for_status()
+                        content = await response.text()
             
-            # Limit content length
-            if len(content_text) > 2000:
-                content_text = content_text[:2000] + "..."
-            
-            return content_text if len(content_text) > 50 else None
+            with span("parsing.extract_article"):
+                return await self.executor.run(extract_article_text, content, 2000, html_backend)
             
         except Exception as e:
+            self._article_errors.inc()
             self.logger.debug(f"Error getting full article content: {e}")
             return None
     
@@ -281,30 +328,28 @@ class HTMLParsingStrategy(IParsingStrategy):
             
         except Exception:
             return None
-    
-    def _clean_text(self, text: str) -> str:
-        if not text:
-            return ""
-        
-        # Remove HTML tags
-        text = re.sub(r'<[^>]+>', '', text)
-        
-        # Normalize whitespace
-        text = re.sub(r'\s+', ' ', text)
-        
-        # Remove special characters but keep basic punctuation
-        text = re.sub(r'[^\w\s\-.,!?:;()«»""\']', ' ', text)
-        text = re.sub(r'\s+', ' ', text)
-        
-        return text.strip()
 
 
 class ParsingStrategyFactory:
     @staticmethod
-    def create_strategy(source: SourceConfig, metrics: IMetricsCollector, max_items: int = 10) -> IParsingStrategy:
+    def create_strategy(
+        source: SourceConfig, 
+        metrics: IMetricsCollector, 
+        max_items: int = 10,
+        http_cache: Optional[HttpValidatorCache] = None,
+        executor: Optional[ParseExecutor] = None,
+        article_concurrency: int = 4,
+        host_limiter: Optional[KeyedConcurrencyLimiter] = None,
+        watermarks: Optional[SQLiteFeedWatermarkStore] = None
+    ) -> IParsingStrategy:
         if source.rss:
-            return RSSParsingStrategy(metrics, max_items)
+            return RSSParsingStrategy(
+                metrics, max_items, http_cache=http_cache, executor=executor, watermarks=watermarks
+            )
         elif source.selector:
-            return HTMLParsingStrategy(metrics, max_items)
+            return HTMLParsingStrategy(
+                metrics, max_items, http_cache=http_cache, executor=executor,
+                article_concurrency=article_concurrency, host_limiter=host_limiter
+            )
         else:
             raise ValueError(f"No parsing strategy available for source: {source.name}")
\ No newline at end of file